@@ -24,6 +24,7 @@ from .sub_agents.mandi_price_loop import mandi_price_loop
 from .sub_agents.farming_tech import farming_tech_sub_agent
 from .sub_agents.weather import weather_sub_agent
 from .sub_agents import crop_management_loop, gov_schema_loop, mandi_price_loop,weather_sub_agent,farming_tech_sub_agent
+from .sub_agents.tracing import instrument_from_env
 
 MODEL = "gemini-2.0-flash-lite"
 
@@ -48,4 +49,6 @@ farmer_advisor = LlmAgent(
     ],
 )
 
-root_agent = farmer_advisor
\ No newline at end of file
+root_agent = farmer_advisor
+
+instrument_from_env(root_agent)
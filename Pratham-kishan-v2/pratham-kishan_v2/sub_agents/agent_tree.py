@@ -0,0 +1,45 @@
+# sub_agents/agent_tree.py
+from typing import Iterator
+
+from google.adk.agents import BaseAgent
+from google.adk.tools.agent_tool import AgentTool
+
+
+def walk_agents(root: BaseAgent) -> Iterator[BaseAgent]:
+    """Yields every agent reachable from root.
+
+    Follows sub_agents, AgentTools and the branches of a ConcurrentBranchesAgent.
+
+    Each agent is yielded once, parents before their children.
+    """
+    seen = set()
+    stack = [root]
+    while stack:
+        agent = stack.pop()
+        if id(agent) in seen:
+            continue
+        seen.add(id(agent))
+        yield agent
+        children = list(agent.sub_agents)
+        children += [
+            tool.agent
+            for tool in getattr(agent, "tools", None) or []
+            if isinstance(tool, AgentTool)
+        ]
+        children += list((getattr(agent, "branches", None) or {}).values())
+        stack.extend(reversed(children))
+
+
+def add_callback(agent: BaseAgent, attribute: str, callback, first: bool = False) -> None:
+    """Adds a callback next to whatever the agent already has configured.
+
+    With `first` it runs before the existing callbacks instead of after them.
+    """
+    existing = getattr(agent, attribute)
+    if existing is None:
+        callbacks = []
+    elif isinstance(existing, list):
+        callbacks = list(existing)
+    else:
+        callbacks = [existing]
+    setattr(agent, attribute, [callback] + callbacks if first else callbacks + [callback])
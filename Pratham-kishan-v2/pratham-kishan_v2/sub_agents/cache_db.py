@@ -0,0 +1,30 @@
+# sub_agents/cache_db.py
+import logging
+import os
+import sqlite3
+import tempfile
+
+# Writable directory of the on-disk caches; the package directory may be
+# read-only in a deployment image.
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(tempfile.gettempdir(), "pratham_kishan"))
+
+
+def open_cache_db(path: str, schema: str) -> sqlite3.Connection:
+    """Opens the SQLite cache at `path` and creates its table with `schema`.
+
+    When the file cannot be opened or written, e.g. on a read-only file
+    system, the cache is kept in memory instead and lives as long as the
+    process.
+    """
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute(schema)
+        db.commit()
+        return db
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"[cache_db] cannot use {path} ({e}), keeping the cache in memory")
+    db = sqlite3.connect(":memory:", check_same_thread=False)
+    db.execute(schema)
+    db.commit()
+    return db
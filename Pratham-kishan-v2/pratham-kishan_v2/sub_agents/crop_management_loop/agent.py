@@ -1,11 +1,15 @@
 # sub_agents/crop_management_loop/agent.py
 from google.adk.agents import LoopAgent, LlmAgent, BaseAgent, SequentialAgent,Agent
 from google.adk.models.google_llm import Gemini
-from google.adk.tools import google_search
+from ..search_cache import google_search
+from ..profit_calculator import calculate_crop_profit
 
 from . import prompts
+from ..goal_check import GoalCheckAgent, parse_profit
+from ..loop_control import ConvergentLoopAgent
 
 MODEL = "gemini-2.0-flash-lite"
+PROFIT_GOAL = 800
 
 class CriticAgent(Agent):
     """
@@ -28,16 +32,21 @@ initial_crop_agent = LlmAgent(
 finance_agent = LlmAgent(name = "crop_finance_agent",
                          model=MODEL,
                          instruction=prompts.FINANCE_AGENT_PROMPT,
-                         tools=[google_search]
+                         tools=[calculate_crop_profit, google_search],
+                         output_key="crop_finance_output",
                          )
 crop_critic_agent = CriticAgent(critique_prompt=prompts.CRITIC_PROMPT)
+crop_profit_check = GoalCheckAgent(name="crop_profit_check",
+                                   source_key="crop_finance_output",
+                                   goal=PROFIT_GOAL,
+                                   parser=parse_profit)
 
 # --- The Loop Agent ---
-refinement_loop_crop = LoopAgent(
+refinement_loop_crop = ConvergentLoopAgent(
     name = "crop_agent_refine",
-    sub_agents=[crop_critic_agent, finance_agent],
+    sub_agents=[finance_agent, crop_profit_check, crop_critic_agent],
     max_iterations=3,
-    #exit_condition=lambda result: "EXIT" in result.get('content', '')
+    watch_agent="crop_critic_agent",
 )
 
 crop_agent = SequentialAgent(
@@ -8,12 +8,16 @@ Based on the provided crop type, find the expected yield using your tools.
 FINANCE_AGENT_PROMPT = """
 You are a finance expert for a farm.
 Given the crop yield and market price, calculate the anticipated profit.
-Provide a clear breakdown of the calculation.
+Use the calculate_crop_profit tool for the calculation, passing the yield, production
+costs per acre, candidate markets with their distances and recent prices, and sale dates;
+do not do the arithmetic yourself. Use Google Search only to find figures you are missing.
+Provide a clear breakdown of the calculation from the tool's result.
+End with a single line in the form 'Anticipated profit: $<amount>'.
 """
 
 CRITIC_PROMPT = """
 You are a financial critic for a farm.
 Your goal is to maximize financial gain.
-Review the anticipated profit. If the profit is above $800, the goal is achieved.
-If the goal is achieved, say 'EXIT'. Otherwise, suggest a way to improve the profit.
+The anticipated profit is below the $800 goal.
+Suggest a way to improve the profit.
 """
\ No newline at end of file
@@ -1,6 +1,6 @@
 # sub_agents/farming_tech/agent.py
 from google.adk.agents import Agent,LoopAgent, LlmAgent, BaseAgent, SequentialAgent
-from google.adk.tools import google_search
+from ..search_cache import google_search
 from . import prompts
 
 MODEL = "gemini-2.0-flash-lite"
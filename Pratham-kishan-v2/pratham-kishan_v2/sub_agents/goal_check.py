@@ -0,0 +1,79 @@
+# sub_agents/goal_check.py
+import logging
+import re
+from typing import AsyncGenerator, Callable, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+_DOLLARS = re.compile(
+    r"(-)?\s*(?:\$|US\$|USD)\s*(\d[\d,]*(?:\.\d+)?)"
+    r"|(-)?(\d[\d,]*(?:\.\d+)?)\s*(?:USD|dollars?)\b",
+    re.IGNORECASE,
+)
+_PERCENT = re.compile(r"(\d+(?:\.\d+)?)\s*(?:%|percent\b)", re.IGNORECASE)
+
+
+def _value_after_keyword(text: str, keyword: str, values: Callable[[str], list]) -> Optional[float]:
+    # The first value after the keyword, so "profit $700 vs goal $800" is 700.
+    for line in reversed(text.splitlines()):
+        start = line.lower().find(keyword)
+        if start >= 0:
+            found = values(line[start:])
+            if found:
+                return found[0]
+    return None
+
+
+def _dollar_amounts(line: str) -> list[float]:
+    amounts = []
+    for sign, amount, trailing_sign, trailing_amount in _DOLLARS.findall(line):
+        value = float((amount or trailing_amount).replace(",", ""))
+        amounts.append(-value if sign or trailing_sign else value)
+    return amounts
+
+
+def parse_profit(text: str) -> Optional[float]:
+    """Returns the profit in dollars stated in a finance answer, or None.
+
+    Takes the first dollar amount after "profit" on the last line that
+    mentions it, so a breakdown listing revenue and costs first still yields
+    the final figure, and a goal quoted after the profit is not taken for it.
+    """
+    return _value_after_keyword(text, "profit", _dollar_amounts)
+
+
+def parse_subsidy_percent(text: str) -> Optional[float]:
+    """Returns the subsidy percentage stated in a scheme answer, or None."""
+    return _value_after_keyword(
+        text, "subsid", lambda line: [float(value) for value in _PERCENT.findall(line)]
+    )
+
+
+class GoalCheckAgent(BaseAgent):
+    """Ends the enclosing loop once the number in `source_key` reaches `goal`.
+
+    Runs without a model call: `parser` extracts the number from the text the
+    previous agent stored in state. When the goal is met it escalates like
+    exit_loop does, so the critic and any further iterations are skipped.
+    When nothing can be parsed the loop simply carries on.
+    """
+
+    source_key: str
+    goal: float
+    parser: Callable[[str], Optional[float]]
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        text = ctx.session.state.get(self.source_key)
+        value = self.parser(str(text)) if text else None
+        logging.info(f"[{self.name}] parsed {value} from {self.source_key}, goal {self.goal}")
+        if value is not None and value >= self.goal:
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(escalate=True),
+            )
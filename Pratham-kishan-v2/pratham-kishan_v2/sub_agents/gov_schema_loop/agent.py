@@ -1,11 +1,16 @@
 # sub_agents/gov_schema_loop/agent.py
 from google.adk.agents import  Agent,LoopAgent, LlmAgent, BaseAgent, SequentialAgent
 from google.adk.models.google_llm import Gemini
-from google.adk.tools import google_search
+from ..search_cache import google_search
+from google.adk.tools.agent_tool import AgentTool
 
 from . import prompts
+from ..goal_check import GoalCheckAgent, parse_subsidy_percent
+from ..loop_control import ConvergentLoopAgent
+from ..scheme_catalogue import find_schemes
 
 MODEL = "gemini-2.0-flash-lite"
+SUBSIDY_GOAL_PERCENT = 50
 
 
 class CriticAgent(Agent):
@@ -20,14 +25,17 @@ class CriticAgent(Agent):
 
 # --- Child Agents for this Loop ---
 initial_gov_agent = LlmAgent(name="initial_gov_agent", model=MODEL,instruction=prompts.CROP_AGENT_PROMPT, tools=[google_search])
-schema_agent = LlmAgent(name="schema_agent",model=MODEL, instruction=prompts.SCHEMA_AGENT_PROMPT, tools=[google_search])
+scheme_search_agent = LlmAgent(name="scheme_search", model=MODEL, instruction=prompts.SCHEME_SEARCH_PROMPT, tools=[google_search])
+schema_agent = LlmAgent(name="schema_agent",model=MODEL, instruction=prompts.SCHEMA_AGENT_PROMPT, tools=[find_schemes, AgentTool(agent=scheme_search_agent)], output_key="schema_output")
 gov_schema_critic_agent = CriticAgent(critique_prompt=prompts.CRITIC_PROMPT)
+subsidy_check = GoalCheckAgent(name="subsidy_check", source_key="schema_output", goal=SUBSIDY_GOAL_PERCENT, parser=parse_subsidy_percent)
 
 # --- The Loop Agent ---
-refinement_loop_gov = LoopAgent(
+refinement_loop_gov = ConvergentLoopAgent(
     name = "gov_schema_loop",
-    sub_agents=[gov_schema_critic_agent, schema_agent],
+    sub_agents=[schema_agent, subsidy_check, gov_schema_critic_agent],
     max_iterations=3,
+    watch_agent="gov_schema_critic_agent",
 )
 
 gov_scheme_agent = SequentialAgent(
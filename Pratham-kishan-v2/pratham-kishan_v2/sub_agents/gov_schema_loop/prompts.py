@@ -8,12 +8,20 @@ Based on the provided crop type, find the expected yield using your tools.
 SCHEMA_AGENT_PROMPT = """
 You are an expert on government agricultural schemes.
 Based on the crop, yield, and farmer demographics, find the best government subsidy available.
-Use your tools to search for relevant schemes.
+Use the find_schemes tool to look up schemes in the scheme catalogue.
+Only if it returns status 'not_found', use the scheme_search tool to search the web.
+Its general_schemes are open to every farmer; prefer a specific scheme when one is found.
+End with a single line in the form 'Subsidy: <percent>%'.
+"""
+
+SCHEME_SEARCH_PROMPT = """
+Search the web for government agricultural schemes matching the request.
+Summarize the schemes with their subsidy percentage or amount.
 """
 
 CRITIC_PROMPT = """
 You are a government scheme critic.
 Your goal is to maximize the subsidy amount for the farmer.
-Review the subsidy information. If the subsidy is 50% or more, the goal is achieved.
-If the goal is achieved, say 'EXIT'. Otherwise, suggest how to find a better scheme.
+Review the subsidy information; the subsidy is below the 50% goal.
+Suggest how to find a better scheme.
 """
\ No newline at end of file
@@ -0,0 +1,148 @@
+# sub_agents/loop_control.py
+import difflib
+import logging
+import os
+import re
+import time
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import LoopAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.loop_agent import LoopAgentState
+from google.adk.events import Event
+from google.adk.utils.context_utils import Aclosing
+
+LOOP_SIMILARITY_THRESHOLD = float(os.getenv("LOOP_SIMILARITY_THRESHOLD", "0.85"))
+LOOP_TOKEN_BUDGET = int(os.getenv("LOOP_TOKEN_BUDGET", "0")) or None
+LOOP_TIME_BUDGET_S = float(os.getenv("LOOP_TIME_BUDGET_S", "0")) or None
+
+
+def similarity(a: str, b: str) -> float:
+    """Word-level similarity of two texts, from 0 (unrelated) to 1 (identical)."""
+    words_a = re.findall(r"\w+", a.lower())
+    words_b = re.findall(r"\w+", b.lower())
+    return difflib.SequenceMatcher(None, words_a, words_b, autojunk=False).ratio()
+
+
+def _final_text(event: Event) -> Optional[str]:
+    if event.partial or not event.content or not event.content.parts:
+        return None
+    text = "".join(part.text for part in event.content.parts if part.text)
+    return text or None
+
+
+class ConvergentLoopAgent(LoopAgent):
+    """LoopAgent that also stops when the critic has nothing new to say.
+
+    After every iteration the latest feedback is compared with the one before
+    it: either the last entry of the `watch_key` state list (what the critic
+    writes with append_to_state) or the final text of the `watch_agent`. The
+    loop ends when no new feedback was produced or when the two are at least
+    `similarity_threshold` similar. Independently, it ends as soon as a sub-agent
+    finishes after `token_budget` tokens or `time_budget_s` seconds were spent
+    in this loop. A threshold or budget of None turns that check off.
+    Escalation, pausing and resuming work as in LoopAgent.
+    """
+
+    watch_key: Optional[str] = None
+    watch_agent: Optional[str] = None
+    similarity_threshold: Optional[float] = LOOP_SIMILARITY_THRESHOLD
+    token_budget: Optional[int] = LOOP_TOKEN_BUDGET
+    time_budget_s: Optional[float] = LOOP_TIME_BUDGET_S
+
+    def _snapshot(self, ctx: InvocationContext, critic_text: Optional[str]) -> tuple:
+        """Returns (change marker, latest feedback text)."""
+        if self.watch_key is None:
+            return critic_text, critic_text
+        value = ctx.session.state.get(self.watch_key)
+        if isinstance(value, list):
+            return len(value), str(value[-1]) if value else None
+        return value, None if value is None else str(value)
+
+    def _converged(self, before: tuple, after: tuple) -> Optional[str]:
+        if self.similarity_threshold is None:
+            return None
+        if after[1] is None or after[0] == before[0]:
+            return "no new feedback"
+        if before[1] is not None:
+            score = similarity(before[1], after[1])
+            if score >= self.similarity_threshold:
+                return f"feedback converged (similarity {score:.2f})"
+        return None
+
+    def _over_budget(self, started: float, tokens: int) -> Optional[str]:
+        if self.token_budget and tokens >= self.token_budget:
+            return f"token budget of {self.token_budget} spent"
+        if self.time_budget_s and time.monotonic() - started >= self.time_budget_s:
+            return f"time budget of {self.time_budget_s}s spent"
+        return None
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        # LoopAgent._run_async_impl with the convergence and budget checks added.
+        if not self.sub_agents:
+            return
+        agent_state = self._load_agent_state(ctx, LoopAgentState)
+        is_resuming_at_current_agent = agent_state is not None
+        times_looped, start_index = self._get_start_state(agent_state)
+
+        started = time.monotonic()
+        tokens = 0
+        before = self._snapshot(ctx, None)
+        should_exit = False
+        pause_invocation = False
+        while (
+            self.max_iterations is None or times_looped < self.max_iterations
+        ) and not (should_exit or pause_invocation):
+            critic_text = None
+            for sub_agent in self.sub_agents[start_index:]:
+                if ctx.is_resumable and not is_resuming_at_current_agent:
+                    ctx.set_agent_state(
+                        self.name,
+                        agent_state=LoopAgentState(
+                            current_sub_agent=sub_agent.name, times_looped=times_looped
+                        ),
+                    )
+                    yield self._create_agent_state_event(ctx)
+                is_resuming_at_current_agent = False
+
+                async with Aclosing(sub_agent.run_async(ctx)) as agen:
+                    async for event in agen:
+                        yield event
+                        if event.usage_metadata:
+                            tokens += event.usage_metadata.total_token_count or 0
+                        if event.author == self.watch_agent:
+                            critic_text = _final_text(event) or critic_text
+                        if event.actions.escalate:
+                            should_exit = True
+                        if ctx.should_pause_invocation(event):
+                            pause_invocation = True
+                if should_exit or pause_invocation:
+                    break
+                reason = self._over_budget(started, tokens)
+                if reason:
+                    logging.info(f"[{self.name}] stopped in iteration {times_looped + 1}: {reason}")
+                    should_exit = True
+                    break
+
+            if pause_invocation:
+                break
+            start_index = 0
+            times_looped += 1
+            ctx.reset_sub_agent_states(self.name)
+            if should_exit:
+                break
+            after = self._snapshot(ctx, critic_text)
+            reason = self._converged(before, after)
+            if reason:
+                logging.info(f"[{self.name}] stopped after iteration {times_looped}: {reason}")
+                should_exit = True
+            before = after
+
+        # A paused invocation does not end the agent.
+        if pause_invocation:
+            return
+        if ctx.is_resumable:
+            ctx.set_agent_state(self.name, end_of_agent=True)
+            yield self._create_agent_state_event(ctx)
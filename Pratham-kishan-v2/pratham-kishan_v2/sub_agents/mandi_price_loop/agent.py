@@ -1,11 +1,15 @@
 # sub_agents/mandi_price_loop/agent.py
 from google.adk.agents import Agent,LoopAgent, LlmAgent, BaseAgent, SequentialAgent
 from google.adk.models.google_llm import Gemini
-from google.adk.tools import google_search
+from ..search_cache import google_search
+from ..profit_calculator import calculate_crop_profit
 
 from . import prompts
+from ..goal_check import GoalCheckAgent, parse_profit
+from ..loop_control import ConvergentLoopAgent
 
 MODEL = "gemini-2.0-flash-lite"
+PROFIT_GOAL = 820
 
 class CriticAgent(Agent):
     """
@@ -19,14 +23,16 @@ class CriticAgent(Agent):
 
 # --- Child Agents for this Loop ---
 mandi_agent = LlmAgent(name = "mandi_agent_inital", model=MODEL,instruction=prompts.MANDI_AGENT_PROMPT, tools=[google_search])
-mandi_finance_agent = Agent(name="mandi_finance_agent", model=MODEL,instruction=prompts.FINANCE_AGENT_PROMPT, tools=[google_search])
+mandi_finance_agent = Agent(name="mandi_finance_agent", model=MODEL,instruction=prompts.FINANCE_AGENT_PROMPT, tools=[calculate_crop_profit, google_search], output_key="mandi_finance_output")
 mandi_critic_agent = CriticAgent(critique_prompt=prompts.CRITIC_PROMPT)
+mandi_profit_check = GoalCheckAgent(name="mandi_profit_check", source_key="mandi_finance_output", goal=PROFIT_GOAL, parser=parse_profit)
 
 # --- The Loop Agent ---
-refinement_loop_mandi = LoopAgent(
+refinement_loop_mandi = ConvergentLoopAgent(
     name ="mandi_loop_agent",
-    sub_agents=[mandi_critic_agent, mandi_finance_agent],
+    sub_agents=[mandi_finance_agent, mandi_profit_check, mandi_critic_agent],
     max_iterations=3,
+    watch_agent="mandi_critic_agent",
 )
 
 mandi_price_loop = SequentialAgent(
@@ -0,0 +1,224 @@
+# sub_agents/profit_calculator.py
+import logging
+import os
+from typing import Optional
+
+import numpy as np
+
+# Cost of moving one quintal one km to the mandi, in the currency of the prices.
+PROFIT_TRANSPORT_RATE = float(os.getenv("PROFIT_TRANSPORT_RATE", "0.5"))
+PROFIT_YIELD_SAMPLES = int(os.getenv("PROFIT_YIELD_SAMPLES", "2000"))
+# Projected sale prices move at most this much away from the latest price.
+PROFIT_MAX_PRICE_CHANGE_PCT = float(os.getenv("PROFIT_MAX_PRICE_CHANGE_PCT", "30"))
+PROFIT_MAX_SCENARIOS = int(os.getenv("PROFIT_MAX_SCENARIOS", "10"))
+SENSITIVITY_PCT = np.array([-20.0, -10.0, 0.0, 10.0, 20.0])
+
+
+def yield_samples(likely: float, low: float, high: float, samples: int, seed: int = 0) -> np.ndarray:
+    """Draws yields from a triangular distribution, sorted ascending.
+
+    `low` and `high` of 0 mean no spread around the most likely yield.
+    """
+    low = min(low or likely, likely)
+    high = max(high or likely, likely)
+    if high <= low:
+        return np.full(samples, float(likely))
+    return np.sort(np.random.default_rng(seed).triangular(low, likely, high, samples))
+
+
+def project_prices(series: list[list[float]], days_ahead: np.ndarray, max_change_pct: float) -> np.ndarray:
+    """Projects each market's price `days_ahead` days past its last price.
+
+    The series (oldest first, one price per day) are right-aligned into one
+    array and fitted with a least-squares line each; the projection starts at
+    the last price and follows the fitted daily slope, clipped to
+    `max_change_pct` of the last price.
+
+    Returns:
+        np.ndarray: prices of shape (markets, len(days_ahead)).
+    """
+    length = max(len(prices) for prices in series)
+    y = np.full((len(series), length), np.nan)
+    for row, prices in zip(y, series):
+        row[length - len(prices):] = prices
+    valid = ~np.isnan(y)
+    x = np.where(valid, np.arange(length, dtype=np.float64), np.nan)
+    dx = x - np.nanmean(x, axis=1, keepdims=True)
+    dy = y - np.nanmean(y, axis=1, keepdims=True)
+    spread = np.nansum(dx * dx, axis=1)
+    slope = np.divide(np.nansum(dx * dy, axis=1), spread, out=np.zeros(len(series)), where=spread > 0)
+    last = y[:, -1:]
+    limit = last * max_change_pct / 100
+    change = np.clip(slope[:, None] * days_ahead[None, :], -limit, limit)
+    return np.maximum(last + change, 0.0)
+
+
+def profit_scenarios(
+    acreage: float,
+    yields: np.ndarray,
+    production_cost: float,
+    prices: np.ndarray,
+    distances_km: np.ndarray,
+    transport_rate: float = PROFIT_TRANSPORT_RATE,
+) -> dict[str, np.ndarray]:
+    """Profit of selling the harvest at every market on every sale date.
+
+    Profit is linear in the harvest, so its spread follows from the sorted
+    yield samples without evaluating every sample in every scenario.
+
+    Args:
+        acreage: area grown, in acres.
+        yields: sorted yield samples in quintal per acre.
+        production_cost: total cost of growing the crop.
+        prices: sale prices per quintal, shape (markets, dates).
+        distances_km: distance to each market, shape (markets,).
+        transport_rate: cost per quintal per km.
+
+    Returns:
+        dict: arrays of shape (markets, dates) for the expected profit, its
+        10th and 90th percentiles, the probability of a loss, the break-even
+        price and the break-even yield, plus the transport cost per market.
+    """
+    harvest = acreage * yields
+    low, high = np.percentile(harvest, [10, 90])
+    expected = harvest.mean()
+    transport = distances_km * transport_rate
+    net_price = prices - transport[:, None]
+    gains = net_price >= 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Harvest below which the sale does not cover the production cost.
+        needed = np.where(net_price > 0, production_cost / net_price, np.inf)
+    return {
+        "expected_profit": net_price * expected - production_cost,
+        "profit_p10": np.where(gains, net_price * low, net_price * high) - production_cost,
+        "profit_p90": np.where(gains, net_price * high, net_price * low) - production_cost,
+        "loss_probability": np.searchsorted(harvest, needed) / len(harvest),
+        "break_even_price": np.broadcast_to(
+            production_cost / expected + transport[:, None], prices.shape
+        ),
+        "break_even_yield": needed / acreage,
+        "transport_cost": transport * expected,
+    }
+
+
+def sensitivity(
+    expected_harvest: float,
+    production_cost: float,
+    price: float,
+    transport_per_quintal: float,
+    changes_pct: np.ndarray = SENSITIVITY_PCT,
+) -> np.ndarray:
+    """Expected profit with the price (rows) and yield (columns) changed by `changes_pct`."""
+    prices = price * (1 + changes_pct[:, None] / 100) - transport_per_quintal
+    harvests = expected_harvest * (1 + changes_pct[None, :] / 100)
+    return prices * harvests - production_cost
+
+
+def _round(value: float) -> Optional[float]:
+    return round(float(value), 2) if np.isfinite(value) else None
+
+
+def calculate_crop_profit(
+    crop: str,
+    acreage: float,
+    yield_per_acre: float,
+    yield_low: float,
+    yield_high: float,
+    costs_per_acre: dict[str, float],
+    markets: list[str],
+    distances_km: list[float],
+    price_series: dict[str, list[float]],
+    sale_in_days: list[int],
+) -> dict:
+    """Calculates expected profit and break-even prices for selling a crop.
+
+    Evaluates every market on every sale date in one call. Use it instead of
+    doing the arithmetic yourself. Prices and costs must be in the same
+    currency.
+
+    Args:
+        crop (str): the crop, e.g. "Tomato"
+        acreage (float): the area grown, in acres
+        yield_per_acre (float): the most likely yield, in quintal per acre
+        yield_low (float): a poor-season yield in quintal per acre, or 0
+        yield_high (float): a good-season yield in quintal per acre, or 0
+        costs_per_acre (dict): production cost per acre by component, e.g.
+            {"seed": 8000, "fertiliser": 6000, "labour": 15000}
+        markets (list): the mandis to compare, e.g. ["Kolar APMC"]
+        distances_km (list): the road distance from the farm to each market, in km
+        price_series (dict): recent daily prices per quintal of each market,
+            oldest first, e.g. {"Kolar APMC": [1350, 1380, 1400]}
+        sale_in_days (list): days from today to evaluate a sale on, e.g. [0, 7, 14]
+
+    Returns:
+        dict: the production cost, the expected harvest and, for the best
+        scenarios, the sale price, transport cost, expected profit with its
+        10th and 90th percentiles, the probability of a loss, break-even
+        price and break-even yield, plus a price and yield sensitivity table
+        of the best scenario; or status "error" or "not_found" with a message.
+    """
+    if acreage <= 0 or yield_per_acre <= 0:
+        return {"status": "error", "message": "acreage and yield_per_acre must be positive."}
+    if not markets or len(markets) != len(distances_km):
+        return {"status": "error", "message": "Give one distance in km for every market."}
+    sale_in_days = sale_in_days or [0]
+    series = []
+    for market in markets:
+        prices = [float(price) for price in (price_series or {}).get(market) or []]
+        if not prices:
+            return {
+                "status": "not_found",
+                "message": f"No prices for {crop} at {market}; pass its recent prices in price_series.",
+            }
+        series.append(prices)
+
+    costs = {name: float(cost) * acreage for name, cost in (costs_per_acre or {}).items()}
+    production_cost = sum(costs.values())
+    yields = yield_samples(yield_per_acre, yield_low, yield_high, PROFIT_YIELD_SAMPLES)
+    days = np.asarray(sale_in_days, dtype=np.float64)
+    prices = project_prices(series, days, PROFIT_MAX_PRICE_CHANGE_PCT)
+    distances = np.asarray(distances_km, dtype=np.float64)
+    result = profit_scenarios(acreage, yields, production_cost, prices, distances)
+    harvest = acreage * yields
+
+    order = np.argsort(result["expected_profit"], axis=None)[::-1][:PROFIT_MAX_SCENARIOS]
+    scenarios = []
+    for flat in order:
+        m, d = np.unravel_index(flat, prices.shape)
+        scenarios.append({
+            "market": markets[m],
+            "sale_in_days": int(sale_in_days[d]),
+            "price": _round(prices[m, d]),
+            "transport_cost": _round(result["transport_cost"][m]),
+            "expected_profit": _round(result["expected_profit"][m, d]),
+            "profit_p10": _round(result["profit_p10"][m, d]),
+            "profit_p90": _round(result["profit_p90"][m, d]),
+            "loss_probability": round(float(result["loss_probability"][m, d]), 3),
+            "break_even_price": _round(result["break_even_price"][m, d]),
+            "break_even_yield_per_acre": _round(result["break_even_yield"][m, d]),
+        })
+    best_m, best_d = np.unravel_index(order[0], prices.shape)
+    table = sensitivity(
+        harvest.mean(), production_cost, prices[best_m, best_d], distances[best_m] * PROFIT_TRANSPORT_RATE
+    )
+    logging.info(f"[profit_calculator] {crop}: {prices.size} scenarios over {len(markets)} markets")
+    return {
+        "status": "success",
+        "crop": crop,
+        "units": {"price": "per quintal", "yield": "quintal per acre", "harvest": "quintal"},
+        "production_cost": _round(production_cost),
+        "cost_breakdown": {name: _round(cost) for name, cost in costs.items()},
+        "harvest": {
+            "expected": _round(harvest.mean()),
+            "p10": _round(np.percentile(harvest, 10)),
+            "p90": _round(np.percentile(harvest, 90)),
+        },
+        "scenarios_evaluated": int(prices.size),
+        "best_scenarios": scenarios,
+        "sensitivity": {
+            "scenario": f"{markets[best_m]}, sale in {sale_in_days[best_d]} days",
+            "price_change_pct": SENSITIVITY_PCT.tolist(),
+            "yield_change_pct": SENSITIVITY_PCT.tolist(),
+            "expected_profit": [[_round(value) for value in row] for row in table],
+        },
+    }
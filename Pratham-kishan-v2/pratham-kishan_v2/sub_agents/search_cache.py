@@ -0,0 +1,237 @@
+# sub_agents/search_cache.py
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from google.genai import types
+
+from .cache_db import CACHE_DIR, open_cache_db
+
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", os.path.join(CACHE_DIR, "search_cache.sqlite"))
+SEARCH_CACHE_TTL_S = float(os.getenv("SEARCH_CACHE_TTL_S", str(6 * 3600)))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+SEARCH_MODEL = os.getenv("SEARCH_MODEL", "gemini-2.0-flash")
+
+# Words that do not change what a farmer's query finds.
+_STOPWORDS = {
+    "a", "an", "the", "of", "for", "in", "on", "at", "to", "is", "are", "what",
+    "whats", "current", "latest", "today", "todays", "please", "me", "my", "and",
+}
+
+SearchBackend = Callable[[str], Awaitable[dict[str, Any]]]
+
+# Set in a hedged duplicate run, whose searches must not wait for the
+# in-flight searches of the (possibly stuck) run it duplicates.
+fresh_searches: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "fresh_searches", default=False
+)
+# Result handed to waiters when the search they joined was cancelled.
+_RETRY = object()
+
+
+def normalize_query(query: str) -> str:
+    """Maps rewordings of the same query to one key.
+
+    Lower-cases, drops punctuation and filler words and sorts the remaining
+    words, so "Mandi price for wheat, Karnataka" and "karnataka wheat mandi
+    price" share a cache entry.
+    """
+    words = set(re.findall(r"\w+", query.lower())) - _STOPWORDS
+    return " ".join(sorted(words))
+
+
+_client = None
+
+
+async def grounded_search(query: str) -> dict[str, Any]:
+    """Answers a query with a Gemini call grounded on Google Search."""
+    global _client
+    if _client is None:
+        from google import genai
+
+        _client = genai.Client()
+    response = await _client.aio.models.generate_content(
+        model=SEARCH_MODEL,
+        contents=query,
+        config=types.GenerateContentConfig(
+            tools=[types.Tool(google_search=types.GoogleSearch())],
+            temperature=0,
+        ),
+    )
+    metadata = response.candidates[0].grounding_metadata if response.candidates else None
+    sources = [
+        {"title": chunk.web.title, "uri": chunk.web.uri}
+        for chunk in (metadata.grounding_chunks if metadata else None) or []
+        if chunk.web
+    ]
+    return {"status": "success", "results": response.text or "", "sources": sources}
+
+
+class SearchCache:
+    """Two-tier cache of search results with single-flight backend calls.
+
+    Results are keyed on the normalised query and kept for `ttl_s` seconds in
+    an in-memory LRU of `max_entries` and in SQLite at `path`, so they survive
+    restarts and are shared by every process on the host. While a query is
+    being fetched, identical queries wait for that fetch instead of starting
+    their own. If the fetching call is cancelled, the waiters start over and
+    one of them fetches instead. Failed searches are not cached. The database
+    is opened on first use, and its queries run in a worker thread so they do
+    not block the event loop.
+    """
+
+    def __init__(
+        self,
+        backend: SearchBackend = grounded_search,
+        path: str = SEARCH_CACHE_PATH,
+        ttl_s: float = SEARCH_CACHE_TTL_S,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+    ):
+        self.backend = backend
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.coalesced = 0
+        self.backend_calls = 0
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connection(self):
+        # Called with the lock held.
+        if self._db is None:
+            self._db = open_cache_db(
+                self.path,
+                "CREATE TABLE IF NOT EXISTS searches "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)",
+            )
+        return self._db
+
+    async def search(self, query: str) -> dict[str, Any]:
+        key = normalize_query(query)
+        while True:
+            cached = await self._get(key)
+            if cached is not None:
+                return cached
+            if fresh_searches.get():
+                return await self._fetch(key, query)
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            result = await asyncio.shield(inflight)
+            if result is not _RETRY:
+                return result
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch(key, query)
+        except asyncio.CancelledError:
+            # The waiters may belong to other sessions; they retry instead of
+            # being cancelled with this call.
+            future.set_result(_RETRY)
+            raise
+        finally:
+            del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    async def _fetch(self, key: str, query: str) -> dict[str, Any]:
+        self.backend_calls += 1
+        try:
+            result = await self.backend(query)
+        except Exception as e:
+            logging.info(f"[search_cache] search for '{query}' failed: {e}")
+            return {"status": "error", "message": f"Search failed: {e}"}
+        if result.get("status") == "success":
+            await self._put(key, result)
+        return result
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "coalesced": self.coalesced,
+            "backend_calls": self.backend_calls,
+        }
+
+    async def purge_expired(self) -> int:
+        return await asyncio.to_thread(self._delete_expired)
+
+    async def _get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[0] <= self.ttl_s:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+        row = await asyncio.to_thread(self._select, key)
+        if row is None or now - row[1] > self.ttl_s:
+            return None
+        result = json.loads(row[0])
+        self._remember(key, row[1], result)
+        self.disk_hits += 1
+        return result
+
+    async def _put(self, key: str, result: dict) -> None:
+        created = time.time()
+        self._remember(key, created, result)
+        await asyncio.to_thread(self._insert, key, json.dumps(result), created)
+
+    def _select(self, key: str) -> Optional[tuple[str, float]]:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT response, created FROM searches WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _insert(self, key: str, response: str, created: float) -> None:
+        with self._lock:
+            db = self._connection()
+            db.execute(
+                "INSERT OR REPLACE INTO searches (key, response, created) VALUES (?, ?, ?)",
+                (key, response, created),
+            )
+            db.commit()
+
+    def _delete_expired(self) -> int:
+        with self._lock:
+            db = self._connection()
+            deleted = db.execute(
+                "DELETE FROM searches WHERE created < ?", (time.time() - self.ttl_s,)
+            ).rowcount
+            db.commit()
+        return deleted
+
+    def _remember(self, key: str, created: float, result: dict) -> None:
+        with self._lock:
+            self._memory[key] = (created, result)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+
+search_cache = SearchCache()
+
+
+async def google_search(query: str) -> dict[str, Any]:
+    """Searches Google for up-to-date information.
+
+    Args:
+        query (str): the search query, e.g. "mandi price for wheat Karnataka"
+
+    Returns:
+        dict[str, Any]: a summary of the search results and their sources.
+    """
+    logging.info(f"[google_search] {query}")
+    return await search_cache.search(query)
@@ -1,6 +1,7 @@
 # sub_agents/weather/agent.py
 from google.adk.agents import LlmAgent
-from google.adk.tools import google_search
+from ..search_cache import google_search
+from ..weather_store import lookup_weather_forecast
 from . import prompts
 
 MODEL = "gemini-2.0-flash-lite"
@@ -8,5 +9,5 @@ weather_sub_agent = LlmAgent(
     name = "weather_sub_agent",
     model = MODEL,
     instruction=prompts.WEATHER_AGENT_PROMPT,
-    tools=[google_search]
+    tools=[lookup_weather_forecast, google_search]
 )
@@ -1,6 +1,5 @@
 import os
 import logging
-import google.cloud.logging
 
 from dotenv import load_dotenv
 
@@ -8,22 +7,52 @@ from google.adk import Agent
 from google.adk.agents import SequentialAgent, LoopAgent, ParallelAgent, LlmAgent
 from google.adk.tools.tool_context import ToolContext
 from google.adk.tools.agent_tool import AgentTool
-from google.adk.tools import google_search, exit_loop
+from google.adk.tools import exit_loop
 from google.genai import types
-from .callback_logging import log_query_to_model, log_model_response
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, \
-                StdioServerParameters, StdioConnectionParams
+from .concurrent_branches import ConcurrentBranchesAgent
+from .loop_control import ConvergentLoopAgent
+from .callback_logging import log_query_to_model, log_model_response, setup_logging
+from .mcp_pool import MCP_POOL_PREWARM, McpServerPool, PooledMcpToolset
+from .route_cache import RouteCache
+from .response_cache import ResponseCache
+from .mandi_price_store import lookup_mandi_prices
+from .profit_calculator import calculate_crop_profit
+from .scheme_catalogue import find_schemes
+from .search_cache import google_search, search_cache
+from .weather_store import lookup_weather_forecast
+from .context_budget import BudgetedInstruction
+from .bounded_agent_tool import BoundedAgentTool
+from .section_streaming import StreamingSectionsAgent
+from .model_router import route_from_env
+from .rate_limits import schedule_from_env
+from .state_fields import append_entries, materialize_before_agents
 from . import prompt
+from .tracing import instrument_from_env
 
-cloud_logging_client = google.cloud.logging.Client()
-cloud_logging_client.setup_logging()
+setup_logging()
 
-load_dotenv()
+load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
 
 model_name = os.getenv("MODEL")
 print(model_name)
 google_maps_api_key = os.getenv("GOOGLE_MAPS_API_KEY")
 
+maps_pool = McpServerPool(
+    dict(
+        command='npx',
+        args=[
+            "-y",
+            "@modelcontextprotocol/server-google-maps",
+        ],
+        env={
+            "GOOGLE_MAPS_API_KEY": google_maps_api_key
+        }
+    )
+)
+if MCP_POOL_PREWARM and google_maps_api_key:
+    maps_pool.start()
+route_cache = RouteCache()
+
 # Tools
 def append_to_state(
     tool_context: ToolContext, field: str, response: str
@@ -37,55 +66,78 @@ def append_to_state(
     Returns:
         dict[str, str]: {"status": "success"}
     """
-    existing_state = tool_context.state.get(field, [])
-    tool_context.state[field] = existing_state + [response]
+    append_entries(tool_context.state, field, [response])
     logging.info(f"[Added to {field}] {response}")
     return {"status": "success"}
 
 # Agents
 
 # Gov Scheme Agents
+scheme_search = LlmAgent(
+    name="scheme_search",
+    model=model_name,
+    description="Searches the web for government schemes for a crop.",
+    instruction="""
+    Use the 'Google Search' tool to find government schemes matching the request.
+    Summarize the schemes you found along with benefits and grant money.
+    """,
+    generate_content_config=types.GenerateContentConfig(
+            temperature=0.5,
+        ),
+    tools=[google_search],
+)
+
 scheme_researcher = LlmAgent(
     name="scheme_researcher",
     model=model_name,
     description="Researches government schemes based on crop details.",
-    instruction="""
+    instruction=BudgetedInstruction("""
     CROP_DETAILS:
     {{ CROP_DETAILS? }}
+    LOCATION:
+    {{ LOCATION? }}
+    SCHEME_FEEDBACK:
+    {{ SCHEME_FEEDBACK? }}
 
     INSTRUCTIONS:
-    Use the 'Google Search' tool to find relevant government schemes for the provided CROP_DETAILS.
-    Summarize the schemes you found.
-    """,
+    Use the 'find_schemes' tool to find relevant government schemes and their benefits for the crop in
+    CROP_DETAILS and the state in LOCATION. Call it again with a farmer category or benefit type when
+    SCHEME_FEEDBACK asks for one.
+    Only if it returns status 'not_found', use the 'scheme_search' tool instead.
+    Summarize the schemes you found along with benefits and grant money, and list the
+    general_schemes briefly as schemes open to every farmer.
+    """),
+    include_contents="none",
     generate_content_config=types.GenerateContentConfig(
             temperature=0.5,
         ),
-    tools=[google_search],
+    tools=[find_schemes, AgentTool(agent=scheme_search)],
+    output_key="SCHEME_DATA",
 )
 
 scheme_benefit = LlmAgent(
     name="scheme_benefit",
     model=model_name,
     description="Calculated the benefits from the scheme.",
-    instruction="""
+    instruction=BudgetedInstruction("""
     CROP_DETAILS:
     {{ CROP_DETAILS? }}
 
     INSTRUCTIONS:
-    Use the 'Google Search' tool to find maximum benefit from the scheme.
+    Use the 'find_schemes' tool to find maximum benefit from the scheme.
     Summarize the schemes you found along with benefits and grant money.
-    """,
+    """),
     generate_content_config=types.GenerateContentConfig(
             temperature=0.5,
         ),
-    tools=[google_search],
+    tools=[find_schemes],
 )
 
 gov_scheme_critic = Agent(
     name="gov_scheme_critic",
     model=model_name,
     description="Maximizes benefits from government schemes.",
-    instruction="""
+    instruction=BudgetedInstruction("""
     SCHEME_DATA:
     {{ SCHEME_DATA? }}
     CROP_DETAILS:
@@ -97,14 +149,15 @@ gov_scheme_critic = Agent(
     If significant improvements or additional details can be found, use the 'append_to_state' tool to add your feedback to the field 'SCHEME_FEEDBACK'.
     If the schemes are optimal or no further improvements can be made, use the 'exit_loop' tool after you
     explain your decision and briefly summarize the feedback you have provided.
-    """,
+    """),
+    include_contents="none",
     generate_content_config=types.GenerateContentConfig(
             temperature=0.5,
         ),
     tools=[append_to_state, exit_loop],
 )
 
-gov_scheme_agent = LoopAgent(
+gov_scheme_agent = ConvergentLoopAgent(
     name="gov_scheme_agent",
     description="Iterates through research and analysis to maximize government scheme benefits.",
     sub_agents=[
@@ -112,65 +165,85 @@ gov_scheme_agent = LoopAgent(
         gov_scheme_critic
     ],
     max_iterations=3,
+    watch_key="SCHEME_FEEDBACK",
 )
 
 # Mandi Price Agents
+mandi_search = Agent(
+    name="mandi_search",
+    model=model_name,
+    description="Searches the web for current mandi prices of a crop.",
+    instruction="""
+    Use the 'Google Search' tool to find current mandi prices for the crop in the request.
+    Summarize the prices you found with market, date and price per quintal.
+    """,
+    generate_content_config=types.GenerateContentConfig(
+            temperature=0,
+        ),
+    tools=[google_search],
+)
+
 mandi_researcher = Agent(
     name="mandi_researcher",
     model=model_name,
     description="Researches current mandi prices for specified crops.",
-    instruction="""
+    instruction=BudgetedInstruction("""
     CROP_DETAILS:
     {{ CROP_DETAILS? }}
+    LOCATION:
+    {{ LOCATION? }}
+    PROFIT_OPTIMIZATION_FEEDBACK:
+    {{ PROFIT_OPTIMIZATION_FEEDBACK? }}
 
     INSTRUCTIONS:
-    Use the 'Google Search' tool to find current mandi prices for the specified CROP_DETAILS.
+    Use the 'lookup_mandi_prices' tool to get the latest prices and price trend for the crop in CROP_DETAILS,
+    using the state from LOCATION. Also look up any markets or states that PROFIT_OPTIMIZATION_FEEDBACK suggests.
+    Only if it returns status 'not_found', use the 'mandi_search' tool to find current mandi prices instead.
     Summarize the prices you found.
-    """,
+    """),
     before_model_callback=log_query_to_model,
     after_model_callback=log_model_response,
+    include_contents="none",
     generate_content_config=types.GenerateContentConfig(
             temperature=0,
         ),
-    tools=[google_search],
+    tools=[lookup_mandi_prices, AgentTool(agent=mandi_search)],
+    output_key="MANDI_PRICE_DATA",
 )
 
 mandi_profit = Agent(
     name="mandi_profit",
     model=model_name,
     description="Calculates potential profit based on mandi prices and crop details.",
-    instruction="""
+    instruction=BudgetedInstruction("""
     MANDI_PRICE_DATA:
     {{ MANDI_PRICE_DATA? }}
     CROP_DETAILS:
     {{ CROP_DETAILS? }}
+    LOCATION:
+    {{ LOCATION? }}
+    PROFIT_OPTIMIZATION_FEEDBACK:
+    {{ PROFIT_OPTIMIZATION_FEEDBACK? }}
 
     INSTRUCTIONS:
     Based on the MANDI_PRICE_DATA and CROP_DETAILS (e.g., expected yield, production cost),
+    taking into account the markets and sale dates suggested in PROFIT_OPTIMIZATION_FEEDBACK,
+    use the 'lookup_mandi_prices' tool if you need prices for another market or state,
     all map calculation consider country to be India and state to be karnatka untill mentioned otherwise
-    calculate the potential profit.
-    calculate the maps_directions to mandi or Vegetable mandi or fruit mandi or Vegetable market or fruit market from farmer location  using MCPToolset
+    calculate the maps_directions to mandi or Vegetable mandi or fruit mandi or Vegetable market or fruit market from the farmer LOCATION using MCPToolset
+    Then call the 'calculate_crop_profit' tool once with every candidate market, its distance and sale dates
+    (e.g. today, in 7 and in 14 days) to get the expected profit, break-even price and sensitivity table;
+    do not do the profit arithmetic yourself.
     Use the 'append_to_state' tool to add your profit calculation and distance to mandi to the 'PROFIT_ANALYSIS' and 'DISTANCE_ANALYSIS' field.
-    """,
+    """),
+    include_contents="none",
     generate_content_config=types.GenerateContentConfig(
             temperature=0,
         ),
     tools=[append_to_state,
-            MCPToolset(
-                    connection_params=StdioConnectionParams(
-                        server_params=StdioServerParameters(
-                            command='npx',
-                            args=[
-                                "-y",
-                                "@modelcontextprotocol/server-google-maps",
-                            ],
-                            env={
-                                "GOOGLE_MAPS_API_KEY": google_maps_api_key
-                            }
-                        ),
-                        timeout=5,
-                        ),
-                    )
+            lookup_mandi_prices,
+            calculate_crop_profit,
+            PooledMcpToolset(maps_pool, route_cache),
     ],
 )
 
@@ -178,7 +251,7 @@ mandi_critic = Agent(
     name="mandi_critic",
     model=model_name,
     description="Suggests ways to maximize profit from mandi sales.",
-    instruction="""
+    instruction=BudgetedInstruction("""
     DISTANCE_ANALYSIS:
     {{DISTANCE_ANALYSIS? }}
     PROFIT_ANALYSIS:
@@ -193,14 +266,15 @@ mandi_critic = Agent(
     If significant improvements can be made, use the 'append_to_state' tool to add your feedback to the field 'PROFIT_OPTIMIZATION_FEEDBACK'.
     If the profit is optimal or no further improvements can be made, use the 'exit_loop' tool.
     Explain your decision and briefly summarize the feedback you have provided.
-    """,
+    """),
+    include_contents="none",
     generate_content_config=types.GenerateContentConfig(
             temperature=0.2,
         ),
     tools=[append_to_state, exit_loop],
 )
 
-mandi_price_agent = LoopAgent(
+mandi_price_agent = ConvergentLoopAgent(
     name="mandi_price_agent",
     description="Iterates through mandi price research and profit optimization.",
     sub_agents=[
@@ -209,6 +283,7 @@ mandi_price_agent = LoopAgent(
         mandi_critic
     ],
     max_iterations=2,
+    watch_key="PROFIT_OPTIMIZATION_FEEDBACK",
 )
 
 # Individual Pratham Kisan Agents
@@ -237,12 +312,16 @@ weather_agent = Agent(
     description="Provides weather forecasts and their impact on crops.",
     instruction="""
     INSTRUCTIONS:
-    Use the 'Google Search' tool to get the current and forecasted weather for the LOCATION.
+    Use the 'lookup_weather_forecast' tool to get the forecast for the district in LOCATION, with the
+    crop from CROP_DETAILS; it also returns rain days, heat stress days, growing degree days and the
+    longest dry spell.
+    Only if it returns status 'not_found', use the 'Google Search' tool to get the current and
+    forecasted weather for the LOCATION.
     Analyze how the weather might impact the CROP_DETAILS and suggest necessary actions.
     """,
     before_model_callback=log_query_to_model,
     after_model_callback=log_model_response,
-    tools=[google_search],
+    tools=[lookup_weather_forecast, google_search],
     generate_content_config=types.GenerateContentConfig(
             temperature=0.2,
         ),
@@ -264,7 +343,16 @@ farming_new_tech_agent = Agent(
         ),
 )
 
-simple_agents = Agent(
+response_cache = ResponseCache()
+response_cache.attach(crop_management_agent, ttl_s=float(os.getenv("CROP_MANAGEMENT_CACHE_TTL_S", str(7 * 24 * 3600))))
+response_cache.attach(weather_agent, ttl_s=float(os.getenv("WEATHER_CACHE_TTL_S", str(3 * 3600))))
+response_cache.attach(
+    farming_new_tech_agent,
+    ttl_s=float(os.getenv("FARMING_TECH_CACHE_TTL_S", str(30 * 24 * 3600))),
+    fields=("crop", "stage"),
+)
+
+simple_agents = StreamingSectionsAgent(
     name = "simple_agents",
     model = model_name,
     description=(
@@ -272,9 +360,9 @@ simple_agents = Agent(
             ),
     instruction = prompt.SIMPLE_AGENT,
     tools=[
-                AgentTool(agent=crop_management_agent),
-                AgentTool(agent=weather_agent),
-                AgentTool(agent=farming_new_tech_agent),
+                BoundedAgentTool(agent=crop_management_agent),
+                BoundedAgentTool(agent=weather_agent),
+                BoundedAgentTool(agent=farming_new_tech_agent),
     ],
     generate_content_config=types.GenerateContentConfig(
             temperature=0.2,
@@ -282,6 +370,70 @@ simple_agents = Agent(
 
 )
 
+# Full Report Agents
+REPORT_FIELD_TOKENS = {
+    key: int(os.getenv("REPORT_FIELD_TOKENS", "600"))
+    for key in ["CROP_MANAGEMENT_REPORT", "WEATHER_REPORT", "FARMING_TECH_REPORT", "SCHEME_REPORT", "MANDI_REPORT"]
+}
+
+advisory_branches = ConcurrentBranchesAgent(
+    name="advisory_branches",
+    description="Runs every advisory branch at once, each into its own state key.",
+    branches={
+        "CROP_MANAGEMENT_REPORT": crop_management_agent,
+        "WEATHER_REPORT": weather_agent,
+        "FARMING_TECH_REPORT": farming_new_tech_agent,
+        "SCHEME_REPORT": gov_scheme_agent,
+        "MANDI_REPORT": mandi_price_agent,
+    },
+    timeout_s=float(os.getenv("REPORT_BRANCH_TIMEOUT_S", "120")),
+    # The Maps and price lookups make this the slowest branch; don't let it hold up the report.
+    branch_timeouts_s={"MANDI_REPORT": float(os.getenv("MANDI_REPORT_TIMEOUT_S", "60"))},
+)
+
+report_synthesizer = LlmAgent(
+    name="report_synthesizer",
+    model=model_name,
+    description="Merges the advisory branch reports into one report.",
+    instruction=BudgetedInstruction("""
+    CROP_DETAILS:
+    {{ CROP_DETAILS? }}
+    LOCATION:
+    {{ LOCATION? }}
+    CROP_MANAGEMENT_REPORT:
+    {{ CROP_MANAGEMENT_REPORT? }}
+    WEATHER_REPORT:
+    {{ WEATHER_REPORT? }}
+    FARMING_TECH_REPORT:
+    {{ FARMING_TECH_REPORT? }}
+    SCHEME_REPORT:
+    {{ SCHEME_REPORT? }}
+    MANDI_REPORT:
+    {{ MANDI_REPORT? }}
+    MISSING_SECTIONS:
+    {{ MISSING_SECTIONS? }}
+
+    INSTRUCTIONS:
+    Combine the reports above into a single farming advisory for the CROP_DETAILS and LOCATION,
+    formatted as markdown with one section per report. Do not research anything new.
+    The reports listed in MISSING_SECTIONS failed or did not finish in time: keep their sections, say that
+    this part of the advisory is not available yet and that the farmer can ask for it again later.
+    """, tokens=REPORT_FIELD_TOKENS),
+    include_contents="none",
+    generate_content_config=types.GenerateContentConfig(
+            temperature=0.2,
+        ),
+)
+
+full_report_agent = SequentialAgent(
+    name="full_report_agent",
+    description="Builds the complete advisory report with all branches running concurrently.",
+    sub_agents=[
+        advisory_branches,
+        report_synthesizer
+    ],
+)
+
 pratham_kishan_agent = LlmAgent(
     name="pratham_kishan_agent",
     model = model_name,
@@ -294,7 +446,8 @@ pratham_kishan_agent = LlmAgent(
     instruction = prompt.PRATHAM_KISHAN_INSTRUCTION,
      sub_agents=[simple_agents,
                 gov_scheme_agent,
-                mandi_price_agent
+                mandi_price_agent,
+                full_report_agent
      ],
      generate_content_config=types.GenerateContentConfig(
                temperature=0.2,
@@ -315,4 +468,11 @@ root_agent = LlmAgent(
             temperature=0.2,
         ),
     sub_agents=[pratham_kishan_agent],
-)
\ No newline at end of file
+)
+
+model_router = route_from_env(root_agent)
+rate_limiter = schedule_from_env(root_agent)
+if rate_limiter:
+    search_cache.backend = rate_limiter.wrap("tool:google_search", search_cache.backend)
+materialize_before_agents(root_agent)
+instrument_from_env(root_agent)
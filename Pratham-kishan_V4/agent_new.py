@@ -1,22 +1,19 @@
 import os
 import logging
-import google.cloud.logging
 
 from dotenv import load_dotenv
 
 from google.adk import Agent
 from google.adk.agents import SequentialAgent, LoopAgent, ParallelAgent
 from google.adk.tools.tool_context import ToolContext
-from google.adk.tools.langchain_tool import LangchainTool  # import
 from google.genai import types
 
-from langchain_community.tools import WikipediaQueryRun
-from langchain_community.utilities import WikipediaAPIWrapper
 #from crewai_tools import FileWriterTool
 from google.adk.tools import exit_loop,google_search
+from .callback_logging import setup_logging
+from .state_fields import append_entries, materialize_before_agents
 
-cloud_logging_client = google.cloud.logging.Client()
-cloud_logging_client.setup_logging()
+setup_logging()
 
 load_dotenv()
 
@@ -25,6 +22,27 @@ print(model_name)
 
 # Tools
 
+_wikipedia = None
+
+
+def wikipedia(query: str) -> str:
+    """Look up a topic on Wikipedia.
+
+    Args:
+        query (str): the person, event or subject to look up
+
+    Returns:
+        str: summaries of the matching Wikipedia pages
+    """
+    # langchain_community is slow to import; load it on the first lookup.
+    global _wikipedia
+    if _wikipedia is None:
+        from langchain_community.tools import WikipediaQueryRun
+        from langchain_community.utilities import WikipediaAPIWrapper
+
+        _wikipedia = WikipediaQueryRun(api_wrapper=WikipediaAPIWrapper())
+    return _wikipedia.run(query)
+
 
 def append_to_state(
     tool_context: ToolContext, field: str, response: str
@@ -38,8 +56,7 @@ def append_to_state(
     Returns:
         dict[str, str]: {"status": "success"}
     """
-    existing_state = tool_context.state.get(field, [])
-    tool_context.state[field] = existing_state + [response]
+    append_entries(tool_context.state, field, [response])
     logging.info(f"[Added to {field}] {response}")
     return {"status": "success"}
 
@@ -203,7 +220,7 @@ researcher = Agent(
         temperature=0,
     ),
     tools=[
-        LangchainTool(tool=WikipediaQueryRun(api_wrapper=WikipediaAPIWrapper())),
+        wikipedia,
         append_to_state,
     ],
 )
@@ -245,3 +262,5 @@ root_agent = Agent(
     tools=[append_to_state],
     sub_agents=[film_concept_team],
 )
+
+materialize_before_agents(root_agent)
@@ -0,0 +1,317 @@
+"""Overnight advisory reports for a list of registered farmers.
+
+    python -m Pratham-kishan_V4.batch_reports farmers.csv reports.jsonl
+
+Reads farmer profiles (CSV or JSON lines with farmer_id, crop, district,
+acreage and any other columns), runs the shared research of the full report
+(weather, mandi prices, schemes, crop management, technology) once per
+(crop, district) group, and writes one personalised report per farmer to a
+JSON-lines file. Rerunning the same command after a crash skips the farmers
+already written and the groups whose research is already done.
+"""
+import argparse
+import asyncio
+import csv
+import importlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from .rate_limits import BATCH, request_priority
+from .response_cache import canonical_key
+
+BATCH_GROUP_CONCURRENCY = int(os.getenv("BATCH_GROUP_CONCURRENCY", "4"))
+BATCH_FARMER_CONCURRENCY = int(os.getenv("BATCH_FARMER_CONCURRENCY", "16"))
+
+_ALIASES = {"id": "farmer_id", "farmer": "farmer_id", "acres": "acreage", "area": "acreage"}
+# Inputs of the research run, not part of its results.
+_INPUT_KEYS = ("CROP_DETAILS", "LOCATION")
+
+
+@dataclass
+class Farmer:
+    farmer_id: str
+    crop: str
+    district: str
+    acreage: str = ""
+    details: dict[str, str] = field(default_factory=dict)
+
+    def crop_details(self) -> str:
+        parts = [self.crop]
+        if self.acreage:
+            parts.append(f"{self.acreage} acres")
+        parts += [f"{key.replace('_', ' ')}: {value}" for key, value in self.details.items()
+                  if value and key != "state"]
+        return ", ".join(parts)
+
+    def location(self) -> str:
+        state = self.details.get("state", "")
+        return f"{self.district}, {state}" if state else self.district
+
+
+@dataclass
+class BatchSummary:
+    groups: int = 0
+    groups_researched: int = 0
+    farmers: int = 0
+    written: int = 0
+    skipped: int = 0
+    failed: int = 0
+    wall_s: float = 0.0
+
+
+def _column(name: str) -> str:
+    name = "_".join(name.strip().lower().split())
+    return _ALIASES.get(name, name)
+
+
+def _farmer(row: dict[str, Any], number: int) -> Farmer:
+    row = {_column(k): "" if v is None else str(v).strip() for k, v in row.items() if k}
+    return Farmer(
+        farmer_id=row.pop("farmer_id", "") or f"row-{number}",
+        crop=row.pop("crop", ""),
+        district=row.pop("district", ""),
+        acreage=row.pop("acreage", ""),
+        details=row,
+    )
+
+
+def read_farmers(path: str) -> list[Farmer]:
+    """Reads farmer profiles from a .csv file or a JSON-lines file.
+
+    Column names are matched case-insensitively ("Farmer ID", "farmer_id");
+    a row without an id gets "row-<n>", which only stays stable while the
+    file is not reordered.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+    return [_farmer(row, number) for number, row in enumerate(rows, 1)]
+
+
+def group_key(farmer: Farmer) -> tuple[str, str]:
+    """(crop, district) with the names normalised, so "Paddy" and "rice" share research."""
+    key = canonical_key(farmer.crop, farmer.district, date.today().month)
+    return key["crop"], key["district"]
+
+
+def _read_jsonl(path: str) -> list[dict[str, Any]]:
+    """Records of a JSON-lines file; a line cut short by a crash is ignored."""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logging.warning(f"[batch_reports] skipping a partial line in {path}")
+    return records
+
+
+class _JsonlWriter:
+    """Appends records to a JSON-lines file, each flushed to disk before returning."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a+", encoding="utf-8")
+        if self._file.tell():
+            self._file.seek(self._file.tell() - 1)
+            if self._file.read(1) != "\n":
+                # The last run died mid-line; start on a fresh one.
+                self._file.write("\n")
+
+    def write(self, record: dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+async def _run(runner: InMemoryRunner, state: dict[str, Any], message: str) -> tuple[str, dict]:
+    """Runs the runner's agent once in a new session and returns its final text and state."""
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="batch", state=state
+    )
+    texts = []
+    try:
+        async for event in runner.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=types.UserContent(parts=[types.Part(text=message)]),
+        ):
+            if event.is_final_response() and event.content and event.content.parts:
+                texts.append("".join(part.text or "" for part in event.content.parts))
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name, user_id=session.user_id, session_id=session.id
+        )
+        return "\n\n".join(text for text in texts if text), dict(session.state)
+    finally:
+        await runner.session_service.delete_session(
+            app_name=runner.app_name, user_id=session.user_id, session_id=session.id
+        )
+
+
+class BatchReportPipeline:
+    """Generates a report per farmer, sharing the research within each group.
+
+    `research_agent` runs once per group with CROP_DETAILS and LOCATION set to
+    the group's crop and district; the state it leaves behind (the branch
+    reports) is the starting state of `report_agent`, which runs once per
+    farmer with that farmer's own CROP_DETAILS and LOCATION. Up to
+    `group_concurrency` groups research at a time and up to
+    `farmer_concurrency` reports are written at a time across all groups.
+
+    Every report goes to `output_path` as soon as it is done, as
+    {"farmer_id", "crop", "district", "status", "report" or "error"}; the
+    research of each group goes to `<output_path>.research.jsonl`. A rerun
+    reads both back: farmers with an "ok" record are skipped, and a group
+    with stored research does not research again. Failed farmers are written
+    with status "error" and retried by the next run, so readers should keep
+    the last record of each farmer_id.
+    """
+
+    def __init__(
+        self,
+        research_agent: BaseAgent,
+        report_agent: BaseAgent,
+        output_path: str,
+        group_concurrency: int = BATCH_GROUP_CONCURRENCY,
+        farmer_concurrency: int = BATCH_FARMER_CONCURRENCY,
+        key: Callable[[Farmer], tuple] = group_key,
+        app_name: str = "pratham_kishan_batch",
+    ):
+        self.research_runner = InMemoryRunner(agent=research_agent, app_name=app_name)
+        self.report_runner = InMemoryRunner(agent=report_agent, app_name=app_name)
+        self.output_path = output_path
+        self.research_path = f"{output_path}.research.jsonl"
+        self.group_concurrency = group_concurrency
+        self.farmer_concurrency = farmer_concurrency
+        self.key = key
+
+    async def _research(self, farmers: list[Farmer]) -> dict[str, Any]:
+        first = farmers[0]
+        _, state = await _run(
+            self.research_runner,
+            {"CROP_DETAILS": first.crop, "LOCATION": first.location()},
+            f"Research {first.crop} in {first.location()} for {len(farmers)} farmers.",
+        )
+        return {k: v for k, v in state.items() if k not in _INPUT_KEYS}
+
+    async def _report(self, farmer: Farmer, research: dict[str, Any]) -> dict[str, Any]:
+        record = {"farmer_id": farmer.farmer_id, "crop": farmer.crop, "district": farmer.district}
+        try:
+            report, _ = await _run(
+                self.report_runner,
+                {**research, "CROP_DETAILS": farmer.crop_details(), "LOCATION": farmer.location()},
+                f"Write the advisory for farmer {farmer.farmer_id}.",
+            )
+            record.update(status="ok", report=report)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.warning(f"[batch_reports] report for {farmer.farmer_id} failed: {e}")
+            record.update(status="error", error=f"{type(e).__name__}: {e}")
+        return record
+
+    async def run(self, farmers: list[Farmer]) -> BatchSummary:
+        """Writes a report for every farmer that does not have one yet."""
+        started = time.perf_counter()
+        summary = BatchSummary(farmers=len(farmers))
+        done = {r["farmer_id"] for r in _read_jsonl(self.output_path) if r.get("status") == "ok"}
+        researched = {
+            tuple(r["group"]): r["state"] for r in _read_jsonl(self.research_path)
+        }
+        groups: dict[tuple, list[Farmer]] = {}
+        for farmer in farmers:
+            if farmer.farmer_id in done:
+                summary.skipped += 1
+            else:
+                groups.setdefault(self.key(farmer), []).append(farmer)
+        summary.groups = len(groups)
+
+        reports = _JsonlWriter(self.output_path)
+        research_log = _JsonlWriter(self.research_path)
+        group_slots = asyncio.Semaphore(self.group_concurrency)
+        farmer_slots = asyncio.Semaphore(self.farmer_concurrency)
+
+        async def report(farmer: Farmer, research: dict[str, Any]) -> None:
+            async with farmer_slots:
+                record = await self._report(farmer, research)
+            reports.write(record)
+            if record["status"] == "ok":
+                summary.written += 1
+            else:
+                summary.failed += 1
+
+        async def run_group(key: tuple, members: list[Farmer]) -> None:
+            research = researched.get(key)
+            if research is None:
+                try:
+                    async with group_slots:
+                        research = await self._research(members)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logging.warning(f"[batch_reports] research for {key} failed: {e}")
+                    for farmer in members:
+                        reports.write({
+                            "farmer_id": farmer.farmer_id, "crop": farmer.crop,
+                            "district": farmer.district, "status": "error",
+                            "error": f"research failed: {type(e).__name__}: {e}",
+                        })
+                    summary.failed += len(members)
+                    return
+                research_log.write({"group": list(key), "state": research})
+                summary.groups_researched += 1
+            await asyncio.gather(*(report(farmer, research) for farmer in members))
+
+        try:
+            # Farmers chatting with the agent go ahead of the batch.
+            with request_priority(BATCH):
+                await asyncio.gather(*(run_group(key, members) for key, members in groups.items()))
+        finally:
+            reports.close()
+            research_log.close()
+            summary.wall_s = time.perf_counter() - started
+        return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("farmers", help="CSV or JSON-lines file of farmer profiles")
+    parser.add_argument("output", help="JSON-lines file the reports are appended to")
+    parser.add_argument("--group-concurrency", type=int, default=BATCH_GROUP_CONCURRENCY)
+    parser.add_argument("--farmer-concurrency", type=int, default=BATCH_FARMER_CONCURRENCY)
+    args = parser.parse_args()
+
+    agent = importlib.import_module(f"{__package__}.agent")
+    pipeline = BatchReportPipeline(
+        agent.advisory_branches,
+        agent.report_synthesizer,
+        args.output,
+        group_concurrency=args.group_concurrency,
+        farmer_concurrency=args.farmer_concurrency,
+    )
+    summary = asyncio.run(pipeline.run(read_farmers(args.farmers)))
+    print(
+        f"{summary.farmers} farmers in {summary.groups} groups to do: {summary.written} written, "
+        f"{summary.skipped} already done, {summary.failed} failed; "
+        f"{summary.groups_researched} groups researched in {summary.wall_s:.1f} s"
+    )
+    if summary.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
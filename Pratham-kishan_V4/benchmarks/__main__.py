@@ -0,0 +1,58 @@
+"""Offline benchmark of the V4 agent tree.
+
+Run from the repository root:
+
+    python -m Pratham-kishan_V4.benchmarks --latency 0.2 --json baseline.json
+
+Every model is replaced by a scripted stand-in, so no Gemini, search or Maps
+calls are made.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+
+from ..tracing import JsonLinesExporter, instrument
+from .harness import FakeBackend, format_report, run_benchmark
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds per model turn")
+    parser.add_argument("--per-token-latency", type=float, default=0.0,
+                        help="extra seconds per output token")
+    parser.add_argument("--output-tokens", type=int, default=64,
+                        help="output tokens of a final model answer")
+    parser.add_argument("--search-latency", type=float, default=0.0,
+                        help="seconds per simulated google_search call")
+    parser.add_argument("--maps-latency", type=float, default=0.0,
+                        help="seconds per simulated maps_directions call")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--trace", help="write spans to this JSON-lines file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("MODEL", "gemini-2.0-flash")
+    package = __package__.rsplit(".", 1)[0]
+    agent = importlib.import_module(f"{package}.agent")
+    if args.trace:
+        instrument(agent.root_agent, [JsonLinesExporter(args.trace)])
+
+    backend = FakeBackend(
+        latency_s=args.latency,
+        per_token_latency_s=args.per_token_latency,
+        output_tokens=args.output_tokens,
+        search_latency_s=args.search_latency,
+        maps_latency_s=args.maps_latency,
+    )
+    results = asyncio.run(run_benchmark(agent.root_agent, backend, repeat=args.repeat))
+    print(format_report(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([result.to_dict() for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Model turns and wall time of batch report generation, with and without shared research.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_batch --farmers 200 --latency 0.2
+
+Every farmer grows one of a few crops in one of a few districts. The batch
+pipeline runs once researching every farmer on their own, once sharing the
+research within each (crop, district) group, and once interrupted halfway
+and resumed from its output files.
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import random
+import tempfile
+
+from ..batch_reports import BatchReportPipeline, Farmer
+from .conversations import Conversation
+from .harness import FakeBackend
+
+CROPS = ["Tomato", "Paddy", "Ragi", "Onion"]
+DISTRICTS = ["Kolar", "Mandya", "Tumakuru", "Hassan", "Mysuru"]
+
+
+def _farmers(count: int, seed: int = 5) -> list[Farmer]:
+    rng = random.Random(seed)
+    return [
+        Farmer(
+            farmer_id=f"F{index:05d}",
+            crop=rng.choice(CROPS),
+            district=rng.choice(DISTRICTS),
+            acreage=str(rng.choice([0.5, 1, 2, 3.5, 5])),
+            details={"state": "Karnataka", "irrigation": rng.choice(["drip", "rainfed", "canal"])},
+        )
+        for index in range(count)
+    ]
+
+
+async def _run(agent, backend: FakeBackend, farmers, output: str, key=None, stop_after_s=None):
+    backend.load(Conversation(name="batch", turns=[]))
+    agent.response_cache.clear()
+    pipeline = BatchReportPipeline(
+        agent.advisory_branches,
+        agent.report_synthesizer,
+        output,
+        **({"key": key} if key else {}),
+    )
+    run = pipeline.run(farmers)
+    if stop_after_s is None:
+        summary = await run
+    else:
+        try:
+            summary = await asyncio.wait_for(run, stop_after_s)
+        except asyncio.TimeoutError:
+            summary = None
+    turns = sum(stats.model_turns for stats in backend.recorder.agents.values())
+    return summary, turns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--farmers", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="seconds per model turn")
+    parser.add_argument("--search-latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("MODEL", "gemini-2.0-flash")
+    agent = importlib.import_module(f"{__package__.rsplit('.', 1)[0]}.agent")
+    farmers = _farmers(args.farmers)
+    backend = FakeBackend(latency_s=args.latency, search_latency_s=args.search_latency)
+    backend.install(agent.full_report_agent)
+
+    print(f"{'run':<26}{'wall s':>8}{'groups':>8}{'researched':>12}{'written':>9}"
+          f"{'skipped':>9}{'turns':>7}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            runs = [
+                ("research per farmer", os.path.join(tmp, "each.jsonl"),
+                 lambda farmer: (farmer.farmer_id,)),
+                ("shared research", os.path.join(tmp, "grouped.jsonl"), None),
+            ]
+            for name, output, key in runs:
+                summary, turns = asyncio.run(_run(agent, backend, farmers, output, key))
+                print(f"{name:<26}{summary.wall_s:>8.2f}{summary.groups:>8}"
+                      f"{summary.groups_researched:>12}{summary.written:>9}"
+                      f"{summary.skipped:>9}{turns:>7}")
+                shared_s = summary.wall_s
+
+            output = os.path.join(tmp, "resumed.jsonl")
+            _, turns = asyncio.run(
+                _run(agent, backend, farmers, output, stop_after_s=shared_s / 2)
+            )
+            with open(output, encoding="utf-8") as f:
+                written = sum(1 for _ in f)
+            print(f"{'interrupted at 50%':<26}{shared_s / 2:>8.2f}{'':>8}{'':>12}"
+                  f"{written:>9}{'':>9}{turns:>7}")
+            summary, turns = asyncio.run(_run(agent, backend, farmers, output))
+            print(f"{'resumed':<26}{summary.wall_s:>8.2f}{summary.groups:>8}"
+                  f"{summary.groups_researched:>12}{summary.written:>9}"
+                  f"{summary.skipped:>9}{turns:>7}")
+    finally:
+        backend.uninstall()
+
+
+if __name__ == "__main__":
+    main()
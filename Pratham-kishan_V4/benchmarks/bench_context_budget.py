@@ -0,0 +1,117 @@
+"""Prompt tokens of the mandi loop per iteration, with and without context budgets.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_context_budget --iterations 12
+
+The mandi critic never exits and the loop's convergence checks are off, so
+every iteration appends another profit analysis, distance and feedback entry
+(repeating itself now and then, as models do). Prints the prompt tokens of
+mandi_critic's first model turn in each iteration, with the agents'
+BudgetedInstruction and with their plain templates.
+"""
+import argparse
+import asyncio
+import importlib
+import os
+
+from google.adk.agents import LlmAgent
+
+from ..agent_tree import walk_agents
+from ..context_budget import BudgetedInstruction
+from .conversations import LOCATION, Conversation, _append, _transfer
+from .fake_llm import Round, ToolCall
+from .harness import FakeBackend, run_benchmark
+
+PRICES = (
+    "Kolar APMC tomato modal price Rs 1400/quintal, min Rs 1100, max Rs 1650, arrivals 820 tonnes. "
+    "Mulbagal APMC modal Rs 1350/quintal. Prices rose 6% over the last week on lower arrivals. "
+)
+
+
+def _conversation(iterations: int) -> Conversation:
+    profit = [
+        Round(
+            steps=[
+                [ToolCall("maps_directions", {"origin": LOCATION, "destination": "Kolar APMC"})],
+                [
+                    _append("PROFIT_ANALYSIS", f"Iteration {i}: selling 80 quintals at Kolar APMC gives "
+                            f"Rs {112000 + 1500 * i} revenue, Rs {41000 - 500 * i} costs. "
+                            "Transport is Rs 3,200 per trip and commission 4%."),
+                    _append("DISTANCE_ANALYSIS", "Kolar APMC is 12 km away, about 25 minutes by road."),
+                ],
+            ],
+            text="Profit and distance recorded.",
+        )
+        for i in range(iterations)
+    ]
+    critic = [
+        Round(
+            steps=[[_append("PROFIT_OPTIMIZATION_FEEDBACK", f"Iteration {i}: hold a third of the harvest "
+                            f"for {1 + i % 3} weeks and compare Mulbagal APMC prices.")]],
+            text="Suggested a later sale.",
+        )
+        for i in range(iterations)
+    ]
+    return Conversation(
+        name=f"mandi_{iterations}_iterations",
+        turns=["Hello", "I grow tomato in Kolar, Karnataka. Where should I sell?"],
+        scripts={
+            "pratham_kishan_agent": [
+                Round(steps=[[_transfer("mandi_price_agent")]], text="Checking mandis."),
+            ],
+            "mandi_researcher": [Round(text=PRICES * 3)],
+            "mandi_profit": profit,
+            "mandi_critic": critic,
+        },
+    )
+
+
+def _critic_prompt_tokens(root, iterations: int) -> list[int]:
+    backend = FakeBackend()
+    calls = []
+    record = backend.recorder.record_model_call
+
+    def record_model_call(agent_name, prompt_tokens, *args, **kwargs):
+        calls.append((agent_name, prompt_tokens))
+        record(agent_name, prompt_tokens, *args, **kwargs)
+
+    backend.recorder.record_model_call = record_model_call
+    asyncio.run(run_benchmark(root, backend, [_conversation(iterations)]))
+    # The critic makes two model turns per iteration: the feedback call and its answer.
+    return [tokens for name, tokens in calls if name == "mandi_critic"][::2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=12)
+    args = parser.parse_args()
+
+    os.environ.setdefault("MODEL", "gemini-2.0-flash")
+    agent = importlib.import_module(f"{__package__.rsplit('.', 1)[0]}.agent")
+    loop = agent.mandi_price_agent
+    settings = (loop.max_iterations, loop.similarity_threshold)
+    loop.max_iterations, loop.similarity_threshold = args.iterations, None
+    budgeted = [
+        (a, a.instruction)
+        for a in walk_agents(agent.root_agent)
+        if isinstance(a, LlmAgent) and isinstance(a.instruction, BudgetedInstruction)
+    ]
+    try:
+        with_budget = _critic_prompt_tokens(agent.root_agent, args.iterations)
+        for a, instruction in budgeted:
+            a.instruction = instruction.template
+        try:
+            without_budget = _critic_prompt_tokens(agent.root_agent, args.iterations)
+        finally:
+            for a, instruction in budgeted:
+                a.instruction = instruction
+    finally:
+        loop.max_iterations, loop.similarity_threshold = settings
+
+    print("mandi_critic prompt tokens per iteration")
+    print(f"{'iteration':>10}{'template':>10}{'budgeted':>10}")
+    for i, (plain, fitted) in enumerate(zip(without_budget, with_budget), 1):
+        print(f"{i:>10}{plain:>10}{fitted:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Full report latency with a heavy-tailed Maps call, with deadlines and hedged branches.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_hedging --reports 100 --stuck-rate 0.05
+
+Runs the full report (all advisory branches, then the synthesizer) many
+times while a share of the maps_directions calls of mandi_profit hang for
+--stuck-s seconds. Compared: waiting for every branch, a deadline on the
+mandi branch, hedging branches slower than their recent p90, and both. The
+first --warmup reports of every run only fill the hedging history and are
+not counted.
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import random
+import statistics
+import time
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from ..agent_tree import add_callback
+from ..concurrent_branches import MISSING_SECTIONS_KEY
+from .conversations import CONVERSATIONS
+from .harness import FakeBackend
+
+
+async def _report(runner: InMemoryRunner) -> tuple[float, list]:
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name,
+        user_id="bench_user",
+        state={"CROP_DETAILS": "Tomato, flowering stage, 2 acres", "LOCATION": "Kolar, Karnataka"},
+    )
+    started = time.perf_counter()
+    async for _ in runner.run_async(
+        user_id=session.user_id,
+        session_id=session.id,
+        new_message=types.UserContent(parts=[types.Part(text="Give me a full report.")]),
+    ):
+        pass
+    wall_s = time.perf_counter() - started
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=session.user_id, session_id=session.id
+    )
+    return wall_s, session.state.get(MISSING_SECTIONS_KEY) or []
+
+
+async def _run(agent, backend: FakeBackend, reports: int, warmup: int) -> tuple[list, int]:
+    full_report = next(c for c in CONVERSATIONS if c.name == "full_report")
+    runner = InMemoryRunner(agent=agent.full_report_agent, app_name="pratham_kishan_bench")
+    times, missing = [], 0
+    for index in range(warmup + reports):
+        backend.load(full_report)
+        agent.response_cache.clear()
+        wall_s, missing_sections = await _report(runner)
+        if index >= warmup:
+            times.append(wall_s)
+            missing += bool(missing_sections)
+    return times, missing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per model turn")
+    parser.add_argument("--maps-latency", type=float, default=0.1)
+    parser.add_argument("--stuck-rate", type=float, default=0.05,
+                        help="share of maps_directions calls that hang")
+    parser.add_argument("--stuck-s", type=float, default=5.0)
+    parser.add_argument("--deadline", type=float, default=2.0,
+                        help="mandi branch timeout of the deadline runs")
+    parser.add_argument("--hedge-quantile", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("MODEL", "gemini-2.0-flash")
+    agent = importlib.import_module(f"{__package__.rsplit('.', 1)[0]}.agent")
+    branches = agent.advisory_branches
+    saved = (branches.branch_timeouts_s, branches.hedge_quantile, branches.hedge_min_samples)
+    backend = FakeBackend(latency_s=args.latency, maps_latency_s=args.maps_latency)
+    backend.install(agent.full_report_agent)
+    rng = random.Random(args.seed)
+
+    async def stuck_maps(tool, tool_args, tool_context):
+        if tool.name == "maps_directions" and rng.random() < args.stuck_rate:
+            await asyncio.sleep(args.stuck_s)
+        return None
+
+    add_callback(agent.mandi_profit, "before_tool_callback", stuck_maps, first=True)
+    runs = [
+        ("wait for every branch", None, None),
+        ("mandi deadline", args.deadline, None),
+        ("hedged", None, args.hedge_quantile),
+        ("hedged + deadline", args.deadline, args.hedge_quantile),
+    ]
+    print(f"{'run':<24}{'p50 s':>8}{'p95 s':>8}{'max s':>8}{'partial':>9}{'hedges':>8}{'won':>5}")
+    try:
+        for name, deadline_s, quantile in runs:
+            branches.branch_timeouts_s = {"MANDI_REPORT": deadline_s} if deadline_s else {}
+            branches.hedge_quantile = quantile
+            branches.hedge_min_samples = args.warmup
+            branches.hedges = branches.hedge_wins = 0
+            branches._durations.clear()  # pylint: disable=protected-access
+            times, missing = asyncio.run(_run(agent, backend, args.reports, args.warmup))
+            print(f"{name:<24}{statistics.median(times):>8.2f}"
+                  f"{statistics.quantiles(times, n=20)[-1]:>8.2f}{max(times):>8.2f}"
+                  f"{missing:>9}{branches.hedges:>8}{branches.hedge_wins:>5}")
+    finally:
+        backend.uninstall()
+        branches.branch_timeouts_s, branches.hedge_quantile, branches.hedge_min_samples = saved
+
+
+if __name__ == "__main__":
+    main()
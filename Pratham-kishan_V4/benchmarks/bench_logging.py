@@ -0,0 +1,110 @@
+"""Per-model-turn overhead of the logging callbacks, before and after batching.
+
+Run from the repository root:
+
+    python -m Pratham-kishan_V4.benchmarks.bench_logging --turns 50
+
+"before" replays the old callbacks, which built a Cloud Logging client and
+called setup_logging() on every request and response. It uses anonymous
+credentials and an unreachable endpoint so no log entry leaves the machine; the
+numbers leave out credential lookup and the API calls themselves and are a
+lower bound. "after" goes through the shared batching handler with a sink that
+discards the batches.
+"""
+import argparse
+import logging
+import os
+import time
+from types import SimpleNamespace
+
+import google.cloud.logging
+from google.adk.models import LlmRequest, LlmResponse
+from google.auth.credentials import AnonymousCredentials
+from google.genai import types
+
+from .. import callback_logging
+from ..callback_logging import StreamSink, log_model_response, log_query_to_model
+
+
+def _legacy_setup():
+    client = google.cloud.logging.Client(
+        project="bench",
+        credentials=AnonymousCredentials(),
+        client_options={"api_endpoint": "http://127.0.0.1:9"},
+        _use_grpc=False,
+    )
+    client.setup_logging()
+
+
+def legacy_log_query_to_model(callback_context, llm_request):
+    _legacy_setup()
+    if llm_request.contents and llm_request.contents[-1].role == 'user':
+         if llm_request.contents[-1].parts and "text" in llm_request.contents[-1].parts:
+            last_user_message = llm_request.contents[-1].parts[0].text
+            logging.info(f"[query to {callback_context.agent_name}]: " + last_user_message)
+
+
+def legacy_log_model_response(callback_context, llm_response):
+    _legacy_setup()
+    if llm_response.content and llm_response.content.parts:
+        for part in llm_response.content.parts:
+            if part.text:
+                logging.info(f"[response from {callback_context.agent_name}]: " + part.text)
+            elif part.function_call:
+                logging.info(f"[function call from {callback_context.agent_name}]: " + part.function_call.name)
+
+
+def _time_turns(before_model, after_model, turns: int) -> float:
+    """Returns the mean seconds both callbacks add to one model turn."""
+    context = SimpleNamespace(agent_name="mandi_researcher")
+    request = LlmRequest(
+        contents=[types.UserContent(parts=[types.Part(text="Tomato price in Kolar?")])]
+    )
+    response = LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[types.Part(text="Kolar APMC modal price is Rs 1400/quintal.")],
+        )
+    )
+    started = time.perf_counter()
+    for _ in range(turns):
+        before_model(context, request)
+        after_model(context, response)
+    return (time.perf_counter() - started) / turns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+
+    root = logging.getLogger()
+    for name in ("google.cloud", "google.api_core", "urllib3"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    handler = callback_logging.setup_logging()
+    handler.flush()
+    handler.sink = StreamSink(os.devnull)
+    written, batches = handler.written, handler.batches
+
+    # The legacy path leaves a transport thread per call running, so it goes last.
+    after = _time_turns(log_query_to_model, log_model_response, args.turns)
+    handler.flush()
+
+    saved_handlers = list(root.handlers)
+    for saved in saved_handlers:
+        root.removeHandler(saved)
+    before = _time_turns(legacy_log_query_to_model, legacy_log_model_response, args.turns)
+    attached = len(root.handlers)
+    for legacy in list(root.handlers):
+        root.removeHandler(legacy)
+    for saved in saved_handlers:
+        root.addHandler(saved)
+
+    print(f"turns: {args.turns}")
+    print(f"before: {before * 1e6:10.1f} us/turn ({attached} handlers left on the root logger)")
+    print(f"after:  {after * 1e6:10.1f} us/turn ({handler.written - written} records in {handler.batches - batches} batches, {handler.dropped} dropped)")
+
+
+if __name__ == "__main__":
+    main()
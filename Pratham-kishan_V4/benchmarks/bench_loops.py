@@ -0,0 +1,86 @@
+"""Model calls saved by the convergence-aware loop exit.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_loops
+
+Runs the benchmark conversations plus two where the critic never calls
+exit_loop, once with the ConvergentLoopAgent checks turned off (a plain
+LoopAgent that always runs max_iterations) and once with them on.
+"""
+import asyncio
+import importlib
+import os
+
+from ..agent_tree import walk_agents
+from ..loop_control import ConvergentLoopAgent
+from .conversations import CONVERSATIONS, Conversation, _append, _transfer
+from .fake_llm import Round
+from .harness import FakeBackend, run_benchmark
+
+STUBBORN_CONVERSATIONS = [
+    Conversation(
+        name="gov_schemes_repeating_critic",
+        turns=["Hello", "I grow tomato in Kolar, Karnataka. Which schemes apply?"],
+        scripts={
+            "pratham_kishan_agent": [
+                Round(steps=[[_transfer("gov_scheme_agent")]], text="Checking schemes."),
+            ],
+            "gov_scheme_critic": [
+                Round(
+                    steps=[[_append("SCHEME_FEEDBACK", "Apply for the drip irrigation subsidy under PMKSY before March.")]],
+                    text="Added feedback.",
+                ),
+                Round(
+                    steps=[[_append("SCHEME_FEEDBACK", "Apply for the drip irrigation subsidy under PMKSY before the March deadline.")]],
+                    text="Added feedback.",
+                ),
+            ],
+        },
+    ),
+    Conversation(
+        name="mandi_prices_silent_critic",
+        turns=["Hello", "I grow tomato in Kolar, Karnataka. Where should I sell?"],
+        scripts={
+            "pratham_kishan_agent": [
+                Round(steps=[[_transfer("mandi_price_agent")]], text="Checking mandis."),
+            ],
+            "mandi_critic": [Round(text="The current plan looks fine to me.")],
+        },
+    ),
+]
+
+
+def _set_checks(loops: list[ConvergentLoopAgent], settings: list[tuple]) -> None:
+    for loop, (threshold, token_budget, time_budget_s) in zip(loops, settings):
+        loop.similarity_threshold = threshold
+        loop.token_budget = token_budget
+        loop.time_budget_s = time_budget_s
+
+
+def main() -> None:
+    os.environ.setdefault("MODEL", "gemini-2.0-flash")
+    package = __package__.rsplit(".", 1)[0]
+    agent = importlib.import_module(f"{package}.agent")
+    root = agent.root_agent
+    loops = [agent for agent in walk_agents(root) if isinstance(agent, ConvergentLoopAgent)]
+    enabled = [(loop.similarity_threshold, loop.token_budget, loop.time_budget_s) for loop in loops]
+    conversations = CONVERSATIONS + STUBBORN_CONVERSATIONS
+
+    _set_checks(loops, [(None, None, None)] * len(loops))
+    try:
+        baseline = asyncio.run(run_benchmark(root, FakeBackend(), conversations))
+    finally:
+        _set_checks(loops, enabled)
+    # Compare loop behaviour only, not answers cached during the first pass.
+    agent.response_cache.clear()
+    controlled = asyncio.run(run_benchmark(root, FakeBackend(), conversations))
+
+    print(f"{'conversation':<32}{'plain loop':>12}{'convergent':>12}{'saved':>7}")
+    for plain, convergent in zip(baseline, controlled):
+        print(
+            f"{plain.name:<32}{plain.model_turns:>12}{convergent.model_turns:>12}"
+            f"{plain.model_turns - convergent.model_turns:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
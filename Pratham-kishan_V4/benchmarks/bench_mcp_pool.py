@@ -0,0 +1,121 @@
+"""maps_directions latency with a fresh MCP server per session vs the pool.
+
+Run from the repository root:
+
+    python -m Pratham-kishan_V4.benchmarks.bench_mcp_pool --calls 200 --concurrency 8
+
+Both modes talk to benchmarks/stub_mcp_server.py. "per session" starts a
+server, initializes it, makes one call and shuts it down, which is what every
+new session pays with MCPToolset. "pooled" goes through an McpServerPool that
+was warmed up before timing starts; "pooled, crashing" uses servers that exit
+every --crash-after calls so the restart path is part of the numbers.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from ..mcp_pool import McpServerPool
+
+STUB_SERVER = os.path.join(os.path.dirname(__file__), "stub_mcp_server.py")
+ARGS = {"origin": "Kolar, Karnataka", "destination": "Kolar APMC"}
+
+
+def _stub_params(startup_s: float, latency_s: float, crash_after: int = 0) -> StdioServerParameters:
+    return StdioServerParameters(
+        command=sys.executable,
+        args=[
+            STUB_SERVER,
+            "--startup", str(startup_s),
+            "--latency", str(latency_s),
+            "--crash-after", str(crash_after),
+        ],
+    )
+
+
+async def _per_session_call(params: StdioServerParameters):
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            return await session.call_tool("maps_directions", ARGS)
+
+
+async def _timed(calls: int, concurrency: int, call) -> tuple[list[float], int]:
+    slots = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def one() -> float:
+        nonlocal errors
+        async with slots:
+            started = time.perf_counter()
+            try:
+                await call()
+            except Exception:
+                errors += 1
+            return time.perf_counter() - started
+
+    return list(await asyncio.gather(*(one() for _ in range(calls)))), errors
+
+
+async def _pooled(pool: McpServerPool, calls: int, concurrency: int):
+    pool.start()
+    await pool.list_tools()
+    return await _timed(
+        calls, concurrency, lambda: pool.call_tool("maps_directions", ARGS)
+    )
+
+
+def _percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--startup", type=float, default=1.5,
+                        help="server startup seconds (npx resolution + Node start)")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="seconds per maps_directions call")
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--crash-after", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = []
+    per_session = _stub_params(args.startup, args.latency)
+    rows.append(("per session", asyncio.run(
+        _timed(args.calls, args.concurrency, lambda: _per_session_call(per_session))
+    )))
+    for name, crash_after in [("pooled", 0), ("pooled, crashing", args.crash_after)]:
+        pool = McpServerPool(
+            _stub_params(args.startup, args.latency, crash_after),
+            size=args.pool_size,
+            concurrency=args.concurrency,
+            health_interval_s=1.0,
+        )
+        try:
+            result = asyncio.run(_pooled(pool, args.calls, args.concurrency))
+        finally:
+            restarts = sum(server["restarts"] for server in pool.stats())
+            pool.close()
+        if crash_after:
+            name = f"{name} ({restarts} restarts)"
+        rows.append((name, result))
+
+    print(f"{args.calls} calls, concurrency {args.concurrency}, "
+          f"startup {args.startup}s, call latency {args.latency}s")
+    print(f"{'mode':<32}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, (latencies, errors) in rows:
+        print(
+            f"{name:<32}{_percentile(latencies, 50) * 1000:>10.1f}"
+            f"{_percentile(latencies, 99) * 1000:>10.1f}{errors:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Load and query times of the local mandi price store.
+
+Run from the repository root:
+
+    python -m Pratham-kishan_V4.benchmarks.bench_price_store --days 365
+
+Writes one Agmarknet-style CSV per day (commodities x markets rows each) to a
+temporary directory, bulk loads it, loads one more day incrementally and times
+the latest-price and trend queries mandi_researcher makes.
+"""
+import argparse
+import csv
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from ..mandi_price_store import MandiPriceStore
+
+HEADER = ["State", "District", "Market", "Commodity", "Variety", "Grade",
+          "Arrival_Date", "Min_x0020_Price", "Max_x0020_Price", "Modal_x0020_Price"]
+STATES = ["Karnataka", "Maharashtra", "Andhra Pradesh", "Tamil Nadu"]
+
+
+def _write_day(directory: str, day: date, commodities: int, markets: int, rng) -> None:
+    path = os.path.join(directory, f"prices_{day.isoformat()}.csv")
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for market in range(markets):
+            state = STATES[market % len(STATES)]
+            for commodity in range(commodities):
+                modal = 1000 + 40 * commodity + rng.uniform(-200, 200)
+                writer.writerow([
+                    state, f"District {market // 5}", f"Market {market}",
+                    "Tomato" if commodity == 0 else f"Commodity {commodity}",
+                    "Local", "FAQ", day.strftime("%d/%m/%Y"),
+                    round(modal * 0.8), round(modal * 1.2), round(modal),
+                ])
+
+
+def _time_us(query, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        query()
+        times.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--commodities", type=int, default=20)
+    parser.add_argument("--markets", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    first = date(2025, 1, 1)
+    with tempfile.TemporaryDirectory() as directory:
+        for offset in range(args.days):
+            _write_day(directory, first + timedelta(days=offset), args.commodities, args.markets, rng)
+        store = MandiPriceStore()
+        started = time.perf_counter()
+        store.load_dir(directory)
+        bulk_s = time.perf_counter() - started
+
+        _write_day(directory, first + timedelta(days=args.days), args.commodities, args.markets, rng)
+        started = time.perf_counter()
+        added = store.load_dir(directory)
+        incremental_s = time.perf_counter() - started
+
+    print(f"{len(store)} rows ({args.days + 1} daily files, "
+          f"{args.commodities} commodities x {args.markets} markets)")
+    print(f"bulk load          {bulk_s:10.2f} s")
+    print(f"incremental load   {incremental_s:10.2f} s  ({added} rows)")
+    queries = {
+        "latest, one market": lambda: store.latest("Tomato", "Karnataka", "Market 0"),
+        "latest, one state": lambda: store.latest("tomato", "karnataka", ""),
+        "trend, one market": lambda: store.trend("Tomato", "Karnataka", "Market 0"),
+        "trend, one state": lambda: store.trend("Tomato", "Karnataka", ""),
+    }
+    for name, query in queries.items():
+        print(f"{name:<19}{_time_us(query, args.repeat):10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Time of the profit calculator for many markets and sale dates.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_profit --markets 50 --dates 30
+
+Evaluates markets x sale dates scenarios for one farm three ways: in one
+batched profit_scenarios call, one call per scenario (as separate tool calls
+would), and by computing the profit of every yield sample in every scenario.
+The last one is also used to check the batched results.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from ..profit_calculator import (
+    PROFIT_MAX_PRICE_CHANGE_PCT,
+    PROFIT_TRANSPORT_RATE,
+    PROFIT_YIELD_SAMPLES,
+    profit_scenarios,
+    project_prices,
+    yield_samples,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--markets", type=int, default=50)
+    parser.add_argument("--dates", type=int, default=30)
+    parser.add_argument("--history", type=int, default=30, help="days of prices per market")
+    parser.add_argument("--samples", type=int, default=PROFIT_YIELD_SAMPLES)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    acreage, production_cost = 2.0, 230000.0
+    series = [
+        list(1400 + np.cumsum(rng.normal(0, 20, args.history))) for _ in range(args.markets)
+    ]
+    distances = rng.uniform(5, 150, args.markets)
+    days = np.arange(args.dates, dtype=np.float64)
+
+    started = time.perf_counter()
+    yields = yield_samples(100, 70, 120, args.samples)
+    prices = project_prices(series, days, PROFIT_MAX_PRICE_CHANGE_PCT)
+    batched = profit_scenarios(acreage, yields, production_cost, prices, distances)
+    batched_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for m in range(args.markets):
+        for d in range(args.dates):
+            yields = yield_samples(100, 70, 120, args.samples)
+            price = project_prices([series[m]], days[d:d + 1], PROFIT_MAX_PRICE_CHANGE_PCT)
+            profit_scenarios(acreage, yields, production_cost, price, distances[m:m + 1])
+    one_by_one_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    harvest = acreage * yields
+    net_price = prices - (distances * PROFIT_TRANSPORT_RATE)[:, None]
+    profit = net_price[..., None] * harvest - production_cost
+    expected = profit.mean(axis=-1)
+    p10 = np.percentile(profit, 10, axis=-1)
+    loss = (profit < 0).mean(axis=-1)
+    every_sample_s = time.perf_counter() - started
+
+    scenarios = args.markets * args.dates
+    print(f"{scenarios} scenarios, {args.samples} yield samples")
+    print(f"  one batched call     {batched_s * 1000:8.1f} ms")
+    print(f"  one call a scenario  {one_by_one_s * 1000:8.1f} ms")
+    print(f"  every yield sample   {every_sample_s * 1000:8.1f} ms")
+    print(f"max difference to every-sample results: expected "
+          f"{np.abs(batched['expected_profit'] - expected).max():.4f}, p10 "
+          f"{np.abs(batched['profit_p10'] - p10).max():.1f}, loss probability "
+          f"{np.abs(batched['loss_probability'] - loss).max():.4f}")
+
+
+if __name__ == "__main__":
+    main()
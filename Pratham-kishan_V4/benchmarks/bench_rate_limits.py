@@ -0,0 +1,120 @@
+"""Failures and latency of model calls against a quota, with and without the request scheduler.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_rate_limits --quota 20 --batch 300 --farmers 20
+
+A batch job submits all its calls at once while farmers keep chatting, each
+turn a few model calls in a row, against a local endpoint that rejects
+everything over its quota with 429 and fails a few calls with 503. The
+calls are made directly, through a scheduler that only retries, through
+one that also paces calls to the quota, and through one that also puts the
+farmers ahead of the batch.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from google.adk.models import LlmRequest
+from google.genai import types
+
+from ..rate_limits import BATCH, INTERACTIVE, RequestScheduler, ScheduledLlm, request_priority
+from .throttling_llm import ThrottlingLlm
+
+MODEL = "gemini-2.0-flash"
+
+
+def _request() -> LlmRequest:
+    return LlmRequest(
+        model=MODEL, contents=[types.UserContent(parts=[types.Part(text="Advice for tomato")])]
+    )
+
+
+async def _timed(llm, results: list, priority: int) -> None:
+    started = time.perf_counter()
+    try:
+        with request_priority(priority):
+            async for _ in llm.generate_content_async(_request()):
+                pass
+        results.append((True, time.perf_counter() - started))
+    except Exception:  # pylint: disable=broad-exception-caught
+        results.append((False, time.perf_counter() - started))
+
+
+async def _farmer(llm, results: list, start_s: float, calls: int, priority: int, rng) -> None:
+    await asyncio.sleep(start_s)
+    for _ in range(calls):
+        await _timed(llm, results, priority)
+        await asyncio.sleep(rng.uniform(0.5, 1.5))
+
+
+async def _run(llm, args, farmer_priority: int) -> tuple[list, list, float]:
+    rng = random.Random(args.seed)
+    batch, farmers = [], []
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(_timed(llm, batch, BATCH) for _ in range(args.batch)),
+        *(
+            _farmer(llm, farmers, rng.uniform(0, args.ramp_up), args.turn_calls,
+                    farmer_priority, rng)
+            for _ in range(args.farmers)
+        ),
+    )
+    return batch, farmers, time.perf_counter() - started
+
+
+def _summary(results: list) -> str:
+    ok = [seconds for success, seconds in results if success]
+    if not ok:
+        return f"{0:>6}{len(results):>7}{'-':>8}{'-':>8}"
+    p95 = statistics.quantiles(ok, n=20)[-1] if len(ok) > 1 else ok[0]
+    return f"{len(ok):>6}{len(results) - len(ok):>7}{statistics.median(ok):>8.2f}{p95:>8.2f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quota", type=int, default=20, help="calls per second the endpoint accepts")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.02, help="share of 503 answers")
+    parser.add_argument("--batch", type=int, default=300, help="calls the batch job submits at once")
+    parser.add_argument("--farmers", type=int, default=20)
+    parser.add_argument("--turn-calls", type=int, default=5, help="model calls per farmer")
+    parser.add_argument("--ramp-up", type=float, default=5.0)
+    parser.add_argument("--max-retries", type=int, default=8)
+    parser.add_argument("--backoff", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    def scheduler(rate_per_s: float) -> RequestScheduler:
+        return RequestScheduler(
+            {"default": {"rate_per_s": rate_per_s, "burst": max(1.0, rate_per_s / 4)}},
+            max_retries=args.max_retries,
+            backoff_s=args.backoff,
+            max_backoff_s=10.0,
+        )
+
+    runs = [
+        ("direct", None, INTERACTIVE),
+        ("retry with backoff", scheduler(1e6), INTERACTIVE),
+        ("paced", scheduler(args.quota * 0.9), BATCH),
+        ("paced + priority", scheduler(args.quota * 0.9), INTERACTIVE),
+    ]
+    print(f"{'run':<20}{'wall s':>8}{'429s':>6} |{'batch':^29}|{'farmers':^29}|{'depth':>6}")
+    print(f"{'':<34} |{'ok':>6}{'fail':>7}{'p50':>8}{'p95':>8}"
+          f"|{'ok':>6}{'fail':>7}{'p50':>8}{'p95':>8}|")
+    for name, sched, farmer_priority in runs:
+        endpoint = ThrottlingLlm(
+            model=MODEL, quota_per_s=args.quota, latency_s=args.latency,
+            error_rate=args.error_rate, seed=args.seed,
+        )
+        llm = endpoint if sched is None else ScheduledLlm(
+            model=MODEL, scheduler=sched, backend=endpoint
+        )
+        batch, farmers, wall_s = asyncio.run(_run(llm, args, farmer_priority))
+        depth = max((s["max_depth"] for s in sched.stats().values()), default=0) if sched else 0
+        print(f"{name:<20}{wall_s:>8.1f}{endpoint.rejected:>6} |{_summary(batch)}"
+              f"|{_summary(farmers)}|{depth:>6}")
+
+
+if __name__ == "__main__":
+    main()
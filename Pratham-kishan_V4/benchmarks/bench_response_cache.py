@@ -0,0 +1,99 @@
+"""Model turns and latency saved by the sub-agent response cache.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_response_cache --farmers 60
+
+Every farmer grows one of a few crops in one of a few districts and asks the
+simple advisors (crop management, weather, farming technology), describing
+the crop in one of several ways. The farmers are run once with the cache
+disabled and once with it on.
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import random
+
+from .conversations import Conversation, _append, _ask, _transfer
+from .fake_llm import Round
+from .harness import FakeBackend, run_benchmark
+
+CROPS = ["Tomato", "Paddy", "Ragi"]
+DISTRICTS = ["Kolar, Karnataka", "Mandya, Karnataka", "Tumakuru, Karnataka"]
+PHRASINGS = [
+    "{crop}, flowering stage, 2 acres, drip irrigation, red soil",
+    "{crop} at flowering stage, 2 acres, drip irrigation, red soil",
+    "{crop} flowering stage 2 acres drip irrigation red soil",
+    "{crop}, flowering stage, 2 acres, drip irrigation, red soil.",
+]
+
+
+def _farmers(count: int, seed: int = 11) -> list[Conversation]:
+    rng = random.Random(seed)
+    conversations = []
+    for index in range(count):
+        crop_details = rng.choice(PHRASINGS).format(crop=rng.choice(CROPS))
+        location = rng.choice(DISTRICTS)
+        conversations.append(
+            Conversation(
+                name=f"farmer_{index}",
+                turns=["Hello", f"I grow {crop_details} in {location}."],
+                scripts={
+                    "greeter": [
+                        Round(text="Welcome to Pratham Kisan!"),
+                        Round(
+                            steps=[
+                                [_append("CROP_DETAILS", crop_details), _append("LOCATION", location)],
+                                [_transfer("pratham_kishan_agent")],
+                            ],
+                            text="Transferring you to the advisor.",
+                        ),
+                    ],
+                    "simple_agents": [
+                        Round(
+                            steps=[
+                                [_ask("crop_management_agent", crop_details)],
+                                [_ask("weather_agent", location)],
+                                [_ask("farming_new_tech_agent", crop_details)],
+                            ],
+                            text="Here is your advice.",
+                        ),
+                    ],
+                },
+            )
+        )
+    return conversations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--farmers", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="seconds per model turn")
+    parser.add_argument("--search-latency", type=float, default=0.05,
+                        help="seconds per simulated google_search call")
+    args = parser.parse_args()
+
+    os.environ.setdefault("MODEL", "gemini-2.0-flash")
+    agent = importlib.import_module(f"{__package__.rsplit('.', 1)[0]}.agent")
+    cache = agent.response_cache
+    conversations = _farmers(args.farmers)
+    max_entries = cache.max_entries
+
+    print(f"{'mode':<12}{'wall s':>9}{'model turns':>13}{'hit rate':>10}"
+          f"{'semantic':>10}{'saved s':>9}")
+    for name, entries in [("no cache", 0), ("cache", max_entries)]:
+        cache.clear()
+        cache.max_entries = entries
+        backend = FakeBackend(latency_s=args.latency, search_latency_s=args.search_latency)
+        results = asyncio.run(run_benchmark(agent.root_agent, backend, conversations))
+        stats = cache.stats()
+        print(
+            f"{name:<12}{sum(r.wall_s for r in results):>9.2f}"
+            f"{sum(r.model_turns for r in results):>13}{stats['hit_rate']:>10.2f}"
+            f"{stats['semantic_hits']:>10}{stats['saved_latency_s']:>9.2f}"
+        )
+    cache.max_entries = max_entries
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Maps round trips of mandi_profit with and without the route cache.
+
+Run from the repository root:
+
+    python -m Pratham-kishan_V4.benchmarks.bench_route_cache --sessions 100
+
+Every session is a farmer from one of a few villages (coordinates jittered by
+up to ~150 m) asking for directions to a mandi, once per mandi loop iteration,
+with the mandi name spelled a little differently each time. Calls go through
+PooledMcpTool to the stub MCP server, without a cache and with a fresh
+on-disk RouteCache.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from ..mcp_pool import McpServerPool, PooledMcpTool
+from ..route_cache import RouteCache
+from .bench_mcp_pool import _percentile, _stub_params
+
+VILLAGES = [(13.1367, 78.1292), (13.0033, 78.2707), (12.9552, 78.0440), (13.2250, 78.0380)]
+MANDIS = ["Kolar APMC", "kolar apmc,", "Kolar  APMC, Karnataka", "Mulbagal APMC"]
+
+
+def _requests(sessions: int, iterations: int, seed: int = 7) -> list[list[dict]]:
+    rng = random.Random(seed)
+    result = []
+    for _ in range(sessions):
+        lat, lng = rng.choice(VILLAGES)
+        origin = f"{lat + rng.uniform(-0.0013, 0.0013):.5f},{lng + rng.uniform(-0.0013, 0.0013):.5f}"
+        destination = rng.choice(MANDIS)
+        result.append(
+            [{"origin": origin, "destination": destination} for _ in range(iterations)]
+        )
+    return result
+
+
+async def _run(tool: PooledMcpTool, sessions: list[list[dict]], concurrency: int) -> list[float]:
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def session(calls: list[dict]) -> None:
+        async with slots:
+            for args in calls:
+                started = time.perf_counter()
+                await tool.run_async(args=args, tool_context=None)
+                latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(session(calls) for calls in sessions))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2,
+                        help="mandi loop iterations per session")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.3,
+                        help="seconds per Maps directions call")
+    args = parser.parse_args()
+
+    sessions = _requests(args.sessions, args.iterations)
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, cache in [
+            ("no cache", None),
+            ("route cache", RouteCache(path=os.path.join(directory, "routes.sqlite"))),
+        ]:
+            pool = McpServerPool(_stub_params(0.0, args.latency), concurrency=args.concurrency)
+            try:
+                mcp_tool = asyncio.run(pool.list_tools())[0]
+                tool = PooledMcpTool(pool, mcp_tool, cache)
+                latencies = asyncio.run(_run(tool, sessions, args.concurrency))
+                round_trips = sum(server["calls"] for server in pool.stats()) - 1
+            finally:
+                pool.close()
+            rows.append((name, round_trips, latencies))
+
+    print(f"{args.sessions} sessions x {args.iterations} iterations, "
+          f"Maps latency {args.latency}s")
+    print(f"{'mode':<16}{'round trips':>13}{'p50 ms':>10}{'p99 ms':>10}{'total s':>10}")
+    for name, round_trips, latencies in rows:
+        print(
+            f"{name:<16}{round_trips:>13}{_percentile(latencies, 50) * 1000:>10.1f}"
+            f"{_percentile(latencies, 99) * 1000:>10.1f}{sum(latencies):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
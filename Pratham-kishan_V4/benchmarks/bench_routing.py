@@ -0,0 +1,131 @@
+"""Latency and token cost per conversation under different model routing policies.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_routing --latency 0.5
+
+Runs every benchmark conversation with every LlmAgent on one model, on the
+models of data/model_routing.json with and without its escalation rules,
+and on the escalation model throughout. The scripted models take
+`--latency` scaled by the model's speed factor below and report a
+confidence drawn around the model's mean, which decides escalations. Cost
+uses the config's prices.
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import random
+
+from google.adk.agents import LlmAgent
+
+from ..agent_tree import walk_agents
+from ..model_router import DEFAULT_ROUTING_CONFIG, EscalatingLlm, ModelRouter
+from .conversations import CONVERSATIONS
+from .harness import FakeBackend, run_conversation
+
+# Latency factor and mean confidence of each model's answers.
+MODEL_PROFILES = {
+    "gemini-2.0-flash-lite": (0.6, 0.65),
+    "gemini-2.0-flash": (1.0, 0.75),
+    "gemini-2.5-flash": (1.8, 0.9),
+    "gemini-2.5-pro": (3.0, 0.95),
+}
+
+
+def _profile(model: str) -> tuple[float, float]:
+    names = [name for name in MODEL_PROFILES if model.startswith(name)]
+    return MODEL_PROFILES[max(names, key=len)] if names else (1.0, 1.0)
+
+
+def _policies(router: ModelRouter, single_model: str) -> dict[str, ModelRouter]:
+    prices = router.prices
+    everyone = {name: single_model for name in router.agents}
+    largest = max(
+        {rule["model"] for rule in router.escalation.values()},
+        key=lambda model: _profile(model)[0],
+    )
+    return {
+        f"all {single_model}": ModelRouter({}, everyone, prices_per_million_tokens=prices),
+        "routed": ModelRouter(router.roles, router.agents, prices_per_million_tokens=prices),
+        "routed + escalation": router,
+        f"all {largest}": ModelRouter(
+            {}, {name: largest for name in router.agents}, prices_per_million_tokens=prices
+        ),
+    }
+
+
+async def _run_policy(root, backend: FakeBackend, router: ModelRouter) -> list[tuple]:
+    router.apply(root)
+    backend.install(root)
+    rows = []
+    try:
+        for conversation in CONVERSATIONS:
+            result = await run_conversation(root, backend, conversation)
+            escalations = sum(
+                agent.model.escalations
+                for agent in walk_agents(root)
+                if isinstance(agent, LlmAgent) and isinstance(agent.model, EscalatingLlm)
+            )
+            tokens = cost = 0.0
+            for stats in result.agents.values():
+                for model, (_, prompt_tokens, output_tokens) in stats.models.items():
+                    tokens += prompt_tokens + output_tokens
+                    cost += router.cost(model, prompt_tokens, output_tokens)
+            rows.append((conversation.name, result.wall_s, result.model_turns,
+                         escalations, int(tokens), cost))
+    finally:
+        backend.uninstall()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="seconds per model turn of a speed 1.0 model")
+    parser.add_argument("--per-token-latency", type=float, default=0.0)
+    parser.add_argument("--config", default=DEFAULT_ROUTING_CONFIG)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("MODEL", "gemini-2.0-flash")
+    agent = importlib.import_module(f"{__package__.rsplit('.', 1)[0]}.agent")
+    router = ModelRouter.load(args.config)
+    models = [(a, a.model) for a in walk_agents(agent.root_agent) if isinstance(a, LlmAgent)]
+    policies = _policies(router, os.environ["MODEL"])
+    speed = {
+        policy.model_for(name): _profile(policy.model_for(name))[0]
+        for policy in policies.values()
+        for name in policy.agents
+    }
+    speed.update({rule["model"]: _profile(rule["model"])[0] for rule in router.escalation.values()})
+
+    print(f"{'policy':<26}{'conversation':<14}{'wall s':>8}{'turns':>7}"
+          f"{'escal.':>7}{'tokens':>9}{'cost $':>10}")
+    try:
+        for name, policy in policies.items():
+            rng = random.Random(args.seed)
+
+            def confidence(model: str) -> float:
+                mean = _profile(model)[1]
+                return min(1.0, max(0.0, rng.gauss(mean, 0.15)))
+
+            backend = FakeBackend(
+                latency_s=args.latency,
+                per_token_latency_s=args.per_token_latency,
+                model_speed=speed,
+                model_confidence=confidence,
+            )
+            agent.response_cache.clear()
+            rows = asyncio.run(_run_policy(agent.root_agent, backend, policy))
+            for conversation, wall_s, turns, escalations, tokens, cost in rows:
+                print(f"{name:<26}{conversation:<14}{wall_s:>8.2f}{turns:>7}"
+                      f"{escalations:>7}{tokens:>9}{cost:>10.5f}")
+            print(f"{name:<26}{'total':<14}{sum(r[1] for r in rows):>8.2f}"
+                  f"{sum(r[2] for r in rows):>7}{sum(r[3] for r in rows):>7}"
+                  f"{sum(r[4] for r in rows):>9}{sum(r[5] for r in rows):>10.5f}")
+    finally:
+        for a, model in models:
+            a.model = model
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Backend calls of google_search with and without the search cache.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_search_cache --sessions 100
+
+Every session is a farmer asking a few searches about one of a few crops and
+states, worded a little differently each time, with all sessions running at
+once. Searches go to a local fake backend directly, through a fresh
+SearchCache, and through a second SearchCache on the same database (a
+restarted process with only the on-disk tier warm).
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from ..search_cache import SearchCache
+from .bench_mcp_pool import _percentile
+
+CROPS = ["wheat", "tomato", "paddy", "onion"]
+STATES = ["Karnataka", "Punjab", "Maharashtra"]
+TEMPLATES = [
+    "mandi price for {crop} {state}",
+    "Current mandi price of {crop} in {state}?",
+    "{state} {crop} mandi price today",
+    "government schemes for {crop} farmers in {state}",
+    "Government schemes for {crop} farmers, {state}",
+    "weather forecast {state} this week",
+]
+
+
+class FakeSearchBackend:
+    """Answers any query after `latency_s`, counting the calls it receives."""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.calls = 0
+
+    async def __call__(self, query: str) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+        return {"status": "success", "results": f"Results for {query}", "sources": []}
+
+
+def _sessions(count: int, searches: int, seed: int = 3) -> list[list[str]]:
+    rng = random.Random(seed)
+    return [
+        [
+            rng.choice(TEMPLATES).format(crop=rng.choice(CROPS), state=rng.choice(STATES))
+            for _ in range(searches)
+        ]
+        for _ in range(count)
+    ]
+
+
+async def _run(search, sessions: list[list[str]]) -> list[float]:
+    latencies = []
+
+    async def session(queries: list[str]) -> None:
+        for query in queries:
+            started = time.perf_counter()
+            await search(query)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(session(queries) for queries in sessions))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--searches", type=int, default=4,
+                        help="searches per session")
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="seconds per backend search")
+    args = parser.parse_args()
+
+    sessions = _sessions(args.sessions, args.searches)
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "searches.sqlite")
+        for name in ["no cache", "search cache", "restarted"]:
+            backend = FakeSearchBackend(args.latency)
+            search = backend if name == "no cache" else SearchCache(backend, path=path).search
+            latencies = asyncio.run(_run(search, sessions))
+            rows.append((name, backend.calls, latencies))
+
+    print(f"{args.sessions} concurrent sessions x {args.searches} searches, "
+          f"backend latency {args.latency}s")
+    print(f"{'mode':<16}{'backend calls':>15}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, calls, latencies in rows:
+        print(
+            f"{name:<16}{calls:>15}{_percentile(latencies, 50) * 1000:>10.1f}"
+            f"{_percentile(latencies, 99) * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Cold-start import time of the agent module, per package and per module.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_startup --repeat 5
+
+Imports the agent module in fresh interpreters with -X importtime and
+reports the median wall time, the import time spent in each package (self
+times summed) and this package's own modules, whose self time includes
+what they build at import, e.g. the agent tree in agent.py.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def _package(module: str) -> str:
+    parts = module.split(".")
+    return ".".join(parts[:2]) if parts[0] == "google" and len(parts) > 1 else parts[0]
+
+
+def _import_once(module: str) -> tuple[float, dict[str, tuple[int, int]]]:
+    """Returns the wall seconds of importing `module` and each module's (self, cumulative) us."""
+    code = (
+        "import importlib, time\n"
+        "t = time.perf_counter()\n"
+        f"importlib.import_module({module!r})\n"
+        "print(time.perf_counter() - t)\n"
+    )
+    env = {"MCP_POOL_PREWARM": "0", "LOG_FILE": os.devnull, **os.environ}
+    env.setdefault("MODEL", "gemini-2.0-flash")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            times[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return float(result.stdout.strip().splitlines()[-1]), times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default=f"{__package__.rsplit('.', 1)[0]}.agent")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+
+    runs = [_import_once(args.module) for _ in range(args.repeat)]
+    walls = [wall for wall, _ in runs]
+    packages = defaultdict(list)
+    modules = defaultdict(list)
+    for _, times in runs:
+        per_package = defaultdict(int)
+        for module, (self_us, cumulative_us) in times.items():
+            per_package[_package(module)] += self_us
+            modules[module].append((self_us, cumulative_us))
+        for package, us in per_package.items():
+            packages[package].append(us)
+
+    print(f"import {args.module}: median {statistics.median(walls):.2f} s "
+          f"(min {min(walls):.2f}, max {max(walls):.2f}) over {args.repeat} runs")
+    print(f"\n{'package':<36}{'ms':>9}")
+    ranked = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))
+    for package, us in ranked[: args.top]:
+        print(f"{package:<36}{statistics.median(us) / 1000:>9.1f}")
+
+    own = args.module.split(".")[0]
+    print(f"\n{'module':<36}{'self ms':>9}{'cumulative ms':>15}")
+    ranked = sorted(
+        (item for item in modules.items() if item[0].split(".")[0] == own),
+        key=lambda item: -statistics.median(c for _, c in item[1]),
+    )
+    for module, samples in ranked[: args.top]:
+        print(f"{module:<36}{statistics.median(s for s, _ in samples) / 1000:>9.1f}"
+              f"{statistics.median(c for _, c in samples) / 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""State bytes written by append_to_state with copied lists and with append-only fields.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_state_fields --appends 1000
+
+Appends feedback-sized entries to one field, each in its own tool call (so
+each with its own state delta, as ADK records them in events), with an agent
+reading the field every `--read-every` appends.
+"""
+import argparse
+import json
+import time
+
+from google.adk.sessions.state import State
+
+from ..state_fields import append_entries, materialize_append_fields
+
+
+class _Context:
+    def __init__(self, state: State):
+        self.state = state
+
+
+def _copying_append(state: State, field: str, value: str) -> None:
+    state[field] = state.get(field, []) + [value]
+
+
+def _run(append, appends: int, read_every: int) -> tuple[int, int, float]:
+    value: dict = {}
+    delta_bytes = 0
+    started = time.perf_counter()
+    for index in range(appends):
+        delta: dict = {}
+        append(State(value, delta), "PROFIT_OPTIMIZATION_FEEDBACK",
+               f"Iteration {index}: sell in the second week at Kolar APMC for Rs 1,450 per quintal.")
+        delta_bytes += len(json.dumps(delta))
+        if (index + 1) % read_every == 0:
+            delta = {}
+            materialize_append_fields(_Context(State(value, delta)))
+            delta_bytes += len(json.dumps(delta))
+    return delta_bytes, len(json.dumps(value)), time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--appends", type=int, default=1000)
+    parser.add_argument("--read-every", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = [
+        ("copied list", _run(_copying_append, args.appends, args.read_every)),
+        ("append-only", _run(
+            lambda state, field, value: append_entries(state, field, [value]),
+            args.appends, args.read_every,
+        )),
+    ]
+    print(f"{args.appends} appends, read every {args.read_every}")
+    print(f"{'field':<14}{'delta KB':>12}{'state KB':>10}{'ms':>9}")
+    for name, (delta_bytes, state_bytes, seconds) in rows:
+        print(f"{name:<14}{delta_bytes / 1024:>12.1f}{state_bytes / 1024:>10.1f}"
+              f"{seconds * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
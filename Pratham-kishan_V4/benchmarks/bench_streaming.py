@@ -0,0 +1,84 @@
+"""Time to first report text with and without section streaming.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_streaming --latency 0.5 --per-token-latency 0.02
+
+Runs the crop advice and full report conversations once without streaming
+(the client sees each answer when it is complete) and once with SSE, where
+the coordinator streams its sub-agents' answers, and times the first text the farmer sees after
+asking for advice, and the whole turn.
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import time
+
+from google.adk.agents import RunConfig
+from google.adk.agents.run_config import StreamingMode
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from .conversations import CONVERSATIONS
+from .harness import FakeBackend
+
+# Agents that only greet or route; their text is not part of the advice.
+ROUTERS = {"greeter", "pratham_kishan_agent"}
+
+
+async def _turn_times(root, backend: FakeBackend, conversation, streaming: bool) -> tuple[float, float]:
+    backend.load(conversation)
+    runner = InMemoryRunner(agent=root, app_name="pratham_kishan_bench")
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="bench_user"
+    )
+    first_text_s = None
+    for turn in conversation.turns:
+        message = types.UserContent(parts=[types.Part(text=turn)])
+        events = runner.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=message,
+            run_config=RunConfig(streaming_mode=StreamingMode.SSE if streaming else StreamingMode.NONE),
+        )
+        started = time.perf_counter()
+        async for event in events:
+            text = event.content and any(part.text for part in event.content.parts or [])
+            if first_text_s is None and text and event.author not in ROUTERS:
+                first_text_s = time.perf_counter() - started
+    return first_text_s or 0.0, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="seconds to the first token of a model turn")
+    parser.add_argument("--per-token-latency", type=float, default=0.02)
+    parser.add_argument("--output-tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    os.environ.setdefault("MODEL", "gemini-2.0-flash")
+    agent = importlib.import_module(f"{__package__.rsplit('.', 1)[0]}.agent")
+    backend = FakeBackend(
+        latency_s=args.latency,
+        per_token_latency_s=args.per_token_latency,
+        output_tokens=args.output_tokens,
+    )
+    conversations = [c for c in CONVERSATIONS if c.name in ("crop_advice", "full_report")]
+
+    backend.install(agent.root_agent)
+    try:
+        print(f"{'conversation':<14}{'mode':<11}{'first text s':>14}{'turn s':>9}")
+        for conversation in conversations:
+            for streaming in (False, True):
+                agent.response_cache.clear()
+                first, total = asyncio.run(
+                    _turn_times(agent.root_agent, backend, conversation, streaming)
+                )
+                mode = "streaming" if streaming else "unary"
+                print(f"{conversation.name:<14}{mode:<11}{first:>14.2f}{total:>9.2f}")
+    finally:
+        backend.uninstall()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Load and lookup times of the gridded weather store.
+
+    python -m Pratham-kishan_V4.benchmarks.bench_weather --days 10 --step 0.25
+
+Writes a synthetic forecast for all of India on a regular grid, with six
+hourly temperatures, as CSV. It times loading the file into the store, one
+lookup_weather_forecast call, and the indicators of every known district
+computed one call per district and in a single vectorised call.
+"""
+import argparse
+import asyncio
+import csv
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from .. import weather_store as weather
+from ..weather_store import WeatherStore, crop_thresholds, indicators, lookup_weather_forecast
+
+
+def _write_grid(path: str, days: int, step: float, seed: int) -> int:
+    rng = np.random.default_rng(seed)
+    lats = np.arange(6.0, 37.0 + step / 2, step)
+    lons = np.arange(68.0, 97.0 + step / 2, step)
+    lat, lon = np.meshgrid(lats, lons, indexing="ij")
+    rows = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["latitude", "longitude", "time", "temperature_2m", "precipitation"])
+        for day in range(days):
+            when = date.today() + timedelta(days=day)
+            wet = rng.random(lat.shape) < 0.3
+            for hour in (0, 6, 12, 18):
+                temp = 34 - 0.4 * (lat - 6) + 6 * np.sin(hour / 24 * 2 * np.pi) + rng.normal(0, 1, lat.shape)
+                rain = np.where(wet, rng.gamma(1.5, 2.0, lat.shape), 0.0)
+                stamp = f"{when}T{hour:02d}:00"
+                writer.writerows(
+                    (f"{a:.2f}", f"{o:.2f}", stamp, f"{t:.1f}", f"{r:.1f}")
+                    for a, o, t, r in zip(lat.ravel(), lon.ravel(), temp.ravel(), rain.ravel())
+                )
+                rows += lat.size
+    return rows
+
+
+async def _lookups(count: int) -> tuple[dict, list[float]]:
+    times = []
+    for _ in range(count):
+        started = time.perf_counter()
+        result = await lookup_weather_forecast("Kolar", "Karnataka", "Tomato")
+        times.append(time.perf_counter() - started)
+    return result, times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--step", type=float, default=0.25, help="grid spacing in degrees")
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "forecast.csv")
+        rows = _write_grid(path, args.days, args.step, args.seed)
+        store = WeatherStore()
+        started = time.perf_counter()
+        cell_days = store.load_files([path])
+        load_s = time.perf_counter() - started
+    cube_mb = sum(cube.nbytes for cube in store.cubes.values()) / 1e6
+    print(f"loaded {rows} rows into {cell_days} cell-days {store.cubes['tmax'].shape} "
+          f"({cube_mb:.1f} MB) in {load_s:.2f} s")
+
+    weather.weather_store = store
+    store._last_refresh = time.monotonic()  # pylint: disable=protected-access
+    result, times = asyncio.run(_lookups(args.lookups))
+    print(f"lookup_weather_forecast: {result['status']}, median "
+          f"{statistics.median(times) * 1000:.2f} ms over {args.lookups} calls")
+
+    store.district("Kolar")
+    districts = sorted({entry for entry in store._districts.values()})  # pylint: disable=protected-access
+    base_c, heat_c = crop_thresholds("tomato")
+    started = time.perf_counter()
+    for _, _, lat, lon in districts:
+        series = store.series(np.array([lat]), np.array([lon]), date.today(), 7)
+        indicators(series["tmax"], series["tmin"], series["rain"], base_c, heat_c)
+    one_by_one_s = time.perf_counter() - started
+    started = time.perf_counter()
+    series = store.series(
+        np.array([d[2] for d in districts]), np.array([d[3] for d in districts]), date.today(), 7
+    )
+    found = indicators(series["tmax"], series["tmin"], series["rain"], base_c, heat_c)
+    batched_s = time.perf_counter() - started
+    print(f"{len(districts)} districts: {one_by_one_s * 1000:.1f} ms one by one, "
+          f"{batched_s * 1000:.1f} ms in one call; mean rain days "
+          f"{found['rain_days'].mean():.1f}, heat stress days {found['heat_stress_days'].mean():.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Scripted farmer conversations for the offline V4 benchmarks.
+
+DEFAULT_SCRIPTS describes what every agent of the V4 tree does when it is run;
+a Conversation can override the script of individual agents to take another
+route through the tree.
+"""
+from dataclasses import dataclass, field
+
+from .fake_llm import Round, ToolCall
+
+CROP_DETAILS = "Tomato, flowering stage, 2 acres, drip irrigation, red soil"
+LOCATION = "Kolar, Karnataka"
+
+
+def _append(field_name: str, response: str) -> ToolCall:
+    return ToolCall("append_to_state", {"field": field_name, "response": response})
+
+
+def _transfer(agent_name: str) -> ToolCall:
+    return ToolCall("transfer_to_agent", {"agent_name": agent_name})
+
+
+def _ask(agent_name: str, request: str) -> ToolCall:
+    return ToolCall(agent_name, {"request": request})
+
+
+EXIT_LOOP = ToolCall("exit_loop")
+
+DEFAULT_SCRIPTS: dict[str, list[Round]] = {
+    "greeter": [
+        Round(text="Welcome to Pratham Kisan! Tell me about your crop and location."),
+        Round(
+            steps=[
+                [
+                    _append("CROP_DETAILS", CROP_DETAILS),
+                    _append("LOCATION", LOCATION),
+                ],
+                [_transfer("pratham_kishan_agent")],
+            ],
+            text="Transferring you to the advisor.",
+        ),
+    ],
+    "pratham_kishan_agent": [
+        Round(steps=[[_transfer("simple_agents")]], text="Calling the advisors."),
+    ],
+    "simple_agents": [
+        Round(
+            steps=[
+                [_ask("crop_management_agent", CROP_DETAILS)],
+                [_ask("weather_agent", LOCATION)],
+                [_ask("farming_new_tech_agent", CROP_DETAILS)],
+            ],
+            text="Here is your crop management, weather and technology advice.",
+        ),
+    ],
+    "crop_management_agent": [
+        Round(text="Mulch beds, stake plants, spray neem oil weekly.", searches=1),
+    ],
+    "weather_agent": [
+        Round(
+            steps=[[ToolCall("lookup_weather_forecast", {"district": "Kolar", "state": "Karnataka", "crop": "Tomato"})]],
+            text="Light rain expected Thursday; delay fertigation.",
+        ),
+    ],
+    "farming_new_tech_agent": [
+        Round(text="Consider sensor-based drip scheduling.", searches=1),
+    ],
+    "scheme_researcher": [
+        Round(
+            steps=[[ToolCall("find_schemes", {"crop": "tomato", "state": "Karnataka", "farmer_category": "", "benefit_type": ""})]],
+            text="PM-KISAN, PMFBY and the state drip subsidy apply.",
+        ),
+    ],
+    "scheme_search": [
+        Round(text="PM-KISAN, PMFBY and the state drip subsidy apply.", searches=2),
+    ],
+    "gov_scheme_critic": [
+        Round(
+            steps=[[_append("SCHEME_FEEDBACK", "Check the horticulture mission grant.")]],
+            text="Added feedback on the horticulture mission.",
+        ),
+        Round(steps=[[EXIT_LOOP]], text="Schemes are optimal."),
+    ],
+    "mandi_researcher": [
+        Round(
+            steps=[[ToolCall("lookup_mandi_prices", {"commodity": "Tomato", "state": "Karnataka", "market": ""})]],
+            text="Kolar APMC tomato modal price Rs 1400/quintal.",
+        ),
+    ],
+    "mandi_search": [
+        Round(text="Kolar APMC tomato modal price Rs 1400/quintal.", searches=2),
+    ],
+    "mandi_profit": [
+        Round(
+            steps=[
+                [ToolCall("maps_directions", {"origin": LOCATION, "destination": "Kolar APMC"})],
+                [
+                    ToolCall("calculate_crop_profit", {
+                        "crop": "Tomato", "acreage": 2, "yield_per_acre": 100, "yield_low": 70,
+                        "yield_high": 120, "costs_per_acre": {"seed": 8000, "fertiliser": 6000, "labour": 15000},
+                        "markets": ["Kolar APMC"], "distances_km": [12],
+                        "price_series": {"Kolar APMC": [1380, 1400]}, "sale_in_days": [0, 7, 14],
+                    })
+                ],
+                [
+                    _append("PROFIT_ANALYSIS", "Expected profit Rs 1.2 lakh."),
+                    _append("DISTANCE_ANALYSIS", "Kolar APMC is 12 km away."),
+                ],
+            ],
+            text="Profit and distance recorded.",
+        ),
+    ],
+    "mandi_critic": [
+        Round(
+            steps=[[_append("PROFIT_OPTIMIZATION_FEEDBACK", "Sell in the second week.")]],
+            text="Suggested a later sale date.",
+        ),
+        Round(steps=[[EXIT_LOOP]], text="Profit is optimal."),
+    ],
+    "report_synthesizer": [
+        Round(text="## Full advisory\nCrop, weather, technology, schemes and mandi sections."),
+    ],
+}
+
+
+@dataclass
+class Conversation:
+    """User turns of one benchmark conversation plus per-agent script overrides."""
+
+    name: str
+    turns: list[str]
+    scripts: dict[str, list[Round]] = field(default_factory=dict)
+
+    def script_for(self, agent_name: str) -> list[Round]:
+        return self.scripts.get(agent_name) or DEFAULT_SCRIPTS.get(
+            agent_name, [Round()]
+        )
+
+
+CONVERSATIONS = [
+    Conversation(
+        name="crop_advice",
+        turns=["Hello", f"I grow {CROP_DETAILS} in {LOCATION}."],
+    ),
+    Conversation(
+        name="gov_schemes",
+        turns=["Hello", f"I grow {CROP_DETAILS} in {LOCATION}. Which schemes apply?"],
+        scripts={
+            "pratham_kishan_agent": [
+                Round(steps=[[_transfer("gov_scheme_agent")]], text="Checking schemes."),
+            ],
+        },
+    ),
+    Conversation(
+        name="mandi_prices",
+        turns=["Hello", f"I grow {CROP_DETAILS} in {LOCATION}. Where should I sell?"],
+        scripts={
+            "pratham_kishan_agent": [
+                Round(steps=[[_transfer("mandi_price_agent")]], text="Checking mandis."),
+            ],
+        },
+    ),
+    Conversation(
+        name="full_report",
+        turns=["Hello", f"I grow {CROP_DETAILS} in {LOCATION}. Give me a full report."],
+        scripts={
+            "pratham_kishan_agent": [
+                Round(steps=[[_transfer("full_report_agent")]], text="Building the report."),
+            ],
+        },
+    ),
+]
@@ -0,0 +1,171 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Callable, Optional
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+# The model id has to look like a Gemini id, otherwise the built-in
+# google_search tool refuses to attach itself to the request.
+BENCH_MODEL = "gemini-bench-scripted"
+
+
+@dataclass
+class ToolCall:
+    """A function call the scripted model emits, e.g. exit_loop or append_to_state."""
+
+    name: str
+    args: dict = field(default_factory=dict)
+
+
+@dataclass
+class Round:
+    """What an agent does each time it is run.
+
+    Every entry of `steps` is one model turn that emits the listed function
+    calls (in parallel, like a real model response with several parts). After
+    the last step has received its function responses the model answers with
+    `text`. `searches` simulates built-in google_search grounding on that final
+    turn; each search adds `search_latency_s` to the turn.
+    """
+
+    steps: list[list[ToolCall]] = field(default_factory=list)
+    text: str = "ok"
+    searches: int = 0
+
+
+class ScriptedLlm(BaseLlm):
+    """Deterministic local stand-in for Gemini, one instance per agent.
+
+    The script is a list of rounds. A new round starts whenever the request
+    does not end with the function responses of this model's previous turn; the
+    last round repeats once the script is exhausted. When streaming, a final
+    answer arrives as partial chunks after the first-token latency, followed
+    by the whole answer.
+
+    The request's model (an EscalatingLlm switches it) picks the latency
+    factor in `speed` and the `confidence` reported as avg_logprobs; a call
+    repeating the previous request, as an escalation does, stays in its round.
+    """
+
+    agent_name: str
+    rounds: list[Round]
+    latency_s: float = 0.0
+    per_token_latency_s: float = 0.0
+    output_tokens: int = 64
+    search_latency_s: float = 0.0
+    chars_per_token: int = 4
+    recorder: Optional[object] = None
+    speed: dict[str, float] = {}
+    confidence: Optional[Callable[[str], float]] = None
+    round_index: int = -1
+    last_request: Optional[object] = None
+
+    def _step_index(self, llm_request: LlmRequest) -> int:
+        """Counts the completed call/response pairs at the end of the request."""
+        contents = llm_request.contents or []
+        steps = 0
+        i = len(contents) - 1
+        while i >= 1:
+            response, call = contents[i], contents[i - 1]
+            if not _has_part(response, "function_response"):
+                break
+            if call.role != "model" or not _has_part(call, "function_call"):
+                break
+            steps += 1
+            i -= 2
+        return steps
+
+    def _prompt_tokens(self, llm_request: LlmRequest) -> int:
+        chars = 0
+        config = llm_request.config
+        if config and config.system_instruction:
+            chars += len(str(config.system_instruction))
+        for content in llm_request.contents or []:
+            for part in content.parts or []:
+                if part.text:
+                    chars += len(part.text)
+                elif part.function_call or part.function_response:
+                    chars += len(str(part.function_call or part.function_response))
+        return max(1, chars // self.chars_per_token)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        step = self._step_index(llm_request)
+        if step == 0 and llm_request is not self.last_request:
+            self.round_index += 1
+        self.last_request = llm_request
+        model = llm_request.model or self.model
+        scale = self.speed.get(model, 1.0)
+        current = self.rounds[min(self.round_index, len(self.rounds) - 1)]
+
+        if step < len(current.steps):
+            parts = [
+                types.Part(
+                    function_call=types.FunctionCall(name=call.name, args=call.args)
+                )
+                for call in current.steps[step]
+            ]
+            searches = 0
+            output_tokens = 8 * len(parts)
+        else:
+            parts = [types.Part(text=current.text)]
+            searches = current.searches
+            output_tokens = self.output_tokens
+
+        prompt_tokens = self._prompt_tokens(llm_request)
+        started = time.perf_counter()
+        first_token_s = self.latency_s * scale + searches * self.search_latency_s
+        generate_s = output_tokens * self.per_token_latency_s * scale
+        if stream and current.text and step >= len(current.steps):
+            if first_token_s:
+                await asyncio.sleep(first_token_s)
+            async for chunk in self._stream_text(current.text, output_tokens, generate_s):
+                yield chunk
+        elif first_token_s + generate_s:
+            await asyncio.sleep(first_token_s + generate_s)
+        if self.recorder is not None:
+            self.recorder.record_model_call(
+                self.agent_name,
+                prompt_tokens=prompt_tokens,
+                output_tokens=output_tokens,
+                searches=searches,
+                seconds=time.perf_counter() - started,
+                model=model,
+            )
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=parts),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=prompt_tokens + output_tokens,
+            ),
+            avg_logprobs=(
+                math.log(max(self.confidence(model), 1e-9)) if self.confidence else None
+            ),
+            turn_complete=True,
+        )
+
+    async def _stream_text(
+        self, text: str, output_tokens: int, generate_s: float
+    ) -> AsyncGenerator[LlmResponse, None]:
+        """Yields `text` as partial responses of about 8 tokens, spread over `generate_s`."""
+        words = text.split(" ")
+        chunks = max(1, min(len(words), output_tokens // 8))
+        size = -(-len(words) // chunks)
+        for start in range(0, len(words), size):
+            if generate_s:
+                await asyncio.sleep(generate_s / chunks)
+            piece = " ".join(words[start:start + size]) + (" " if start + size < len(words) else "")
+            yield LlmResponse(
+                content=types.Content(role="model", parts=[types.Part(text=piece)]),
+                partial=True,
+            )
+
+
+def _has_part(content: types.Content, attr: str) -> bool:
+    return any(getattr(part, attr, None) for part in content.parts or [])
@@ -0,0 +1,294 @@
+import asyncio
+import json
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Optional
+
+from google.adk.agents import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.adk.tools import FunctionTool
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+from google.genai import types
+
+from ..agent_tree import add_callback, walk_agents
+from ..mcp_pool import PooledMcpToolset
+from ..model_router import EscalatingLlm
+from .conversations import CONVERSATIONS, Conversation
+from .fake_llm import BENCH_MODEL, ScriptedLlm
+
+
+@dataclass
+class AgentStats:
+    runs: int = 0
+    wall_s: float = 0.0
+    model_turns: int = 0
+    model_s: float = 0.0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    tool_calls: Counter = field(default_factory=Counter)
+    state_bytes_written: int = 0
+    # model -> [turns, prompt tokens, output tokens]
+    models: dict[str, list[int]] = field(default_factory=dict)
+
+
+@dataclass
+class ConversationResult:
+    name: str
+    wall_s: float
+    state_bytes: int
+    agents: dict[str, AgentStats]
+
+    @property
+    def model_turns(self) -> int:
+        return sum(stats.model_turns for stats in self.agents.values())
+
+    @property
+    def tool_calls(self) -> int:
+        return sum(sum(stats.tool_calls.values()) for stats in self.agents.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "wall_s": self.wall_s,
+            "state_bytes": self.state_bytes,
+            "model_turns": self.model_turns,
+            "tool_calls": self.tool_calls,
+            "agents": {
+                # asdict would rebuild the Counter from (tool, count) pairs,
+                # counting the pairs themselves.
+                name: dict(asdict(stats), tool_calls=dict(stats.tool_calls))
+                for name, stats in self.agents.items()
+            },
+        }
+
+
+class Recorder:
+    """Collects per-agent numbers from callbacks and the scripted models."""
+
+    def __init__(self):
+        self.agents: dict[str, AgentStats] = {}
+        self._started: dict[tuple[str, str], list[float]] = {}
+
+    def stats(self, agent_name: str) -> AgentStats:
+        return self.agents.setdefault(agent_name, AgentStats())
+
+    def record_model_call(
+        self, agent_name, prompt_tokens, output_tokens, searches, seconds, model=BENCH_MODEL
+    ):
+        stats = self.stats(agent_name)
+        stats.model_turns += 1
+        stats.model_s += seconds
+        stats.prompt_tokens += prompt_tokens
+        stats.output_tokens += output_tokens
+        per_model = stats.models.setdefault(model, [0, 0, 0])
+        per_model[0] += 1
+        per_model[1] += prompt_tokens
+        per_model[2] += output_tokens
+        if searches:
+            stats.tool_calls["google_search"] += searches
+
+    def before_agent(self, callback_context):
+        self.stats(callback_context.agent_name).runs += 1
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        self._started.setdefault(key, []).append(time.perf_counter())
+        return None
+
+    def after_agent(self, callback_context):
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        started = self._started.get(key)
+        if started:
+            self.stats(callback_context.agent_name).wall_s += (
+                time.perf_counter() - started.pop()
+            )
+        return None
+
+    def before_tool(self, tool, args, tool_context):
+        self.stats(tool_context.agent_name).tool_calls[tool.name] += 1
+        return None
+
+    def after_tool(self, tool, args, tool_context, tool_response):
+        delta = tool_context.actions.state_delta
+        if delta:
+            self.stats(tool_context.agent_name).state_bytes_written += len(
+                json.dumps(delta, default=str)
+            )
+        return None
+
+
+def fake_maps_tool(latency_s: float) -> FunctionTool:
+    """Local replacement for the Google Maps MCP server used by mandi_profit."""
+
+    async def maps_directions(origin: str, destination: str, mode: str = "driving") -> dict:
+        """Get directions between two places.
+
+        Args:
+            origin (str): starting address
+            destination (str): ending address
+            mode (str): travel mode
+
+        Returns:
+            dict: distance and duration of the route
+        """
+        if latency_s:
+            await asyncio.sleep(latency_s)
+        return {"distance": "12 km", "duration": "25 mins", "mode": mode}
+
+    return FunctionTool(maps_directions)
+
+
+class FakeBackend:
+    """Swaps every model of an agent tree for a ScriptedLlm.
+
+    MCP toolsets are replaced with a local maps_directions stand-in so that no
+    Node process is started. `uninstall` puts the original models, tools and
+    callbacks back. A scripted model keeps the name of the model it replaces,
+    which with `model_speed` scales its latency; an EscalatingLlm is kept
+    with the scripted model as its backend.
+    """
+
+    def __init__(
+        self,
+        latency_s: float = 0.0,
+        per_token_latency_s: float = 0.0,
+        output_tokens: int = 64,
+        search_latency_s: float = 0.0,
+        maps_latency_s: float = 0.0,
+        model_speed: Optional[dict[str, float]] = None,
+        model_confidence: Optional[Callable[[str], float]] = None,
+    ):
+        self.latency_s = latency_s
+        self.per_token_latency_s = per_token_latency_s
+        self.output_tokens = output_tokens
+        self.search_latency_s = search_latency_s
+        self.maps_latency_s = maps_latency_s
+        self.model_speed = model_speed or {}
+        self.model_confidence = model_confidence
+        self.recorder = Recorder()
+        self._saved: list[tuple[Any, str, Any]] = []
+        self._llm_agents: list[tuple[LlmAgent, Any]] = []
+
+    def _save(self, agent, *attributes: str) -> None:
+        for attribute in attributes:
+            self._saved.append((agent, attribute, getattr(agent, attribute)))
+
+    def install(self, root) -> None:
+        for agent in walk_agents(root):
+            self._save(agent, "before_agent_callback", "after_agent_callback")
+            add_callback(agent, "before_agent_callback", self.recorder.before_agent)
+            add_callback(agent, "after_agent_callback", self.recorder.after_agent)
+            if not isinstance(agent, LlmAgent):
+                continue
+            self._llm_agents.append((agent, agent.model))
+            self._save(
+                agent, "before_tool_callback", "after_tool_callback", "tools", "model"
+            )
+            add_callback(agent, "before_tool_callback", self.recorder.before_tool)
+            add_callback(agent, "after_tool_callback", self.recorder.after_tool)
+            agent.tools = [
+                fake_maps_tool(self.maps_latency_s)
+                if isinstance(tool, (MCPToolset, PooledMcpToolset))
+                else tool
+                for tool in agent.tools
+            ]
+
+    def uninstall(self) -> None:
+        for agent, attribute, value in reversed(self._saved):
+            setattr(agent, attribute, value)
+        self._saved.clear()
+        self._llm_agents.clear()
+
+    def load(self, conversation: Conversation) -> None:
+        """Gives every model a fresh copy of the conversation's script."""
+        self.recorder.agents.clear()
+        for agent, original in self._llm_agents:
+            scripted = ScriptedLlm(
+                model=_model_name(original),
+                agent_name=agent.name,
+                rounds=conversation.script_for(agent.name),
+                latency_s=self.latency_s,
+                per_token_latency_s=self.per_token_latency_s,
+                output_tokens=self.output_tokens,
+                search_latency_s=self.search_latency_s,
+                recorder=self.recorder,
+                speed=self.model_speed,
+                confidence=self.model_confidence,
+            )
+            if isinstance(original, EscalatingLlm):
+                agent.model = original.model_copy(update={"backend": scripted})
+            else:
+                agent.model = scripted
+
+
+def _model_name(model) -> str:
+    name = model if isinstance(model, str) else getattr(model, "model", None)
+    return name or BENCH_MODEL
+
+
+async def run_conversation(
+    root, backend: FakeBackend, conversation: Conversation
+) -> ConversationResult:
+    backend.load(conversation)
+    runner = InMemoryRunner(agent=root, app_name="pratham_kishan_bench")
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="bench_user"
+    )
+    started = time.perf_counter()
+    for turn in conversation.turns:
+        async for _ in runner.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=types.UserContent(parts=[types.Part(text=turn)]),
+        ):
+            pass
+    wall_s = time.perf_counter() - started
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=session.user_id, session_id=session.id
+    )
+    return ConversationResult(
+        name=conversation.name,
+        wall_s=wall_s,
+        state_bytes=len(json.dumps(session.state, default=str)),
+        agents=dict(backend.recorder.agents),
+    )
+
+
+async def run_benchmark(
+    root,
+    backend: FakeBackend,
+    conversations: Optional[list[Conversation]] = None,
+    repeat: int = 1,
+) -> list[ConversationResult]:
+    backend.install(root)
+    try:
+        results = []
+        for _ in range(repeat):
+            for conversation in conversations or CONVERSATIONS:
+                results.append(await run_conversation(root, backend, conversation))
+        return results
+    finally:
+        backend.uninstall()
+
+
+def format_report(results: list[ConversationResult]) -> str:
+    lines = []
+    for result in results:
+        lines.append(
+            f"== {result.name}: {result.wall_s * 1000:.1f} ms, "
+            f"{result.model_turns} model turns, {result.tool_calls} tool calls, "
+            f"{result.state_bytes} state bytes"
+        )
+        lines.append(
+            f"  {'agent':<24}{'runs':>5}{'wall ms':>10}{'turns':>7}"
+            f"{'prompt tok':>12}{'out tok':>9}{'tools':>7}{'state B':>9}"
+        )
+        for name, stats in sorted(
+            result.agents.items(), key=lambda item: -item[1].wall_s
+        ):
+            lines.append(
+                f"  {name:<24}{stats.runs:>5}{stats.wall_s * 1000:>10.1f}"
+                f"{stats.model_turns:>7}{stats.prompt_tokens:>12}"
+                f"{stats.output_tokens:>9}{sum(stats.tool_calls.values()):>7}"
+                f"{stats.state_bytes_written:>9}"
+            )
+    return "\n".join(lines)
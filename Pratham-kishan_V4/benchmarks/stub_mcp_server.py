@@ -0,0 +1,109 @@
+"""Minimal MCP server over stdio that stands in for the Google Maps server.
+
+    python Pratham-kishan_V4/benchmarks/stub_mcp_server.py --startup 1.5 --latency 0.05
+
+Speaks newline-delimited JSON-RPC with only the standard library, so it works
+with any MCP client version. --startup emulates npx resolution and Node start,
+--latency the Maps API round trip, and --crash-after makes the process exit
+after that many tool calls to exercise restarts.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+
+MAPS_DIRECTIONS = {
+    "name": "maps_directions",
+    "description": "Get directions between two points",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "origin": {"type": "string", "description": "Starting point"},
+            "destination": {"type": "string", "description": "Ending point"},
+            "mode": {"type": "string", "description": "Travel mode"},
+        },
+        "required": ["origin", "destination"],
+    },
+}
+
+_write_lock = threading.Lock()
+
+
+def _send(message: dict) -> None:
+    with _write_lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+
+def _call_tool(request: dict, latency_s: float) -> None:
+    time.sleep(latency_s)
+    args = request["params"].get("arguments") or {}
+    text = json.dumps(
+        {
+            "routes": [
+                {
+                    "summary": f"{args.get('origin')} to {args.get('destination')}",
+                    "distance": {"text": "12.4 km", "value": 12400},
+                    "duration": {"text": "24 mins", "value": 1440},
+                }
+            ]
+        }
+    )
+    _send(
+        {
+            "jsonrpc": "2.0",
+            "id": request["id"],
+            "result": {"content": [{"type": "text", "text": text}], "isError": False},
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--startup", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--crash-after", type=int, default=0)
+    args = parser.parse_args()
+
+    time.sleep(args.startup)
+    calls = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        method = request.get("method")
+        if "id" not in request:
+            continue
+        if method == "initialize":
+            result = {
+                "protocolVersion": request["params"]["protocolVersion"],
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "stub-google-maps", "version": "0.1"},
+            }
+        elif method == "tools/list":
+            result = {"tools": [MAPS_DIRECTIONS]}
+        elif method == "tools/call":
+            calls += 1
+            if args.crash_after and calls > args.crash_after:
+                sys.exit(1)
+            threading.Thread(
+                target=_call_tool, args=(request, args.latency), daemon=True
+            ).start()
+            continue
+        elif method == "ping":
+            result = {}
+        else:
+            _send(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request["id"],
+                    "error": {"code": -32601, "message": f"Unknown method {method}"},
+                }
+            )
+            continue
+        _send({"jsonrpc": "2.0", "id": request["id"], "result": result})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import AsyncGenerator
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import errors, types
+
+
+class ThrottlingLlm(BaseLlm):
+    """Local stand-in for a Gemini endpoint with a quota.
+
+    It accepts at most `quota_per_s` calls in any one-second window and
+    answers the rest with the 429 RESOURCE_EXHAUSTED the genai client
+    raises. Of the accepted calls, `error_rate` fail with a 503 instead.
+    An answer takes `latency_s`. Rejections come back at once, like a
+    real quota error.
+    """
+
+    quota_per_s: int = 10
+    latency_s: float = 0.1
+    error_rate: float = 0.0
+    seed: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    server_errors: int = 0
+    _window: deque = deque()
+    _rng: random.Random = random.Random()
+
+    def model_post_init(self, __context) -> None:
+        self._window = deque()
+        self._rng = random.Random(self.seed)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        now = time.monotonic()
+        while self._window and now - self._window[0] >= 1.0:
+            self._window.popleft()
+        if len(self._window) >= self.quota_per_s:
+            self.rejected += 1
+            raise errors.ClientError(
+                429,
+                {"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}},
+            )
+        self._window.append(now)
+        if self._rng.random() < self.error_rate:
+            self.server_errors += 1
+            raise errors.ServerError(
+                503, {"error": {"code": 503, "message": "Overloaded", "status": "UNAVAILABLE"}}
+            )
+        self.accepted += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="ok")]),
+            turn_complete=True,
+        )
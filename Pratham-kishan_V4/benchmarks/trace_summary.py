@@ -0,0 +1,57 @@
+"""Summarises a span file written by the JSON-lines trace exporter.
+
+    python -m Pratham-kishan_V4.benchmarks.trace_summary trace.jsonl
+
+For each agent it prints inclusive wall time, the time spent in its own model
+and tool calls, model turns and token counts, slowest agent first. Nested
+agents are counted in their parents' inclusive time as well.
+"""
+import argparse
+import json
+from collections import defaultdict
+
+
+def summarize(path: str) -> dict[str, dict]:
+    agents = defaultdict(lambda: defaultdict(float))
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            span = json.loads(line)
+            stats = agents[span["agent"]]
+            kind = span["kind"]
+            if kind == "agent":
+                stats["runs"] += 1
+                stats["wall_ms"] += span["duration_ms"]
+            elif kind == "model":
+                stats["model_turns"] += 1
+                stats["model_ms"] += span["duration_ms"]
+                stats["prompt_tokens"] += span["attributes"].get("prompt_tokens", 0)
+                stats["response_tokens"] += span["attributes"].get("response_tokens", 0)
+            elif kind in ("tool", "transfer"):
+                stats["tool_calls"] += 1
+                stats["tool_ms"] += span["duration_ms"]
+            elif kind == "loop_iteration":
+                stats["iterations"] += 1
+    return agents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    agents = summarize(args.path)
+    print(
+        f"{'agent':<30}{'runs':>5}{'wall ms':>10}{'model ms':>10}{'tool ms':>10}"
+        f"{'turns':>7}{'prompt tok':>12}{'resp tok':>10}{'iters':>7}"
+    )
+    for name, stats in sorted(agents.items(), key=lambda item: -item[1]["wall_ms"]):
+        print(
+            f"{name:<30}{stats['runs']:>5.0f}{stats['wall_ms']:>10.1f}"
+            f"{stats['model_ms']:>10.1f}{stats['tool_ms']:>10.1f}"
+            f"{stats['model_turns']:>7.0f}{stats['prompt_tokens']:>12.0f}"
+            f"{stats['response_tokens']:>10.0f}{stats['iterations']:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.tools.tool_context import ToolContext
+
+from .hedging import hedge_after_s, run_hedged
+from .section_streaming import StreamingAgentTool, sections_streaming
+
+SUB_AGENT_TIMEOUT_S = float(os.getenv("SUB_AGENT_TIMEOUT_S", "60"))
+# Quantile of a sub-agent's recent run times after which a duplicate run is
+# started, e.g. 0.95; 0 turns hedging off.
+SUB_AGENT_HEDGE_QUANTILE = float(os.getenv("SUB_AGENT_HEDGE_QUANTILE", "0")) or None
+SUB_AGENT_HEDGE_MIN_SAMPLES = int(os.getenv("SUB_AGENT_HEDGE_MIN_SAMPLES", "20"))
+_WINDOW = 200
+
+
+def _run_context(tool_context: ToolContext) -> ToolContext:
+    """A ToolContext for the same call with a state delta of its own."""
+    get_invocation_context = getattr(tool_context, "get_invocation_context", None)
+    if get_invocation_context is not None:
+        ctx = get_invocation_context()
+    else:
+        # ADK 1.x has no public accessor.
+        ctx = tool_context._invocation_context  # pylint: disable=protected-access
+    return ToolContext(ctx, function_call_id=tool_context.function_call_id)
+
+
+class BoundedAgentTool(StreamingAgentTool):
+    """Calls a sub-agent like AgentTool, but never for longer than `timeout_s`.
+
+    A sub-agent that runs out of time or fails answers with a "not available"
+    note instead, so the coordinator can still answer with the other experts'
+    advice. With `hedge_quantile` set, a run still going after that quantile
+    of the tool's recent run times gets a second, identical run, and the
+    first of the two to finish is used. Calls that stream their answer to
+    the client are not hedged, as the two runs would interleave their text.
+    """
+
+    def __init__(
+        self,
+        agent: BaseAgent,
+        timeout_s: float = SUB_AGENT_TIMEOUT_S,
+        hedge_quantile: Optional[float] = SUB_AGENT_HEDGE_QUANTILE,
+        hedge_min_samples: int = SUB_AGENT_HEDGE_MIN_SAMPLES,
+        **kwargs,
+    ):
+        super().__init__(agent=agent, **kwargs)
+        self.timeout_s = timeout_s
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._durations: deque = deque(maxlen=_WINDOW)
+
+    def hedge_after_s(self) -> Optional[float]:
+        """Seconds after which a call gets a hedged run, or None."""
+        return hedge_after_s(self._durations, self.hedge_quantile, self.hedge_min_samples)
+
+    async def _hedged(self, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        after_s = None if sections_streaming() else self.hedge_after_s()
+        if after_s is None:
+            return await super().run_async(args=args, tool_context=tool_context)
+
+        async def start() -> tuple[Any, ToolContext]:
+            # Each run writes to its own tool context; only the winner's
+            # state and artifact changes reach the caller.
+            run_context = _run_context(tool_context)
+            result = await super(BoundedAgentTool, self).run_async(
+                args=args, tool_context=run_context
+            )
+            return result, run_context
+
+        (result, run_context), hedged, hedge_won = await run_hedged(
+            start, after_s, f"[{self.name}]"
+        )
+        self.hedges += hedged
+        self.hedge_wins += hedge_won
+        tool_context.state.update(run_context.actions.state_delta)
+        tool_context.actions.artifact_delta.update(run_context.actions.artifact_delta)
+        if run_context.actions.skip_summarization:
+            tool_context.actions.skip_summarization = True
+        return result
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self._hedged(args, tool_context), self.timeout_s)
+        except asyncio.TimeoutError:
+            logging.info(f"[{self.name}] timed out after {self.timeout_s}s")
+            self._durations.append(self.timeout_s)
+            return (
+                f"Not available: {self.name} did not answer within {self.timeout_s:.0f}s. "
+                "Give the rest of the advice and say this part is not available yet."
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.warning(f"[{self.name}] failed: {e}")
+            return (
+                f"Not available: {self.name} failed. "
+                "Give the rest of the advice and say this part is not available yet."
+            )
+        self._durations.append(time.perf_counter() - started)
+        return result
@@ -1,24 +1,209 @@
 import logging
-import google.cloud.logging
+import os
+import queue
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
 
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmResponse, LlmRequest
 
+LOG_NAME = os.getenv("CLOUD_LOG_NAME", "pratham_kishan")
+LOG_FILE = os.getenv("LOG_FILE")
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "50"))
+LOG_FLUSH_INTERVAL_S = float(os.getenv("LOG_FLUSH_INTERVAL_S", "1.0"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_BLOCK_S = float(os.getenv("LOG_BLOCK_S", "0.05"))
+
+# Loggers used while shipping a batch; letting them reach the batching handler
+# would feed the sink its own chatter.
+_SINK_LOGGERS = ("google.cloud", "google.auth", "google_auth_httplib2", "urllib3")
+
+_STOP = object()
+
+if TYPE_CHECKING:
+    import google.cloud.logging
+
+
+class CloudSink:
+    """Writes a batch of records to Cloud Logging in a single API call."""
+
+    def __init__(self, client: "google.cloud.logging.Client", log_name: str = LOG_NAME):
+        self._logger = client.logger(log_name)
+
+    def write(self, records: list[logging.LogRecord]) -> None:
+        batch = self._logger.batch()
+        for record in records:
+            batch.log_text(record.getMessage(), severity=record.levelname)
+        batch.commit()
+
+
+class StreamSink:
+    """Writes a batch of records to a local file, or stderr when no path is given."""
+
+    def __init__(self, path: Optional[str] = None):
+        self._stream = open(path, "a", encoding="utf-8") if path else sys.stderr
+        self._formatter = logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s: %(message)s"
+        )
+
+    def write(self, records: list[logging.LogRecord]) -> None:
+        self._stream.write(
+            "".join(self._formatter.format(record) + "\n" for record in records)
+        )
+        self._stream.flush()
+
+
+class LazySink:
+    """Builds the real sink on the first write, on the worker thread.
+
+    Creating a Cloud Logging client looks up credentials, which off GCP means
+    seconds of metadata-server probing; doing it here keeps it off import.
+    """
+
+    def __init__(self, make_sink):
+        self._make_sink = make_sink
+        self._sink = None
+
+    def write(self, records: list[logging.LogRecord]) -> None:
+        if self._sink is None:
+            self._sink = self._make_sink()
+        self._sink.write(records)
+
+
+class BatchingHandler(logging.Handler):
+    """Logging handler that hands records to a background worker.
+
+    `emit` only puts the record on a bounded queue. The worker writes to the
+    sink once `batch_size` records are waiting or `flush_interval_s` has passed
+    since the oldest one arrived. When the queue is full `emit` waits up to
+    `block_s` for room and then drops the record, counting it in `dropped`.
+    """
+
+    def __init__(
+        self,
+        sink,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval_s: float = LOG_FLUSH_INTERVAL_S,
+        max_queue: int = LOG_QUEUE_SIZE,
+        block_s: float = LOG_BLOCK_S,
+    ):
+        super().__init__()
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.block_s = block_s
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self._worker = threading.Thread(
+            target=self._run, name="log-batch-worker", daemon=True
+        )
+        self._worker.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put(record, timeout=self.block_s)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Blocks until every queued record has been handed to the sink."""
+        if self._worker.is_alive():
+            self.queue.join()
+
+    def close(self) -> None:
+        if self._worker.is_alive():
+            self.queue.put(_STOP)
+            self._worker.join()
+        super().close()
+
+    def _run(self) -> None:
+        batch = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                record = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                record = None
+            if record is not None and record is not _STOP:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval_s
+                batch.append(record)
+            if batch and (
+                record is None
+                or record is _STOP
+                or len(batch) >= self.batch_size
+                or time.monotonic() >= deadline
+            ):
+                self._write(batch)
+                batch = []
+            if record is _STOP:
+                self.queue.task_done()
+                return
+
+    def _write(self, batch: list[logging.LogRecord]) -> None:
+        try:
+            self.sink.write(batch)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:  # the worker must survive a failed batch
+            print(f"[callback_logging] dropped {len(batch)} records: {e}", file=sys.stderr)
+        finally:
+            for _ in batch:
+                self.queue.task_done()
+
+
+_handler: Optional[BatchingHandler] = None
+_lock = threading.Lock()
+
+
+def _make_sink():
+    import google.auth.exceptions
+    import google.cloud.logging
+
+    try:
+        client = google.cloud.logging.Client()
+    except google.auth.exceptions.DefaultCredentialsError:
+        return StreamSink(LOG_FILE)
+    for name in _SINK_LOGGERS:
+        logging.getLogger(name).propagate = False
+    return CloudSink(client)
+
+
+def setup_logging() -> BatchingHandler:
+    """Attaches the shared batching handler to the root logger, once per process.
+
+    Records go to Cloud Logging when application default credentials exist and
+    to LOG_FILE (or stderr) otherwise.
+    """
+    global _handler
+    if _handler is None:
+        with _lock:
+            if _handler is None:
+                handler = BatchingHandler(LazySink(_make_sink))
+                root = logging.getLogger()
+                root.setLevel(logging.INFO)
+                root.addHandler(handler)
+                _handler = handler
+    return _handler
+
 
 def log_query_to_model(callback_context: CallbackContext, llm_request: LlmRequest):
-    cloud_logging_client = google.cloud.logging.Client()
-    cloud_logging_client.setup_logging()
+    setup_logging()
     if llm_request.contents and llm_request.contents[-1].role == 'user':
          if llm_request.contents[-1].parts and "text" in llm_request.contents[-1].parts:
             last_user_message = llm_request.contents[-1].parts[0].text
             logging.info(f"[query to {callback_context.agent_name}]: " + last_user_message)
 
 def log_model_response(callback_context: CallbackContext, llm_response: LlmResponse):
-    cloud_logging_client = google.cloud.logging.Client()
-    cloud_logging_client.setup_logging()
+    setup_logging()
     if llm_response.content and llm_response.content.parts:
         for part in llm_response.content.parts:
             if part.text:
                 logging.info(f"[response from {callback_context.agent_name}]: " + part.text)
             elif part.function_call:
-                logging.info(f"[function call from {callback_context.agent_name}]: " + part.function_call.name)
\ No newline at end of file
+                logging.info(f"[function call from {callback_context.agent_name}]: " + part.function_call.name)
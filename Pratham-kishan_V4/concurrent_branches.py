@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional
+
+from pydantic import PrivateAttr
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.tool_context import ToolContext
+
+from .hedging import hedge_after_s, run_hedged
+from .section_streaming import SectionMux, is_streaming, run_streaming
+
+# Quantile of a branch's recent run times after which a duplicate run is
+# started, e.g. 0.95; 0 turns hedging off.
+BRANCH_HEDGE_QUANTILE = float(os.getenv("BRANCH_HEDGE_QUANTILE", "0")) or None
+BRANCH_HEDGE_MIN_SAMPLES = int(os.getenv("BRANCH_HEDGE_MIN_SAMPLES", "20"))
+BRANCH_HEDGE_WINDOW = 200
+
+# State key listing the branches that gave no answer, for the synthesizer.
+MISSING_SECTIONS_KEY = "MISSING_SECTIONS"
+
+
+def _as_text(value) -> str:
+    if isinstance(value, list):
+        return "; ".join(str(item) for item in value)
+    return "" if value is None else str(value)
+
+
+class ConcurrentBranchesAgent(BaseAgent):
+    """Runs independent agents at the same time and stores each answer in state.
+
+    `branches` maps a state key to the agent whose final answer is written to
+    it. Every branch runs like an AgentTool call, with its own copy of the
+    session state, so the branch agents can also be used elsewhere in the tree.
+    A branch that does not finish within its timeout is cancelled and its key
+    gets a "Not available" note instead, so the report is bounded by the
+    slowest allowed branch rather than the sum of all of them.
+
+    When the run streams (SSE), the branches stream too: their answers are
+    yielded as partial events under a header per branch, one branch at a time
+    through a SectionMux, while the others keep running.
+
+    With `hedge_quantile` set, a branch still running after that quantile of
+    its last runs' times (once there are `hedge_min_samples` of them) gets a
+    second, identical run; whichever finishes first is used and the other is
+    cancelled. This cuts the tail caused by a single stuck model, search or
+    Maps call, at the cost of the duplicate calls. Streamed runs are not
+    hedged, as the two would interleave their text. A branch that fails is
+    reported like one that timed out, and the keys of all the branches
+    without an answer are listed in MISSING_SECTIONS.
+    """
+
+    branches: dict[str, BaseAgent]
+    timeout_s: float = 120.0
+    branch_timeouts_s: dict[str, float] = {}
+    hedge_quantile: Optional[float] = BRANCH_HEDGE_QUANTILE
+    hedge_min_samples: int = BRANCH_HEDGE_MIN_SAMPLES
+    hedges: int = 0
+    hedge_wins: int = 0
+    _durations: dict[str, deque] = PrivateAttr(default_factory=dict)
+
+    def hedge_after_s(self, output_key: str) -> Optional[float]:
+        """Seconds after which the branch gets a hedged run, or None."""
+        return hedge_after_s(
+            self._durations.get(output_key), self.hedge_quantile, self.hedge_min_samples
+        )
+
+    def _record(self, output_key: str, seconds: float) -> None:
+        self._durations.setdefault(output_key, deque(maxlen=BRANCH_HEDGE_WINDOW)).append(seconds)
+
+    async def _hedged(
+        self, output_key: str, agent: BaseAgent, start: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Runs start(), and once more if the first run is slower than usual."""
+        result, hedged, hedge_won = await run_hedged(
+            start, self.hedge_after_s(output_key), f"[{self.name}] {agent.name}"
+        )
+        self.hedges += hedged
+        self.hedge_wins += hedge_won
+        return result
+
+    async def _run_branch(
+        self,
+        ctx: InvocationContext,
+        output_key: str,
+        agent: BaseAgent,
+        request: str,
+        mux: Optional[SectionMux] = None,
+    ) -> tuple[str, dict, bool]:
+        timeout_s = self.branch_timeouts_s.get(output_key, self.timeout_s)
+
+        async def start() -> tuple[Any, ToolContext]:
+            # Each run, hedged ones included, writes to its own tool context.
+            tool_context = ToolContext(ctx)
+            if mux is None:
+                result = await AgentTool(agent=agent).run_async(
+                    args={"request": request}, tool_context=tool_context
+                )
+            else:
+                result = await run_streaming(agent, request, ctx, tool_context, mux)
+            return result, tool_context
+
+        started = time.perf_counter()
+        state_delta, answered = {}, False
+        try:
+            if mux is None:
+                run = self._hedged(output_key, agent, start)
+            else:
+                run = start()
+            result, tool_context = await asyncio.wait_for(run, timeout_s)
+            state_delta, answered = dict(tool_context.actions.state_delta), True
+            self._record(output_key, time.perf_counter() - started)
+        except asyncio.TimeoutError:
+            logging.info(f"[{self.name}] {agent.name} timed out after {timeout_s}s")
+            result = f"Not available: {agent.name} did not finish within {timeout_s:.0f}s."
+            self._record(output_key, timeout_s)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.warning(f"[{self.name}] {agent.name} failed: {e}")
+            result = f"Not available: {agent.name} failed ({type(e).__name__})."
+        finally:
+            if mux is not None:
+                await mux.finish(agent.name)
+        return _as_text(result), state_delta, answered
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        request = (
+            f"CROP_DETAILS: {_as_text(state.get('CROP_DETAILS'))}\n"
+            f"LOCATION: {_as_text(state.get('LOCATION'))}\n"
+            "Provide your part of the farmer's full advisory report."
+        )
+        streaming = is_streaming(ctx)
+        partials: asyncio.Queue = asyncio.Queue()
+        mux = SectionMux(partials.put) if streaming else None
+        branches = asyncio.gather(
+            *(
+                self._run_branch(ctx, output_key, agent, request, mux)
+                for output_key, agent in self.branches.items()
+            )
+        )
+        branches.add_done_callback(lambda _: partials.put_nowait(None))
+        while (event := await partials.get()) is not None:
+            yield event
+        results = await branches
+        state_delta = {MISSING_SECTIONS_KEY: []}
+        for output_key, (text, branch_delta, answered) in zip(self.branches, results):
+            state_delta.update(branch_delta)
+            state_delta[output_key] = text
+            if not answered:
+                state_delta[MISSING_SECTIONS_KEY].append(output_key)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
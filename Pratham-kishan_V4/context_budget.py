@@ -0,0 +1,110 @@
+import os
+import re
+from typing import Any, Optional
+
+from google.adk.agents.readonly_context import ReadonlyContext
+
+from .loop_control import similarity
+
+CONTEXT_FIELD_TOKENS = int(os.getenv("CONTEXT_FIELD_TOKENS", "300"))
+CONTEXT_DEDUP_SIMILARITY = float(os.getenv("CONTEXT_DEDUP_SIMILARITY", "0.9"))
+CHARS_PER_TOKEN = 4
+
+_PLACEHOLDER = re.compile(r"\{+\s*([\w:]+)(\?)?\s*\}+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _sentences(text: str) -> list[str]:
+    return [s for s in _SENTENCE_END.split(text.strip()) if s]
+
+
+def _dedup(items: list[str], threshold: float) -> list[str]:
+    """Drops items that repeat an earlier one, keeping the later wording."""
+    kept: list[str] = []
+    for item in reversed(items):
+        if not any(similarity(item, other) >= threshold for other in kept):
+            kept.append(item)
+    return kept[::-1]
+
+
+def fit_entries(
+    entries: list[Any], tokens: int, threshold: float = CONTEXT_DEDUP_SIMILARITY
+) -> str:
+    """Renders a list field within `tokens`, newest entries verbatim.
+
+    Repeated entries are dropped first. The newest entries are kept whole for
+    as long as they fit in half the budget; older ones are rolled into a
+    summary of their first sentences that fills what is left, oldest first
+    to go.
+    """
+    limit = tokens * CHARS_PER_TOKEN
+    # Empty and whitespace-only entries have no first sentence to summarise.
+    texts = [str(entry).strip() for entry in entries if entry]
+    items = _dedup([text for text in texts if text], threshold)
+    recent: list[str] = []
+    used = 0
+    while items and (not recent or used + len(items[-1]) <= limit // 2):
+        entry = items.pop()
+        recent.insert(0, entry[: limit // 2] if not recent else entry)
+        used += len(recent[0]) + 1
+    lines = [f"- {entry}" for entry in recent]
+    if items:
+        summary: list[str] = []
+        for entry in reversed(items):
+            sentence = _sentences(entry)[0]
+            if used + len(sentence) + 1 > limit:
+                break
+            summary.insert(0, sentence)
+            used += len(sentence) + 1
+        lines.insert(0, f"- (earlier, {len(items)} entries) {' '.join(summary)}")
+    return "\n".join(lines)
+
+
+def fit_text(text: str, tokens: int, threshold: float = CONTEXT_DEDUP_SIMILARITY) -> str:
+    """Renders a text field within `tokens`, dropping repeated sentences and then the tail."""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    text = " ".join(_dedup(_sentences(text), threshold))
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + f" [... {len(text) - limit} more characters]"
+
+
+class BudgetedInstruction:
+    """Instruction template whose state placeholders are filled within a token budget.
+
+    Use it as an agent's `instruction`. `{{ KEY? }}` placeholders are filled
+    from session state like ADK does, except that list fields go through
+    `fit_entries` and text fields through `fit_text` with `tokens[KEY]` (or
+    `default_tokens`) as their limit, so an instruction stays about the same
+    size however many loop iterations have added to the state.
+    """
+
+    def __init__(
+        self,
+        template: str,
+        tokens: Optional[dict[str, int]] = None,
+        default_tokens: int = CONTEXT_FIELD_TOKENS,
+    ):
+        self.template = template
+        self.tokens = tokens or {}
+        self.default_tokens = default_tokens
+
+    def render(self, state) -> str:
+        def fill(match: re.Match) -> str:
+            key, optional = match.group(1), match.group(2)
+            if key not in state:
+                if optional:
+                    return ""
+                raise KeyError(f"Context variable not found: `{key}`.")
+            value = state[key]
+            tokens = self.tokens.get(key, self.default_tokens)
+            if isinstance(value, list):
+                return fit_entries(value, tokens)
+            return fit_text("" if value is None else str(value), tokens)
+
+        return _PLACEHOLDER.sub(fill, self.template)
+
+    def __call__(self, context: ReadonlyContext) -> str:
+        return self.render(context.state)
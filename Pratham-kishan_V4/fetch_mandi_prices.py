@@ -0,0 +1,89 @@
+"""Downloads today's mandi prices from data.gov.in into the local price store.
+
+    DATA_GOV_IN_API_KEY=... python -m Pratham-kishan_V4.fetch_mandi_prices
+
+Fetches the Agmarknet resource "Current Daily Price of Various Commodities
+from Various Markets (Mandi)" page by page as CSV and writes it to
+MANDI_PRICE_DIR/prices_<date>.csv, where lookup_mandi_prices picks it up
+within MANDI_PRICE_REFRESH_S. Run it once a day, e.g. from cron; running it
+again the same day replaces that day's file. Any other Agmarknet export with
+State, District, Market, Commodity, Variety, Arrival_Date and Min / Max /
+Modal Price columns can be put in the directory as CSV or Parquet as well.
+An API key is free on data.gov.in after signing up.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import urllib.parse
+import urllib.request
+from datetime import date
+
+from .mandi_price_store import MANDI_PRICE_DIR
+
+DATA_GOV_IN_API_KEY = os.getenv("DATA_GOV_IN_API_KEY", "")
+MANDI_PRICE_RESOURCE_ID = os.getenv(
+    "MANDI_PRICE_RESOURCE_ID", "9ef84268-d588-465a-a308-a864a43d0070"
+)
+MANDI_PRICE_PAGE_SIZE = int(os.getenv("MANDI_PRICE_PAGE_SIZE", "5000"))
+
+
+def _page(api_key: str, resource_id: str, offset: int, limit: int, timeout_s: float) -> list[str]:
+    query = urllib.parse.urlencode(
+        {"api-key": api_key, "format": "csv", "offset": offset, "limit": limit}
+    )
+    url = f"https://api.data.gov.in/resource/{resource_id}?{query}"
+    with urllib.request.urlopen(url, timeout=timeout_s) as response:
+        return response.read().decode("utf-8-sig").splitlines()
+
+
+def fetch_daily_prices(
+    api_key: str = DATA_GOV_IN_API_KEY,
+    directory: str = MANDI_PRICE_DIR,
+    resource_id: str = MANDI_PRICE_RESOURCE_ID,
+    page_size: int = MANDI_PRICE_PAGE_SIZE,
+    timeout_s: float = 60.0,
+) -> int:
+    """Writes the resource's current prices to `directory`; returns the number of rows.
+
+    The file is written under a temporary name and renamed when complete, so
+    the store never loads a partial download.
+    """
+    if not api_key:
+        raise ValueError("Set DATA_GOV_IN_API_KEY to a data.gov.in API key")
+    os.makedirs(directory, exist_ok=True)
+    header, rows = None, []
+    while True:
+        lines = _page(api_key, resource_id, len(rows), page_size, timeout_s)
+        if not lines:
+            break
+        header = header or lines[0]
+        rows.extend(line for line in lines[1:] if line.strip())
+        if len(lines) - 1 < page_size:
+            break
+    if not rows:
+        logging.warning(f"[fetch_mandi_prices] no prices in resource {resource_id}")
+        return 0
+    path = os.path.join(directory, f"prices_{date.today().isoformat()}.csv")
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False
+    ) as f:
+        f.write("\n".join([header] + rows) + "\n")
+    os.replace(f.name, path)
+    logging.info(f"[fetch_mandi_prices] wrote {len(rows)} rows to {path}")
+    return len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--api-key", default=DATA_GOV_IN_API_KEY)
+    parser.add_argument("--directory", default=MANDI_PRICE_DIR)
+    parser.add_argument("--resource-id", default=MANDI_PRICE_RESOURCE_ID)
+    parser.add_argument("--page-size", type=int, default=MANDI_PRICE_PAGE_SIZE)
+    args = parser.parse_args()
+    rows = fetch_daily_prices(args.api_key, args.directory, args.resource_id, args.page_size)
+    print(f"{rows} rows written to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
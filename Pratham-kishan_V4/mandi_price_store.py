@@ -0,0 +1,426 @@
+import asyncio
+import csv
+import logging
+import os
+import re
+import threading
+import time
+import warnings
+from datetime import date, datetime
+from typing import Optional
+
+import numpy as np
+
+from .cache_db import CACHE_DIR
+
+# Daily Agmarknet price files (CSV or Parquet). None ship with the package;
+# fetch_mandi_prices downloads them from data.gov.in into this directory.
+MANDI_PRICE_DIR = os.getenv("MANDI_PRICE_DIR", os.path.join(CACHE_DIR, "mandi_prices"))
+MANDI_PRICE_REFRESH_S = float(os.getenv("MANDI_PRICE_REFRESH_S", "300"))
+MANDI_TREND_DAYS = int(os.getenv("MANDI_TREND_DAYS", "30"))
+
+_TEXT_COLUMNS = ("commodity", "state", "district", "market", "variety")
+_PRICE_COLUMNS = ("min_price", "max_price", "modal_price")
+_HEADER_ALIASES = {
+    "market_name": "market",
+    "arrival_date": "date",
+    "price_date": "date",
+    "reported_date": "date",
+}
+_DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%d %b %Y", "%d-%b-%Y")
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def _norm(name: str) -> str:
+    return " ".join(re.findall(r"\w+", name.lower()))
+
+
+def _column_name(header: str) -> str:
+    """Maps Agmarknet / data.gov.in style headers to the store's column names."""
+    name = re.sub(r"[^a-z0-9]+", "_", header.lower().replace("_x0020_", "_")).strip("_")
+    name = _HEADER_ALIASES.get(name, name)
+    for price in _PRICE_COLUMNS:
+        # e.g. "Modal Price (Rs./Quintal)"
+        if name.startswith(price):
+            return price
+    return name
+
+
+def _parse_date(value: str, cache: dict) -> Optional[int]:
+    """Returns the date as a day number since 1970-01-01, or None."""
+    if value in cache:
+        return cache[value]
+    parsed = None
+    for date_format in _DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(value.strip(), date_format).date().toordinal() - _EPOCH
+            break
+        except ValueError:
+            continue
+    cache[value] = parsed
+    return parsed
+
+
+def _parse_price(value) -> float:
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return float("nan")
+
+
+def _read_csv(path: str) -> dict[str, list]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        headers = [_column_name(header) for header in next(reader)]
+        columns = [[] for _ in headers]
+        for row in reader:
+            for column, value in zip(columns, row):
+                column.append(value)
+    return dict(zip(headers, columns))
+
+
+def _read_parquet(path: str) -> dict[str, list]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Loading Parquet price files needs pyarrow installed") from e
+    table = pq.read_table(path)
+    return {
+        _column_name(name): [str(value) for value in column.to_pylist()]
+        for name, column in zip(table.column_names, table.columns)
+    }
+
+
+def _price(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+class MandiPriceStore:
+    """Daily mandi prices held in memory as NumPy columns.
+
+    Rows are indexed by (commodity, state, market) and kept sorted by date, so
+    latest-price and trend queries are a dict lookup plus an array slice. Text
+    columns are stored as integer codes into per-column vocabularies of
+    normalised names. Loading a file that repeats a (commodity, state, market,
+    variety, date) row replaces the earlier price. New rows are appended to
+    the columns and index rather than rebuilding them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._names: dict[str, list[str]] = {column: [] for column in _TEXT_COLUMNS}
+        self._codes: dict[str, dict[str, int]] = {column: {} for column in _TEXT_COLUMNS}
+        self._rows: dict[tuple, int] = {}
+        self._pending: dict[str, list] = {
+            column: [] for column in _TEXT_COLUMNS + ("date",) + _PRICE_COLUMNS
+        }
+        self._loaded_files: dict[str, float] = {}
+        self._last_refresh = 0.0
+        self._refresh_lock = threading.Lock()
+        # Column arrays with room to append; `columns` are views of their
+        # first `_built` rows. Rows re-priced since then are in `_updated`.
+        self._buffers: dict[str, np.ndarray] = {
+            column: np.empty(0, dtype=np.int32) for column in _TEXT_COLUMNS
+        }
+        self._buffers["date"] = np.empty(0, dtype="datetime64[D]")
+        self._buffers.update(
+            {column: np.empty(0, dtype=np.float64) for column in _PRICE_COLUMNS}
+        )
+        self._built = 0
+        self._updated: set[int] = set()
+        self.columns: dict[str, np.ndarray] = {}
+        self._index: dict[tuple[int, int, int], np.ndarray] = {}
+        self._by_commodity: dict[int, list[tuple[int, int, int]]] = {}
+        self._latest: dict[tuple[int, int, int], dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending["date"])
+
+    def _code(self, column: str, value: str) -> int:
+        key = _norm(value)
+        code = self._codes[column].get(key)
+        if code is None:
+            code = self._codes[column][key] = len(self._names[column])
+            self._names[column].append(value.strip())
+        return code
+
+    def add_rows(self, columns: dict[str, list]) -> int:
+        """Adds rows given as {column name: values}; returns how many were kept."""
+        with self._lock:
+            added = self._ingest(columns)
+            self._build()
+        return added
+
+    def _codes_for(self, column: str, values: list[str]) -> list[int]:
+        seen = {}
+        codes = []
+        for value in values:
+            code = seen.get(value)
+            if code is None:
+                code = seen[value] = self._code(column, value)
+            codes.append(code)
+        return codes
+
+    def _ingest(self, columns: dict[str, list]) -> int:
+        missing = {"commodity", "state", "market", "date", "modal_price"} - columns.keys()
+        if missing:
+            raise ValueError(f"Price rows are missing columns: {sorted(missing)}")
+        count = len(columns["date"])
+        date_cache = {}
+        days = [_parse_date(value, date_cache) for value in columns["date"]]
+        codes = [
+            self._codes_for(column, columns.get(column) or [""] * count)
+            for column in _TEXT_COLUMNS
+        ]
+        prices = [
+            [_parse_price(value) for value in columns[column]]
+            if column in columns else [float("nan")] * count
+            for column in _PRICE_COLUMNS
+        ]
+        pending = self._pending
+        pending_text = [pending[column] for column in _TEXT_COLUMNS]
+        pending_prices = [pending[column] for column in _PRICE_COLUMNS]
+        added = 0
+        for i, day in enumerate(days):
+            if day is None:
+                continue
+            row_codes = [column[i] for column in codes]
+            row_prices = [column[i] for column in prices]
+            key = (row_codes[0], row_codes[1], row_codes[3], row_codes[4], day)
+            row = self._rows.get(key)
+            if row is None:
+                self._rows[key] = len(pending["date"])
+                for column, code in zip(pending_text, row_codes):
+                    column.append(code)
+                pending["date"].append(day)
+                for column, price in zip(pending_prices, row_prices):
+                    column.append(price)
+            else:
+                for column, price in zip(pending_prices, row_prices):
+                    column[row] = price
+                if row < self._built:
+                    self._updated.add(row)
+            added += 1
+        return added
+
+    def _build(self) -> None:
+        """Appends the rows ingested since the last build to the columns and index.
+
+        The column arrays grow by doubling, and only the (commodity, state,
+        market) keys with new or re-priced rows are re-indexed and summarised.
+        """
+        pending = self._pending
+        start, count = self._built, len(pending["date"])
+        if start == count and not self._updated:
+            return
+        if count > len(self._buffers["date"]):
+            capacity = max(count, 2 * len(self._buffers["date"]), 1024)
+            for column, buffer in self._buffers.items():
+                grown = np.empty(capacity, dtype=buffer.dtype)
+                grown[:start] = buffer[:start]
+                self._buffers[column] = grown
+        buffers = self._buffers
+        for column in _TEXT_COLUMNS + _PRICE_COLUMNS:
+            buffers[column][start:count] = pending[column][start:]
+        buffers["date"][start:count] = np.asarray(
+            pending["date"][start:], dtype=np.int64
+        ).astype("datetime64[D]")
+        updated = np.fromiter(self._updated, dtype=np.int64, count=len(self._updated))
+        for column in _PRICE_COLUMNS:
+            buffers[column][updated] = [pending[column][row] for row in updated]
+        columns = {column: buffer[:count] for column, buffer in buffers.items()}
+
+        new = np.arange(start, count)
+        order = new[np.lexsort((
+            columns["date"][new], columns["market"][new], columns["state"][new],
+            columns["commodity"][new],
+        ))]
+        keys = np.stack(
+            [columns["commodity"][order], columns["state"][order], columns["market"][order]],
+            axis=1,
+        )
+        starts = np.flatnonzero(np.any(keys[1:] != keys[:-1], axis=1)) + 1
+        index, by_commodity, latest = dict(self._index), dict(self._by_commodity), dict(self._latest)
+        changed = set()
+        for rows in np.split(order, starts) if len(order) else []:
+            key = (
+                int(columns["commodity"][rows[0]]),
+                int(columns["state"][rows[0]]),
+                int(columns["market"][rows[0]]),
+            )
+            known = index.get(key)
+            if known is None:
+                by_commodity[key[0]] = by_commodity.get(key[0], []) + [key]
+            elif columns["date"][rows[0]] >= columns["date"][known[-1]]:
+                # Usually a later day's file: the rows go after the known ones.
+                rows = np.concatenate([known, rows])
+            else:
+                merged = np.concatenate([known, rows])
+                rows = merged[np.argsort(columns["date"][merged], kind="stable")]
+            index[key] = rows
+            changed.add(key)
+        for row in updated:
+            changed.add((
+                int(columns["commodity"][row]), int(columns["state"][row]), int(columns["market"][row])
+            ))
+        for key in changed:
+            latest[key] = self._summarize(columns, key, index[key])
+        self.columns, self._index, self._by_commodity = columns, index, by_commodity
+        self._latest = latest
+        self._built = count
+        self._updated = set()
+
+    def _summarize(self, columns: dict[str, np.ndarray], key: tuple, rows: np.ndarray) -> dict:
+        dates = columns["date"][rows]
+        last = rows[np.searchsorted(dates, dates[-1]):]
+        with warnings.catch_warnings():
+            # All-NaN prices are reported as None.
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return {
+                "market": self._names["market"][key[2]],
+                "district": self._names["district"][columns["district"][last[0]]],
+                "state": self._names["state"][key[1]],
+                "date": str(dates[-1]),
+                "min_price": _price(np.nanmin(columns["min_price"][last])),
+                "max_price": _price(np.nanmax(columns["max_price"][last])),
+                "modal_price": _price(np.nanmean(columns["modal_price"][last])),
+            }
+
+    def load_files(self, paths: list[str]) -> int:
+        """Loads CSV or Parquet price files; returns the number of rows kept."""
+        added = 0
+        with self._lock:
+            for path in paths:
+                if path.endswith(".parquet"):
+                    columns = _read_parquet(path)
+                else:
+                    columns = _read_csv(path)
+                rows = self._ingest(columns)
+                self._loaded_files[path] = os.path.getmtime(path)
+                logging.info(f"[mandi_price_store] loaded {rows} rows from {path}")
+                added += rows
+            self._build()
+        return added
+
+    def load_dir(self, directory: str = MANDI_PRICE_DIR) -> int:
+        """Loads the price files of a directory that are new or changed since last time."""
+        if not os.path.isdir(directory):
+            return 0
+        paths = [
+            os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.endswith((".csv", ".parquet"))
+        ]
+        changed = [
+            path for path in paths
+            if self._loaded_files.get(path) != os.path.getmtime(path)
+        ]
+        return self.load_files(changed) if changed else 0
+
+    def _fresh(self) -> bool:
+        return bool(self._last_refresh) and (
+            time.monotonic() - self._last_refresh < MANDI_PRICE_REFRESH_S
+        )
+
+    def refresh(self, directory: str = MANDI_PRICE_DIR) -> None:
+        """Picks up new daily files at most every MANDI_PRICE_REFRESH_S seconds.
+
+        Loading parses files, so call it off the event loop. Concurrent
+        callers wait for the load in progress instead of starting their own.
+        """
+        if self._fresh():
+            return
+        with self._refresh_lock:
+            if self._fresh():
+                return
+            self.load_dir(directory)
+            self._last_refresh = time.monotonic()
+
+    def _keys(self, commodity: str, state: str = "", market: str = "") -> list[tuple]:
+        commodity_code = self._codes["commodity"].get(_norm(commodity))
+        if commodity_code is None:
+            return []
+        keys = self._by_commodity.get(commodity_code, [])
+        if state:
+            state_code = self._codes["state"].get(_norm(state), -1)
+            keys = [key for key in keys if key[1] == state_code]
+        if market:
+            market_code = self._codes["market"].get(_norm(market), -1)
+            keys = [key for key in keys if key[2] == market_code]
+        return keys
+
+    def latest(
+        self, commodity: str, state: str = "", market: str = "", limit: int = 10
+    ) -> list[dict]:
+        """Latest prices per market in Rs/quintal, best modal price first."""
+        result = [dict(self._latest[key]) for key in self._keys(commodity, state, market)]
+        # Markets whose latest day has no modal price go last.
+        result.sort(
+            key=lambda row: (row["modal_price"] is not None, row["modal_price"] or 0.0),
+            reverse=True,
+        )
+        return result[:limit]
+
+    def trend(
+        self, commodity: str, state: str = "", market: str = "", days: int = MANDI_TREND_DAYS
+    ) -> Optional[dict]:
+        """Average daily modal price over the last `days` days with data.
+
+        Days without a valid modal price are left out; None when no day has one.
+        """
+        keys = self._keys(commodity, state, market)
+        if not keys:
+            return None
+        rows = np.concatenate([self._index[key] for key in keys])
+        dates = self.columns["date"][rows]
+        window = dates > dates.max() - np.timedelta64(days, "D")
+        days_seen, inverse = np.unique(dates[window], return_inverse=True)
+        modal = self.columns["modal_price"][rows[window]]
+        valid = ~np.isnan(modal)
+        totals = np.bincount(inverse[valid], weights=modal[valid], minlength=len(days_seen))
+        counts = np.bincount(inverse[valid], minlength=len(days_seen))
+        priced = counts > 0
+        if not priced.any():
+            return None
+        days_seen = days_seen[priced]
+        daily = totals[priced] / counts[priced]
+        start, end = float(daily[0]), float(daily[-1])
+        return {
+            "from": str(days_seen[0]),
+            "to": str(days_seen[-1]),
+            "start_price": round(start, 2),
+            "end_price": round(end, 2),
+            "change_pct": round((end - start) / start * 100, 1) if start else None,
+            "daily": [[str(day), round(float(price), 2)] for day, price in zip(days_seen, daily)],
+        }
+
+
+price_store = MandiPriceStore()
+
+
+async def lookup_mandi_prices(commodity: str, state: str, market: str) -> dict:
+    """Looks up recent mandi prices from the local price store.
+
+    Args:
+        commodity (str): the crop or commodity, e.g. "Tomato"
+        state (str): the state to search in, or "" for all states
+        market (str): a single market (mandi) name, or "" for all markets
+
+    Returns:
+        dict: the latest prices per market and the recent price trend in
+        Rs/quintal, or status "not_found" when the store has no prices for
+        the commodity.
+    """
+    await asyncio.to_thread(price_store.refresh)
+    latest = price_store.latest(commodity, state, market)
+    if not latest:
+        return {
+            "status": "not_found",
+            "message": f"No local prices for {commodity}; use the mandi_search tool.",
+        }
+    return {
+        "status": "success",
+        "unit": "Rs/quintal",
+        "latest": latest,
+        "trend": price_store.trend(commodity, state, market),
+    }
@@ -0,0 +1,288 @@
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools._gemini_schema_util import _to_gemini_schema
+from google.genai import types
+
+from .route_cache import RouteCache
+
+if TYPE_CHECKING:
+    from mcp import ClientSession, StdioServerParameters
+
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "2"))
+MCP_POOL_CONCURRENCY = int(os.getenv("MCP_POOL_CONCURRENCY", "4"))
+MCP_POOL_PREWARM = os.getenv("MCP_POOL_PREWARM", "1") == "1"
+MCP_POOL_START_TIMEOUT_S = float(os.getenv("MCP_POOL_START_TIMEOUT_S", "60"))
+MCP_POOL_CALL_TIMEOUT_S = float(os.getenv("MCP_POOL_CALL_TIMEOUT_S", "30"))
+MCP_POOL_HEALTH_INTERVAL_S = float(os.getenv("MCP_POOL_HEALTH_INTERVAL_S", "30"))
+
+
+class _Server:
+    """One server process and its MCP session, kept alive by `supervise`."""
+
+    def __init__(self, pool: "McpServerPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.session: Optional["ClientSession"] = None
+        self.slots = asyncio.Semaphore(pool.concurrency)
+        self.in_flight = 0
+        self.calls = 0
+        self.restarts = 0
+        self.restart_requested = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    async def supervise(self) -> None:
+        # mcp takes about a second to import; only pay for it when a server starts.
+        from mcp import ClientSession
+        from mcp.client.stdio import stdio_client
+
+        backoff_s = 1.0
+        while True:
+            try:
+                async with stdio_client(self.pool.stdio_params()) as (read, write):
+                    async with ClientSession(read, write) as session:
+                        await asyncio.wait_for(
+                            session.initialize(), self.pool.start_timeout_s
+                        )
+                        logging.info(f"[mcp_pool] server {self.index} ready")
+                        self.session = session
+                        self.pool.server_ready.set()
+                        backoff_s = 1.0
+                        await self._watch(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"[mcp_pool] server {self.index} failed: {e!r}")
+            self.session = None
+            self.restart_requested.clear()
+            self.restarts += 1
+            await asyncio.sleep(backoff_s)
+            backoff_s = min(backoff_s * 2, 30.0)
+
+    async def _watch(self, session: "ClientSession") -> None:
+        """Returns when the server has to be restarted."""
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self.restart_requested.wait(), self.pool.health_interval_s
+                )
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.wait_for(session.send_ping(), self.pool.call_timeout_s)
+            except Exception as e:
+                logging.warning(f"[mcp_pool] server {self.index} failed health check: {e!r}")
+                return
+
+
+class McpServerPool:
+    """Pre-warmed MCP server processes shared by every session of the app.
+
+    Starting an MCP server through npx costs package resolution plus Node
+    startup, which the per-session MCPToolset pays again and again. The pool
+    starts `size` processes once and keeps them alive on a background event
+    loop. Each process serves at most `concurrency` calls at a time. A process
+    that crashes, fails a call or fails its periodic ping is restarted with
+    backoff, and calls go to the ready process with the fewest calls in flight.
+    `server_params` may be given as a dict of StdioServerParameters fields.
+    """
+
+    def __init__(
+        self,
+        server_params: Union["StdioServerParameters", dict[str, Any]],
+        size: int = MCP_POOL_SIZE,
+        concurrency: int = MCP_POOL_CONCURRENCY,
+        start_timeout_s: float = MCP_POOL_START_TIMEOUT_S,
+        call_timeout_s: float = MCP_POOL_CALL_TIMEOUT_S,
+        health_interval_s: float = MCP_POOL_HEALTH_INTERVAL_S,
+    ):
+        self.server_params = server_params
+        self.size = size
+        self.concurrency = concurrency
+        self.start_timeout_s = start_timeout_s
+        self.call_timeout_s = call_timeout_s
+        self.health_interval_s = health_interval_s
+        self.servers: list[_Server] = []
+        self.server_ready = asyncio.Event()
+        self._tools = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def stdio_params(self) -> "StdioServerParameters":
+        from mcp import StdioServerParameters
+
+        if isinstance(self.server_params, dict):
+            self.server_params = StdioServerParameters(**self.server_params)
+        return self.server_params
+
+    def start(self) -> None:
+        """Starts the server processes in the background; safe to call again."""
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=self._loop.run_forever, name="mcp_pool", daemon=True
+            ).start()
+            self._loop.call_soon_threadsafe(self._spawn)
+            atexit.register(self.close)
+
+    def _spawn(self) -> None:
+        self.server_ready = asyncio.Event()
+        self.servers = [_Server(self, index) for index in range(self.size)]
+        for server in self.servers:
+            server.task = self._loop.create_task(server.supervise())
+
+    def close(self) -> None:
+        """Stops the server processes and the background loop."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        async def stop():
+            tasks = [server.task for server in self.servers]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(stop(), loop).result(timeout=10)
+        except Exception as e:
+            logging.warning(f"[mcp_pool] could not stop servers cleanly: {e!r}")
+        loop.call_soon_threadsafe(loop.stop)
+
+    async def _on_pool_loop(self, coro):
+        self.start()
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, self._loop)
+        )
+
+    async def _acquire(self) -> _Server:
+        while True:
+            ready = [server for server in self.servers if server.session is not None]
+            if ready:
+                return min(ready, key=lambda server: server.in_flight)
+            self.server_ready.clear()
+            await asyncio.wait_for(self.server_ready.wait(), self.start_timeout_s)
+
+    async def _alive(self, session: "ClientSession") -> bool:
+        try:
+            await asyncio.wait_for(session.send_ping(), self.call_timeout_s)
+            return True
+        except Exception:
+            return False
+
+    async def _call(self, method: str, *args):
+        # A call may fail once on every server, e.g. when all of them crashed.
+        attempts = self.size + 1
+        failures = 0
+        while True:
+            server = await self._acquire()
+            server.in_flight += 1
+            session = None
+            try:
+                async with server.slots:
+                    session = server.session
+                    if session is None:
+                        # The server went down while this call was queued.
+                        continue
+                    server.calls += 1
+                    return await asyncio.wait_for(
+                        getattr(session, method)(*args), self.call_timeout_s
+                    )
+            except asyncio.TimeoutError:
+                raise
+            except Exception as e:
+                if server.session is session and await self._alive(session):
+                    raise
+                logging.warning(f"[mcp_pool] {method} failed on server {server.index}: {e!r}")
+                if server.session is session:
+                    server.session = None
+                    server.restart_requested.set()
+                failures += 1
+                if failures == attempts:
+                    raise
+            finally:
+                server.in_flight -= 1
+
+    async def list_tools(self) -> list:
+        """Returns the MCP tools of the server; listed once per pool."""
+        if self._tools is None:
+            result = await self._on_pool_loop(self._call("list_tools"))
+            self._tools = result.tools
+        return self._tools
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]):
+        """Calls an MCP tool on the least busy ready server."""
+        return await self._on_pool_loop(self._call("call_tool", name, arguments))
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "server": server.index,
+                "ready": server.session is not None,
+                "in_flight": server.in_flight,
+                "calls": server.calls,
+                "restarts": server.restarts,
+            }
+            for server in self.servers
+        ]
+
+
+class PooledMcpTool(BaseTool):
+    """An MCP tool whose calls go through an McpServerPool."""
+
+    def __init__(self, pool: McpServerPool, mcp_tool, route_cache: Optional[RouteCache] = None):
+        super().__init__(name=mcp_tool.name, description=mcp_tool.description or "")
+        self.pool = pool
+        self.route_cache = route_cache
+        # mcp 2.x renamed inputSchema to input_schema.
+        self.input_schema = getattr(mcp_tool, "inputSchema", None) or mcp_tool.input_schema
+
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        return types.FunctionDeclaration(
+            name=self.name,
+            description=self.description,
+            parameters=_to_gemini_schema(self.input_schema),
+        )
+
+    async def run_async(self, *, args: dict[str, Any], tool_context) -> Any:
+        if self.route_cache is not None:
+            cached = await self.route_cache.get(self.name, args)
+            if cached is not None:
+                return cached
+        result = await self.pool.call_tool(self.name, args)
+        response = result.model_dump(exclude_none=True, mode="json")
+        if self.route_cache is not None:
+            await self.route_cache.put(self.name, args, response)
+        return response
+
+
+class PooledMcpToolset(BaseToolset):
+    """Drop-in replacement for MCPToolset backed by a shared McpServerPool.
+
+    With a RouteCache, the route tools it covers answer from the cache first.
+    """
+
+    def __init__(self, pool: McpServerPool, route_cache: Optional[RouteCache] = None):
+        super().__init__()
+        self.pool = pool
+        self.route_cache = route_cache
+
+    async def get_tools(self, readonly_context=None) -> list[BaseTool]:
+        return [
+            PooledMcpTool(self.pool, tool, self.route_cache)
+            for tool in await self.pool.list_tools()
+        ]
+
+    async def close(self) -> None:
+        # The pool outlives individual sessions; McpServerPool.close stops it.
+        pass
@@ -0,0 +1,172 @@
+import json
+import logging
+import math
+import os
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+
+from .agent_tree import walk_agents
+
+# Routing config shipped with the package; set MODEL_ROUTING_CONFIG to it (or
+# another config) to route. Unset, every agent keeps the model it was built
+# with, i.e. the MODEL env var.
+DEFAULT_ROUTING_CONFIG = os.path.join(os.path.dirname(__file__), "data", "model_routing.json")
+MODEL_ROUTING_CONFIG = os.getenv("MODEL_ROUTING_CONFIG", "")
+
+_llms: dict[str, BaseLlm] = {}
+
+
+def registry_llm(model: str) -> BaseLlm:
+    """The one LLM client of `model` from the LLM registry, shared by every wrapper."""
+    if model not in _llms:
+        _llms[model] = LLMRegistry.new_llm(model)
+    return _llms[model]
+
+
+def confidence(llm_response: LlmResponse) -> float:
+    """How sure the model was of a response, from 0 to 1.
+
+    Errors, empty answers and answers cut short (max tokens, safety, a
+    malformed function call) count as 0; otherwise the mean token probability,
+    exp(avg_logprobs), when the model reports it, and 1 when it does not.
+    """
+    if llm_response.error_code:
+        return 0.0
+    finish_reason = llm_response.finish_reason
+    if finish_reason not in (None, types.FinishReason.STOP):
+        return 0.0
+    parts = llm_response.content.parts if llm_response.content else None
+    if not parts or not any(part.text or part.function_call for part in parts):
+        return 0.0
+    if llm_response.avg_logprobs is not None:
+        return math.exp(llm_response.avg_logprobs)
+    return 1.0
+
+
+class EscalatingLlm(BaseLlm):
+    """Calls `model` first and `escalate_to` when its answer is not confident enough.
+
+    The first pass runs unary even when the agent streams, since its answer
+    may be thrown away; an escalated call streams as usual. `backend`, when
+    set, serves both models (the request carries the model name), otherwise
+    each model comes from the LLM registry.
+    """
+
+    escalate_to: str
+    min_confidence: float = 0.6
+    backend: Optional[BaseLlm] = None
+    calls: int = 0
+    escalations: int = 0
+
+    def _llm(self, model: str) -> BaseLlm:
+        if self.backend is not None:
+            return self.backend
+        return registry_llm(model)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        llm_request.model = self.model
+        first = None
+        async for response in self._llm(self.model).generate_content_async(llm_request):
+            if not response.partial:
+                first = response
+        score = confidence(first) if first is not None else 0.0
+        if score >= self.min_confidence:
+            yield first
+            return
+        self.escalations += 1
+        logging.info(
+            f"[model_router] {self.model} answered with confidence {score:.2f}, "
+            f"escalating to {self.escalate_to}"
+        )
+        llm_request.model = self.escalate_to
+        async for response in self._llm(self.escalate_to).generate_content_async(
+            llm_request, stream=stream
+        ):
+            yield response
+
+
+class ModelRouter:
+    """Assigns each agent a model by its role, with optional escalation.
+
+    `roles` maps a role to a model and `agents` an agent name to a role (or
+    straight to a model). `escalation` maps a role or an agent name to
+    {"model", "min_confidence"}: such agents get an EscalatingLlm that
+    retries on the larger model when the first answer is not confident
+    enough. Agents the config does not mention keep their model.
+    """
+
+    def __init__(
+        self,
+        roles: dict[str, str],
+        agents: dict[str, str],
+        escalation: Optional[dict[str, dict[str, Any]]] = None,
+        prices_per_million_tokens: Optional[dict[str, dict[str, float]]] = None,
+    ):
+        self.roles = roles
+        self.agents = agents
+        self.escalation = escalation or {}
+        self.prices = prices_per_million_tokens or {}
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_ROUTING_CONFIG) -> "ModelRouter":
+        with open(path, encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def model_for(self, agent_name: str) -> Optional[str]:
+        target = self.agents.get(agent_name)
+        return self.roles.get(target, target)
+
+    def escalation_for(self, agent_name: str) -> Optional[dict[str, Any]]:
+        return self.escalation.get(agent_name) or self.escalation.get(
+            self.agents.get(agent_name)
+        )
+
+    def apply(self, root: BaseAgent) -> None:
+        """Sets the model of every LlmAgent under root that the config routes."""
+        for agent in walk_agents(root):
+            if not isinstance(agent, LlmAgent):
+                continue
+            model = self.model_for(agent.name)
+            if not model:
+                continue
+            rule = self.escalation_for(agent.name)
+            if rule:
+                agent.model = EscalatingLlm(
+                    model=model,
+                    escalate_to=rule["model"],
+                    min_confidence=rule.get("min_confidence", 0.6),
+                )
+            else:
+                agent.model = model
+
+    def price(self, model: str) -> dict[str, float]:
+        """Price of `model`, or of the longest priced name it extends ("gemini-2.0-flash-001")."""
+        if model in self.prices:
+            return self.prices[model]
+        names = [name for name in self.prices if model.startswith(name)]
+        return self.prices[max(names, key=len)] if names else {}
+
+    def cost(self, model: str, prompt_tokens: int, output_tokens: int) -> float:
+        """USD for one call, 0 for models without a price."""
+        price = self.price(model)
+        return (
+            prompt_tokens * price.get("input", 0.0)
+            + output_tokens * price.get("output", 0.0)
+        ) / 1_000_000
+
+
+def route_from_env(root: BaseAgent) -> Optional[ModelRouter]:
+    """Applies the MODEL_ROUTING_CONFIG routing to root, if one is configured."""
+    if not MODEL_ROUTING_CONFIG:
+        return None
+    router = ModelRouter.load(MODEL_ROUTING_CONFIG)
+    router.apply(root)
+    logging.info(f"[model_router] routing {len(router.agents)} agents from {MODEL_ROUTING_CONFIG}")
+    return router
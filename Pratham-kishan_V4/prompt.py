@@ -72,6 +72,13 @@ Prompt the user to provide their specific farming location (e.g., village, distr
 Prompt the user to specify the duration for the forecast (e.g., next 3 days, next week).
 Action: Call the weather_information subagent, providing all the listed inputs.
 Expected Output: The weather_information subagent MUST provide a detailed weather forecast relevant to the farming location and specified duration, including temperature, rainfall, and other relevant meteorological data.
+Output the generated extended version by visualizing the results as markdown
+
+* Full Advisory Report (Subagent: full_report_agent)
+
+Input: The crop details and location already collected (CROP_DETAILS and LOCATION state keys).
+Action: When the user asks for a complete report covering everything, call the full_report_agent subagent instead of the individual subagents above.
+Expected Output: The full_report_agent subagent MUST return one markdown report with crop management, weather, farming technology, government scheme and mandi price sections.
 Output the generated extended version by visualizing the results as markdown"""
 
 SIMPLE_AGENT= """
@@ -0,0 +1,304 @@
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional, TypeVar
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+
+from .agent_tree import walk_agents
+from .model_router import EscalatingLlm, registry_llm
+
+# Empty disables scheduling: model and search calls go out as they are made.
+RATE_LIMIT_CONFIG = os.getenv(
+    "RATE_LIMIT_CONFIG", os.path.join(os.path.dirname(__file__), "data", "rate_limits.json")
+)
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "5"))
+RATE_LIMIT_BACKOFF_S = float(os.getenv("RATE_LIMIT_BACKOFF_S", "1.0"))
+RATE_LIMIT_MAX_BACKOFF_S = float(os.getenv("RATE_LIMIT_MAX_BACKOFF_S", "30.0"))
+
+# Priority classes, lower goes first.
+INTERACTIVE = 0
+BATCH = 1
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "request_priority", default=INTERACTIVE
+)
+
+T = TypeVar("T")
+
+
+@contextlib.contextmanager
+def request_priority(priority: int):
+    """Runs the calls made inside the block, and in tasks started from it, at `priority`."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True for quota (429) and server (5xx) errors of the genai client or an HTTP library."""
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if not isinstance(code, int):
+        response = getattr(error, "response", None)
+        code = getattr(response, "status_code", None)
+    return isinstance(code, int) and (code == 429 or 500 <= code < 600)
+
+
+class TokenBucket:
+    """`rate_per_s` tokens a second, up to `burst` saved for bursts."""
+
+    def __init__(self, rate_per_s: float, burst: float):
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate_per_s)
+        self.updated = now
+
+    def take(self) -> float:
+        """Takes a token and returns 0, or returns the seconds until one is available."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate_per_s
+
+    def give_back(self) -> None:
+        """Returns a taken token that was not used, without exceeding `burst`."""
+        self._refill()
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    def drain(self) -> None:
+        """Empties the bucket, e.g. after the backend said the quota is used up."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class _Lane:
+    """The bucket of one model or tool and the calls waiting for it, by priority."""
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.waiting: list[tuple[int, int, asyncio.Future]] = []
+        self.dispatcher: Optional[asyncio.Task] = None
+        self.stats = {
+            "granted": 0, "throttled": 0, "retries": 0, "failed": 0,
+            "max_depth": 0, "wait_s": 0.0,
+        }
+
+    def depth(self) -> dict[int, int]:
+        depth: dict[int, int] = {}
+        for priority, _, future in self.waiting:
+            if not future.done():
+                depth[priority] = depth.get(priority, 0) + 1
+        return depth
+
+
+class RequestScheduler:
+    """Paces model and tool calls by token buckets, highest priority first.
+
+    Every call names a key such as "model:gemini-2.0-flash-001" or
+    "tool:google_search"; its bucket comes from `limits`, matched on the
+    longest configured prefix of the key, or from "default". Callers wait in
+    one queue per key, interactive farmer turns ahead of batch jobs (see
+    request_priority), and a single dispatcher per key hands out tokens as
+    the bucket refills. A call failing with 429 or 5xx is retried after a
+    jittered exponential backoff, at most `max_retries` times; a 429 also
+    empties the bucket so the calls queued behind it slow down too.
+
+    Args:
+        limits: key prefix -> {"rate_per_s", "burst"}.
+        max_retries: Retries of a call after the first attempt.
+        backoff_s: Backoff before the first retry, doubled for every next one.
+        max_backoff_s: Cap on a single backoff.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, dict[str, float]],
+        max_retries: int = RATE_LIMIT_MAX_RETRIES,
+        backoff_s: float = RATE_LIMIT_BACKOFF_S,
+        max_backoff_s: float = RATE_LIMIT_MAX_BACKOFF_S,
+    ):
+        self.limits = limits
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self._lanes: dict[str, _Lane] = {}
+        self._order = itertools.count()
+
+    @classmethod
+    def load(cls, path: str = RATE_LIMIT_CONFIG) -> "RequestScheduler":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["limits"])
+
+    def _lane(self, key: str) -> _Lane:
+        lane = self._lanes.get(key)
+        if lane is None:
+            names = [name for name in self.limits if key.startswith(name)]
+            limit = self.limits[max(names, key=len)] if names else self.limits["default"]
+            bucket = TokenBucket(limit["rate_per_s"], limit.get("burst", limit["rate_per_s"]))
+            lane = self._lanes[key] = _Lane(bucket)
+        return lane
+
+    async def _dispatch(self, lane: _Lane) -> None:
+        while lane.waiting:
+            wait_s = lane.bucket.take()
+            if wait_s:
+                await asyncio.sleep(wait_s)
+                continue
+            while lane.waiting:
+                _, _, future = heapq.heappop(lane.waiting)
+                if not future.done():
+                    future.set_result(None)
+                    lane.stats["granted"] += 1
+                    break
+            else:
+                # Everyone waiting was cancelled; give the token back.
+                lane.bucket.give_back()
+        lane.dispatcher = None
+
+    async def acquire(self, key: str, priority: Optional[int] = None) -> None:
+        """Waits for a token of `key`'s bucket."""
+        lane = self._lane(key)
+        priority = _priority.get() if priority is None else priority
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(lane.waiting, (priority, next(self._order), future))
+        lane.stats["max_depth"] = max(lane.stats["max_depth"], len(lane.waiting))
+        if lane.dispatcher is None or lane.dispatcher.done():
+            lane.dispatcher = asyncio.create_task(self._dispatch(lane))
+        started = time.monotonic()
+        try:
+            await future
+        finally:
+            lane.stats["wait_s"] += time.monotonic() - started
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff_s, self.backoff_s * 2 ** attempt))
+
+    async def _failed(self, key: str, error: Exception, attempt: int) -> None:
+        """Backs off after a retryable failure, or re-raises it."""
+        lane = self._lane(key)
+        if getattr(error, "code", None) == 429:
+            lane.stats["throttled"] += 1
+            lane.bucket.drain()
+        if not is_retryable(error) or attempt >= self.max_retries:
+            lane.stats["failed"] += 1
+            raise error
+        lane.stats["retries"] += 1
+        delay_s = self._backoff(attempt)
+        logging.info(f"[rate_limits] {key} failed with {error}, retrying in {delay_s:.1f}s")
+        await asyncio.sleep(delay_s)
+
+    async def call(
+        self, key: str, fn: Callable[[], Awaitable[T]], priority: Optional[int] = None
+    ) -> T:
+        """Calls `fn` when `key`'s bucket allows, retrying quota and server errors."""
+        for attempt in itertools.count():
+            await self.acquire(key, priority)
+            try:
+                return await fn()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                await self._failed(key, e, attempt)
+
+    async def stream(
+        self,
+        key: str,
+        fn: Callable[[], AsyncGenerator[T, None]],
+        priority: Optional[int] = None,
+    ) -> AsyncGenerator[T, None]:
+        """Like call, for a generator; it is only retried if it failed before yielding."""
+        for attempt in itertools.count():
+            await self.acquire(key, priority)
+            yielded = False
+            try:
+                async for item in fn():
+                    yielded = True
+                    yield item
+                return
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                if yielded:
+                    raise
+                await self._failed(key, e, attempt)
+
+    def wrap(self, key: str, fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        """`fn` with every call going through `call`, e.g. a search backend."""
+
+        async def scheduled(*args, **kwargs) -> T:
+            return await self.call(key, lambda: fn(*args, **kwargs))
+
+        return scheduled
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per key: calls granted, 429s, retries, failures, queue depth now and at most, wait."""
+        return {
+            key: {**lane.stats, "depth": lane.depth()}
+            for key, lane in self._lanes.items()
+        }
+
+
+class ScheduledLlm(BaseLlm):
+    """Sends every call through a RequestScheduler, keyed on the request's model.
+
+    `backend`, when set, serves the calls, otherwise the model comes from the
+    LLM registry; as for EscalatingLlm the request carries the model name.
+    """
+
+    scheduler: Any
+    backend: Optional[BaseLlm] = None
+
+    def _llm(self, model: str) -> BaseLlm:
+        return self.backend or registry_llm(model)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        model = llm_request.model or self.model
+        llm_request.model = model
+
+        def call():
+            return self._llm(model).generate_content_async(llm_request, stream=stream)
+
+        async for response in self.scheduler.stream(f"model:{model}", call):
+            yield response
+
+
+def schedule(root: BaseAgent, scheduler: RequestScheduler) -> None:
+    """Routes the model calls of every LlmAgent under root through `scheduler`."""
+    for agent in walk_agents(root):
+        if not isinstance(agent, LlmAgent):
+            continue
+        model = agent.model
+        if isinstance(model, ScheduledLlm):
+            continue
+        if isinstance(model, EscalatingLlm):
+            # Both of its models go through the scheduler, each on its own key.
+            model.backend = ScheduledLlm(
+                model=model.model, scheduler=scheduler, backend=model.backend
+            )
+        elif isinstance(model, str) and model:
+            agent.model = ScheduledLlm(model=model, scheduler=scheduler)
+        elif isinstance(model, BaseLlm):
+            agent.model = ScheduledLlm(model=model.model, scheduler=scheduler, backend=model)
+
+
+def schedule_from_env(root: BaseAgent) -> Optional[RequestScheduler]:
+    """Schedules root's model calls under the RATE_LIMIT_CONFIG limits, if configured."""
+    if not RATE_LIMIT_CONFIG:
+        return None
+    scheduler = RequestScheduler.load(RATE_LIMIT_CONFIG)
+    schedule(root, scheduler)
+    return scheduler
@@ -0,0 +1,350 @@
+import datetime
+import inspect
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from .agent_tree import add_callback
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.85"))
+RESPONSE_CACHE_EMBEDDING_MODEL = os.getenv("RESPONSE_CACHE_EMBEDDING_MODEL")
+RESPONSE_CACHE_DIM = 512
+
+KEY_FIELDS = ("crop", "stage", "district", "season")
+
+_CROPS = {
+    "tomato": "tomato", "tomatoes": "tomato", "onion": "onion", "onions": "onion",
+    "potato": "potato", "potatoes": "potato", "rice": "rice", "paddy": "rice",
+    "wheat": "wheat", "maize": "maize", "corn": "maize", "cotton": "cotton",
+    "sugarcane": "sugarcane", "groundnut": "groundnut", "peanut": "groundnut",
+    "soybean": "soybean", "soya": "soybean", "chilli": "chilli", "chili": "chilli",
+    "ragi": "ragi", "bajra": "bajra", "jowar": "jowar", "banana": "banana",
+    "mango": "mango", "brinjal": "brinjal", "eggplant": "brinjal", "cabbage": "cabbage",
+    "turmeric": "turmeric", "mustard": "mustard", "tur": "tur", "arhar": "tur",
+}
+_STAGES = {
+    "nursery": "seedling", "seedling": "seedling", "sowing": "sowing", "planting": "sowing",
+    "germination": "sowing", "vegetative": "vegetative", "tillering": "vegetative",
+    "flowering": "flowering", "bloom": "flowering", "fruiting": "fruiting",
+    "fruit set": "fruiting", "grain filling": "fruiting", "maturity": "harvest",
+    "harvest": "harvest", "harvesting": "harvest",
+}
+_STAGE = re.compile(r"\b(" + "|".join(sorted(_STAGES, key=len, reverse=True)) + r")\b")
+_PLACE = re.compile(r"\b(?:in|at|near|from)\s+([A-Z][\w-]+)")
+
+
+def _as_text(value) -> str:
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return "" if value is None else str(value)
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def season(month: int) -> str:
+    """Indian cropping season for a month: kharif Jun-Oct, rabi Nov-Mar, zaid Apr-May."""
+    if 6 <= month <= 10:
+        return "kharif"
+    if month in (4, 5):
+        return "zaid"
+    return "rabi"
+
+
+def canonical_key(crop_details: str, location: str, month: int) -> dict[str, str]:
+    """Reduces free-text CROP_DETAILS and LOCATION to (crop, stage, district, season).
+
+    The crop is the first known crop name (paddy and rice are the same crop),
+    or the first comma-separated part of the details; the district is the first
+    part of the location, or the place after "in"/"near" when the details are
+    all there is.
+    """
+    words = _words(crop_details)
+    crop = next((_CROPS[word] for word in words if word in _CROPS), "")
+    if not crop and crop_details:
+        crop = " ".join(_words(crop_details.split(",")[0]))
+    stage = _STAGE.search(" ".join(words))
+    if location.strip():
+        district = " ".join(_words(location.split(",")[0]))
+    else:
+        place = _PLACE.search(crop_details)
+        district = place.group(1).lower() if place else ""
+    return {
+        "crop": crop,
+        "stage": _STAGES[stage.group(1)] if stage else "",
+        "district": district,
+        "season": season(month),
+    }
+
+
+def hashed_embedding(text: str, dim: int = RESPONSE_CACHE_DIM) -> np.ndarray:
+    """Unit-length bag of words and word pairs, hashed into `dim` buckets.
+
+    Enough to match rephrasings of the same question without a model call.
+    """
+    words = _words(text)
+    vector = np.zeros(dim, dtype=np.float32)
+    for term in words + [a + " " + b for a, b in zip(words, words[1:])]:
+        h = zlib.crc32(term.encode())
+        vector[h % dim] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def genai_embedding(model: str):
+    """Returns an async embedder backed by a Gemini embedding model."""
+    from google import genai
+
+    client = genai.Client()
+
+    async def embed(text: str) -> np.ndarray:
+        result = await client.aio.models.embed_content(model=model, contents=text)
+        vector = np.asarray(result.embeddings[0].values, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+    return embed
+
+
+@dataclass
+class _Entry:
+    bucket: tuple
+    text: str
+    vector: np.ndarray
+    created: float
+    ttl_s: float
+    latency_s: float
+    size: int
+
+
+@dataclass
+class _Pending:
+    bucket: tuple
+    request: str
+    vector: np.ndarray
+    ttl_s: float
+    started: float
+    text: str = ""
+
+
+class ResponseCache:
+    """In-process cache of sub-agent answers, shared by all sessions.
+
+    An answer is filed under its agent and the agent's `fields` of the
+    canonical (crop, stage, district, season) key, and within that bucket under
+    the request text. A request is answered from the cache when the bucket
+    holds a fresh answer to the same request, or to one whose embedding has a
+    cosine similarity of at least `similarity` with it. The least recently used
+    answers are evicted once there are more than `max_entries` of them or they
+    take more than `max_bytes`.
+
+    Use `attach` to put an agent behind the cache; a hit skips the agent and
+    returns the cached answer as its reply.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        similarity: float = RESPONSE_CACHE_SIMILARITY,
+        embed=None,
+        clock=time.time,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.similarity = similarity
+        if embed is None:
+            embed = (
+                genai_embedding(RESPONSE_CACHE_EMBEDDING_MODEL)
+                if RESPONSE_CACHE_EMBEDDING_MODEL
+                else hashed_embedding
+            )
+        self.embed = embed
+        self.clock = clock
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_latency_s = 0.0
+        self.bytes = 0
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._buckets: dict[tuple, set[tuple]] = {}
+        self._pending: dict[tuple, _Pending] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, bucket: tuple, request: str, vector: np.ndarray) -> Optional[str]:
+        now = self.clock()
+        with self._lock:
+            key = bucket + (" ".join(_words(request)),)
+            entry = self._fresh(key, now)
+            semantic = False
+            if entry is None:
+                keys = [k for k in list(self._buckets.get(bucket, ())) if self._fresh(k, now)]
+                if keys:
+                    scores = np.stack([self._entries[k].vector for k in keys]) @ vector
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.similarity:
+                        key, entry, semantic = keys[best], self._entries[keys[best]], True
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.semantic_hits += semantic
+            self.saved_latency_s += entry.latency_s
+        logging.info(
+            f"[response_cache] {'semantic ' if semantic else ''}hit for {bucket}, "
+            f"saved {entry.latency_s:.1f}s"
+        )
+        return entry.text
+
+    def put(
+        self, bucket: tuple, request: str, vector: np.ndarray, text: str,
+        ttl_s: float, latency_s: float = 0.0,
+    ) -> None:
+        key = bucket + (" ".join(_words(request)),)
+        entry = _Entry(bucket, text, vector, self.clock(), ttl_s, latency_s, len(text.encode()))
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._buckets.setdefault(bucket, set()).add(key)
+            self.bytes += entry.size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self.bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drops every answer and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._pending.clear()
+            self.bytes = 0
+            self.hits = self.semantic_hits = self.misses = self.evictions = 0
+            self.saved_latency_s = 0.0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_latency_s": self.saved_latency_s,
+            "evictions": self.evictions,
+        }
+
+    def attach(self, agent: BaseAgent, ttl_s: float, fields: tuple[str, ...] = KEY_FIELDS) -> None:
+        """Answers `agent` from the cache, storing its answers for `ttl_s` seconds.
+
+        `fields` are the parts of the canonical key the agent's answer depends
+        on, e.g. farming technology does not change from one district to the next.
+        """
+        add_callback(
+            agent,
+            "before_agent_callback",
+            self._before_agent(ttl_s, fields, getattr(agent, "output_key", None)),
+        )
+        add_callback(agent, "after_model_callback", self._after_model)
+        add_callback(agent, "after_agent_callback", self._after_agent)
+
+    def _fresh(self, key: tuple, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now - entry.created > entry.ttl_s:
+            self._remove(key)
+            return None
+        return entry
+
+    async def _embed(self, text: str) -> np.ndarray:
+        vector = self.embed(text)
+        return await vector if inspect.isawaitable(vector) else vector
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+            self._buckets[entry.bucket].discard(key)
+
+    def _before_agent(self, ttl_s: float, fields: tuple[str, ...], output_key: Optional[str]):
+        async def before_agent(callback_context: CallbackContext) -> Optional[types.Content]:
+            state = callback_context.state
+            request = "".join(
+                part.text or ""
+                for part in getattr(callback_context.user_content, "parts", None) or []
+            )
+            key = canonical_key(
+                _as_text(state.get("CROP_DETAILS")) or request,
+                _as_text(state.get("LOCATION")),
+                datetime.date.fromtimestamp(self.clock()).month,
+            )
+            bucket = (callback_context.agent_name,) + tuple(key[field] for field in fields)
+            self._drop_abandoned()
+            try:
+                vector = await self._embed(request)
+            except Exception as e:
+                # The agent answers uncached rather than failing with the lookup.
+                logging.warning(f"[response_cache] embedding failed for {bucket}: {e}")
+                return None
+            text = self.get(bucket, request, vector)
+            if text is not None:
+                if output_key:
+                    state[output_key] = text
+                return types.Content(role="model", parts=[types.Part(text=text)])
+            self._pending[(callback_context.invocation_id, callback_context.agent_name)] = _Pending(
+                bucket, request, vector, ttl_s, time.perf_counter()
+            )
+            return None
+
+        return before_agent
+
+    def _drop_abandoned(self) -> None:
+        # A run that raised never reaches after_agent; its answer would be
+        # stale by the time it is past its TTL, so drop it then.
+        now = time.perf_counter()
+        for key, pending in list(self._pending.items()):
+            if now - pending.started > pending.ttl_s:
+                del self._pending[key]
+
+    def _after_model(self, callback_context: CallbackContext, llm_response: LlmResponse):
+        pending = self._pending.get((callback_context.invocation_id, callback_context.agent_name))
+        if pending is None or not llm_response.content or llm_response.partial:
+            return None
+        parts = llm_response.content.parts or []
+        if not any(part.function_call for part in parts):
+            pending.text = "".join(part.text or "" for part in parts if not part.thought)
+        return None
+
+    def _after_agent(self, callback_context: CallbackContext) -> None:
+        pending = self._pending.pop(
+            (callback_context.invocation_id, callback_context.agent_name), None
+        )
+        if pending is not None and pending.text:
+            self.put(
+                pending.bucket, pending.request, pending.vector, pending.text,
+                pending.ttl_s, time.perf_counter() - pending.started,
+            )
+        return None
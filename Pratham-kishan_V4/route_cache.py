@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Optional
+
+from .cache_db import CACHE_DIR, open_cache_db
+
+ROUTE_CACHE_PATH = os.getenv("ROUTE_CACHE_PATH", os.path.join(CACHE_DIR, "route_cache.sqlite"))
+ROUTE_CACHE_TTL_S = float(os.getenv("ROUTE_CACHE_TTL_S", str(7 * 24 * 3600)))
+ROUTE_CACHE_GEOHASH_PRECISION = int(os.getenv("ROUTE_CACHE_GEOHASH_PRECISION", "6"))
+ROUTE_CACHE_TOOLS = ("maps_directions", "maps_distance_matrix")
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_LAT_LNG = re.compile(r"^\s*(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)\s*$")
+# Words that do not change which place an address names.
+_FILLER_WORDS = {"india", "district", "dist", "taluk", "taluka", "tehsil"}
+
+
+def geohash(lat: float, lng: float, precision: int) -> str:
+    """Encodes a coordinate as a geohash; precision 6 is a cell of about 1.2 x 0.6 km."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        coordinate, bounds = (lng, lng_range) if even else (lat, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def normalize_location(location: str, precision: int = ROUTE_CACHE_GEOHASH_PRECISION) -> str:
+    """Maps spellings of the same place, or nearby coordinates, to one key.
+
+    "lat,lng" strings become their geohash cell, so farmers a few hundred metres
+    apart share a route. Place names are reduced to their set of words, without
+    punctuation, case or words such as "district" and "India", so "Kolar,
+    Karnataka" and "Karnataka - Kolar District" share one. Place names are not
+    geocoded: two villages a kilometre apart, or a village and its district,
+    are still separate entries.
+    """
+    match = _LAT_LNG.match(location)
+    if match:
+        return "geo:" + geohash(float(match.group(1)), float(match.group(2)), precision)
+    words = set(re.findall(r"\w+", location.lower())) - _FILLER_WORDS
+    return " ".join(sorted(words))
+
+
+def _normalize(value: Any, precision: int) -> Any:
+    if isinstance(value, str):
+        return normalize_location(value, precision)
+    if isinstance(value, list):
+        return [_normalize(item, precision) for item in value]
+    return value
+
+
+class RouteCache:
+    """On-disk cache of Maps route answers, shared by all sessions.
+
+    PooledMcpToolset checks it before calling the Maps server: a fresh entry for
+    the normalised arguments answers the call without a Maps round trip, and
+    successful answers of the `tools` it covers are stored for `ttl_s` seconds.
+    The database at `path` is opened on first use, and its queries run in a
+    worker thread so they do not block the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str = ROUTE_CACHE_PATH,
+        ttl_s: float = ROUTE_CACHE_TTL_S,
+        precision: int = ROUTE_CACHE_GEOHASH_PRECISION,
+        tools: tuple[str, ...] = ROUTE_CACHE_TOOLS,
+    ):
+        self.ttl_s = ttl_s
+        self.precision = precision
+        self.tools = tools
+        self.hits = 0
+        self.misses = 0
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connection(self):
+        # Called with the lock held.
+        if self._db is None:
+            self._db = open_cache_db(
+                self.path,
+                "CREATE TABLE IF NOT EXISTS routes "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)",
+            )
+        return self._db
+
+    def key(self, tool_name: str, args: dict[str, Any]) -> str:
+        normalized = {name: _normalize(value, self.precision) for name, value in args.items()}
+        return f"{tool_name}:{json.dumps(normalized, sort_keys=True)}"
+
+    async def get(self, tool_name: str, args: dict[str, Any]) -> Optional[dict]:
+        if tool_name not in self.tools:
+            return None
+        row = await asyncio.to_thread(self._select, self.key(tool_name, args))
+        if row is None or time.time() - row[1] > self.ttl_s:
+            self.misses += 1
+            return None
+        self.hits += 1
+        logging.info(f"[route_cache] hit for {tool_name} {args}")
+        return json.loads(row[0])
+
+    async def put(self, tool_name: str, args: dict[str, Any], response: dict) -> None:
+        if tool_name not in self.tools or response.get("isError"):
+            return
+        await asyncio.to_thread(self._insert, self.key(tool_name, args), json.dumps(response))
+
+    async def purge_expired(self) -> int:
+        return await asyncio.to_thread(self._delete_expired)
+
+    def _select(self, key: str) -> Optional[tuple[str, float]]:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT response, created FROM routes WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _insert(self, key: str, response: str) -> None:
+        with self._lock:
+            db = self._connection()
+            db.execute(
+                "INSERT OR REPLACE INTO routes (key, response, created) VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+            db.commit()
+
+    def _delete_expired(self) -> int:
+        with self._lock:
+            db = self._connection()
+            deleted = db.execute(
+                "DELETE FROM routes WHERE created < ?", (time.time() - self.ttl_s,)
+            ).rowcount
+            db.commit()
+        return deleted
@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import re
+from typing import Any, Optional
+
+SCHEME_CATALOGUE_PATH = os.getenv(
+    "SCHEME_CATALOGUE_PATH", os.path.join(os.path.dirname(__file__), "data", "schemes.json")
+)
+
+# Catalogue fields a scheme can be looked up by. A scheme lists the terms it
+# applies to, or "all" when it is not restricted on that field.
+INDEXED_FIELDS = ("crops", "states", "farmer_categories", "benefit_types")
+ANY = "all"
+# Schemes find_schemes returns of each kind, specific and general.
+MAX_SCHEMES = 5
+
+_SYNONYMS = {
+    "crops": {"paddy": "rice", "maize": "corn", "groundnut": "peanut", "bajra": "pearl millet", "ragi": "finger millet"},
+    "farmer_categories": {"smallholder": "small", "marginal farmer": "marginal", "small farmer": "small", "woman": "women", "female": "women", "tenant farmer": "tenant"},
+    "benefit_types": {"grant": "subsidy", "loan": "credit", "crop insurance": "insurance", "income": "income support"},
+}
+
+
+def _term(field: str, value: str) -> str:
+    term = " ".join(re.findall(r"\w+", value.lower()))
+    return _SYNONYMS.get(field, {}).get(term, term)
+
+
+def _benefit_value(scheme: dict) -> float:
+    benefit = scheme.get("benefit", {})
+    return float(benefit.get("max_amount_inr") or benefit.get("amount_inr") or 0)
+
+
+class SchemeCatalogue:
+    """Government schemes with an inverted index over the INDEXED_FIELDS.
+
+    `index[field][term]` is the set of schemes listing that term; schemes that
+    list "all" sit under ANY and match every term. A search keeps the schemes
+    that match every given field and ranks those matching specifically (e.g.
+    the crop "tomato" rather than "all" crops) first, then by benefit amount.
+    """
+
+    def __init__(self, schemes: Optional[list[dict]] = None):
+        self.schemes: dict[str, dict] = {}
+        self.index: dict[str, dict[str, set[str]]] = {field: {} for field in INDEXED_FIELDS}
+        for scheme in schemes or []:
+            self.add(scheme)
+
+    @classmethod
+    def load(cls, path: str = SCHEME_CATALOGUE_PATH) -> "SchemeCatalogue":
+        """Loads a catalogue from a JSON or YAML file with a list of schemes."""
+        with open(path, encoding="utf-8") as f:
+            if path.endswith((".yaml", ".yml")):
+                import yaml
+
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+        schemes = data["schemes"] if isinstance(data, dict) else data
+        logging.info(f"[scheme_catalogue] loaded {len(schemes)} schemes from {path}")
+        return cls(schemes)
+
+    def __len__(self) -> int:
+        return len(self.schemes)
+
+    def add(self, scheme: dict) -> None:
+        scheme_id = scheme["id"]
+        self.schemes[scheme_id] = scheme
+        for field in INDEXED_FIELDS:
+            for value in scheme.get(field) or [ANY]:
+                self.index[field].setdefault(_term(field, value), set()).add(scheme_id)
+
+    def search(self, limit: int = 5, **criteria: str) -> list[tuple[dict, int]]:
+        """Returns (scheme, score) pairs for criteria such as crops="tomato".
+
+        The score counts the fields matched specifically rather than through
+        "all"; empty criteria are ignored.
+        """
+        scores = {scheme_id: 0 for scheme_id in self.schemes}
+        for field, value in criteria.items():
+            if not value:
+                continue
+            postings = self.index[field]
+            specific = postings.get(_term(field, value), set())
+            allowed = specific | postings.get(ANY, set())
+            scores = {
+                scheme_id: score + (scheme_id in specific)
+                for scheme_id, score in scores.items()
+                if scheme_id in allowed
+            }
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (item[1], _benefit_value(self.schemes[item[0]])),
+            reverse=True,
+        )
+        return [(self.schemes[scheme_id], score) for scheme_id, score in ranked[:limit]]
+
+
+_catalogue: Optional[SchemeCatalogue] = None
+
+
+def get_catalogue() -> SchemeCatalogue:
+    global _catalogue
+    if _catalogue is None:
+        _catalogue = (
+            SchemeCatalogue.load()
+            if os.path.exists(SCHEME_CATALOGUE_PATH)
+            else SchemeCatalogue()
+        )
+    return _catalogue
+
+
+def _describe(scheme: dict) -> dict[str, Any]:
+    return {
+        "name": scheme["name"],
+        "benefit": scheme.get("benefit", {}),
+        "eligibility": scheme.get("eligibility", ""),
+        "how_to_apply": scheme.get("how_to_apply", ""),
+    }
+
+
+def find_schemes(
+    crop: str, state: str, farmer_category: str, benefit_type: str
+) -> dict[str, Any]:
+    """Finds government schemes for a farmer in the local scheme catalogue.
+
+    Schemes open to every crop, state, category and benefit type match any
+    search; they are listed separately as general_schemes.
+
+    Args:
+        crop (str): the crop, e.g. "tomato", or "" for any crop
+        state (str): the farmer's state, e.g. "Karnataka", or "" for any state
+        farmer_category (str): e.g. "small", "marginal", "women", "tenant", or "" for any
+        benefit_type (str): e.g. "subsidy", "insurance", "credit", "income support", or "" for any
+
+    Returns:
+        dict[str, Any]: the best schemes specific to the search, with their
+        benefit amounts and how to apply, and the general schemes; or status
+        "not_found" with only the general schemes when the catalogue has none
+        specific to the search.
+    """
+    catalogue = get_catalogue()
+    matches = catalogue.search(
+        limit=len(catalogue),
+        crops=crop,
+        states=state,
+        farmer_categories=farmer_category,
+        benefit_types=benefit_type,
+    )
+    specific = [
+        dict(_describe(scheme), specific_matches=score) for scheme, score in matches if score
+    ][:MAX_SCHEMES]
+    general = [_describe(scheme) for scheme, score in matches if not score][:MAX_SCHEMES]
+    if not specific:
+        return {
+            "status": "not_found",
+            "message": (
+                "No scheme in the catalogue is specific to this search; use the scheme_search "
+                "tool. The general_schemes are open to every farmer."
+            ),
+            "general_schemes": general,
+        }
+    return {"status": "success", "schemes": specific, "general_schemes": general}
@@ -0,0 +1,235 @@
+import asyncio
+import os
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent, RunConfig
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.run_config import StreamingMode
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+STREAM_SECTIONS = os.getenv("STREAM_SECTIONS", "1") == "1"
+
+Publish = Callable[[Event], Awaitable[None]]
+
+# Set by a StreamingSectionsAgent while it runs with SSE; its
+# StreamingAgentTool sub-agents publish their partial answers here because a
+# tool cannot yield events itself.
+_section_sink: ContextVar[Optional[tuple[InvocationContext, "SectionMux"]]] = ContextVar(
+    "section_sink", default=None
+)
+
+_DONE = object()
+
+
+def section_title(agent: BaseAgent) -> str:
+    """"crop_management_agent" -> "Crop Management"."""
+    words = agent.name.split("_")
+    if words[-1] == "agent":
+        words = words[:-1]
+    return " ".join(words).title()
+
+
+def _text(content: Optional[types.Content]) -> str:
+    if content is None or not content.parts:
+        return ""
+    return "".join(part.text or "" for part in content.parts if not part.thought)
+
+
+def sections_streaming() -> bool:
+    """Whether the current tool call streams its sub-agent's answer."""
+    return _section_sink.get() is not None
+
+
+def is_streaming(ctx: InvocationContext) -> bool:
+    """Whether sub-agent answers should be streamed in this run."""
+    return (
+        STREAM_SECTIONS
+        and ctx.run_config is not None
+        and ctx.run_config.streaming_mode == StreamingMode.SSE
+    )
+
+
+async def run_streaming(
+    agent: BaseAgent,
+    request: str,
+    ctx: InvocationContext,
+    tool_context: ToolContext,
+    publish: Publish,
+) -> str:
+    """Runs `agent` the way AgentTool does, publishing its answer as it is generated.
+
+    The agent runs with SSE streaming in its own session, seeded with the
+    caller's state, and state changes are copied back. The text of every
+    agent in it (a loop's workers and critics included) is published as
+    partial events of `agent`, the first one led by a "## <section title>"
+    header and each message separated by a blank line; text that arrives
+    whole, e.g. from the response cache, is published as one chunk. `ctx` is
+    the invocation of the agent calling `agent`, which the events belong to.
+    Returns the final answer, like AgentTool.
+    """
+    runner = Runner(
+        app_name=agent.name,
+        agent=agent,
+        session_service=InMemorySessionService(),
+        credential_service=ctx.credential_service,
+    )
+    session = await runner.session_service.create_session(
+        app_name=agent.name,
+        user_id=ctx.user_id,
+        state={k: v for k, v in tool_context.state.to_dict().items() if not k.startswith("_adk")},
+    )
+    header = f"## {section_title(agent)}\n\n"
+    streaming: set[str] = set()
+    new_message = False
+    answer = ""
+
+    async def emit(text: str) -> None:
+        nonlocal header, new_message
+        if new_message and not header:
+            text = "\n\n" + text
+        await publish(
+            Event(
+                invocation_id=ctx.invocation_id,
+                author=agent.name,
+                branch=ctx.branch,
+                partial=True,
+                content=types.Content(role="model", parts=[types.Part(text=header + text)]),
+            )
+        )
+        header = ""
+        new_message = False
+
+    try:
+        async for event in runner.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=request)]),
+            run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+        ):
+            if event.actions.state_delta:
+                tool_context.state.update(event.actions.state_delta)
+            text = _text(event.content)
+            if not text:
+                continue
+            if event.partial:
+                streaming.add(event.author)
+                await emit(text)
+                continue
+            if event.author in streaming:
+                streaming.discard(event.author)
+            else:
+                await emit(text)
+            new_message = True
+            answer = text
+    finally:
+        await runner.close()
+    if not header:
+        new_message = False
+        await emit("\n\n")
+    return answer
+
+
+class StreamingAgentTool(AgentTool):
+    """AgentTool whose sub-agent's answer reaches the client while it is generated.
+
+    Called by a StreamingSectionsAgent running with SSE, the sub-agent runs
+    through `run_streaming`; everywhere else this is a plain AgentTool.
+    """
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        sink = _section_sink.get()
+        if sink is None:
+            return await super().run_async(args=args, tool_context=tool_context)
+        ctx, mux = sink
+        try:
+            return await run_streaming(self.agent, args.get("request", ""), ctx, tool_context, mux)
+        finally:
+            await mux.finish(self.agent.name)
+
+
+class SectionMux:
+    """Forwards one section at a time from sub-agents running concurrently.
+
+    The first section to produce text is forwarded live; chunks of the others
+    are held back. When the live section finishes, finished sections are
+    flushed whole and the next one still running becomes the live one, so the
+    client gets text as soon as any sub-agent has some, without interleaving.
+    """
+
+    def __init__(self, publish: Publish):
+        self.publish = publish
+        self.live: Optional[str] = None
+        self.pending: dict[str, list[Event]] = {}
+        self.finished: set[str] = set()
+
+    async def __call__(self, event: Event) -> None:
+        if self.live is None:
+            self.live = event.author
+        if event.author == self.live:
+            await self.publish(event)
+        else:
+            self.pending.setdefault(event.author, []).append(event)
+
+    async def finish(self, section: str) -> None:
+        self.finished.add(section)
+        if section != self.live and self.live is not None:
+            return
+        self.live = None
+        for name in [name for name in self.pending if name in self.finished]:
+            for event in self.pending.pop(name):
+                await self.publish(event)
+        if self.pending:
+            self.live = next(iter(self.pending))
+            for event in self.pending.pop(self.live):
+                await self.publish(event)
+
+
+class StreamingSectionsAgent(LlmAgent):
+    """LlmAgent whose StreamingAgentTool sub-agents stream through its own events.
+
+    When the run streams (SSE), the partial answers of the sub-agents it
+    calls are yielded between its own events, one section at a time through
+    a SectionMux, so they reach the client through the normal runner event
+    stream (Agent Engine stream_query included). The agent itself runs in a
+    separate task that waits for each of its events to be taken before it
+    continues, as the runner expects.
+    """
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        if not is_streaming(ctx):
+            async for event in super()._run_async_impl(ctx):
+                yield event
+            return
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def publish(event: Event) -> None:
+            await queue.put((event, None))
+
+        async def drive() -> None:
+            # The task has its own copy of the context, so the sink is only
+            # seen by this agent's tool calls.
+            _section_sink.set((ctx, SectionMux(publish)))
+            try:
+                async for event in super(StreamingSectionsAgent, self)._run_async_impl(ctx):
+                    taken = asyncio.get_running_loop().create_future()
+                    await queue.put((event, taken))
+                    await taken
+            finally:
+                await queue.put((_DONE, None))
+
+        task = asyncio.create_task(drive())
+        try:
+            while (item := await queue.get())[0] is not _DONE:
+                event, taken = item
+                yield event
+                if taken is not None:
+                    taken.set_result(None)
+            await task
+        finally:
+            task.cancel()
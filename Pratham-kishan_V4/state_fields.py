@@ -0,0 +1,151 @@
+import os
+import re
+from typing import Any, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.tools import BaseTool, ToolContext
+
+from .agent_tree import add_callback, walk_agents
+
+APPEND_FIELD_MAX_ENTRIES = int(os.getenv("APPEND_FIELD_MAX_ENTRIES", "20"))
+APPEND_FIELD_SUMMARY_CHARS = int(os.getenv("APPEND_FIELD_SUMMARY_CHARS", "1000"))
+
+# Suffix of the counter key of an append-only field, which also marks the
+# field as append-only. Each field has its own keys, so appends from agents
+# running concurrently (whose state deltas are merged) do not overwrite each other.
+COUNT_SUFFIX = "#count"
+
+
+def _entry_key(field: str, index: int, slots: Optional[int]) -> str:
+    # Entries live in a ring of `slots` keys, so a new entry reuses the key of
+    # the one it pushes out. Fields written without slots keep one key per entry.
+    return f"{field}#{index % slots if slots else index}"
+
+
+def _first_sentence(text: str, limit: int = 160) -> str:
+    return re.split(r"(?<=[.!?])\s", str(text).strip(), maxsplit=1)[0][:limit]
+
+
+def append_entries(
+    state,
+    field: str,
+    values: list[Any],
+    max_entries: int = APPEND_FIELD_MAX_ENTRIES,
+    summary_chars: int = APPEND_FIELD_SUMMARY_CHARS,
+) -> int:
+    """Appends values to an append-only state field and returns its length.
+
+    Every value goes to its own `field#<n>` key next to a `field#count`
+    counter, so an append writes a few small keys instead of the whole list
+    again. There are `max_entries` such keys, used round-robin: once they are
+    full, a new entry replaces the oldest one, whose first sentence is folded
+    into `field#summary`, which keeps the last `summary_chars` characters.
+    `state[field]` itself is only rebuilt by `materialize_append_fields`.
+    """
+    count = state.get(field + COUNT_SUFFIX, 0)
+    if count == 0:
+        state[f"{field}#slots"] = max_entries
+    slots = state.get(f"{field}#slots")
+    max_entries = slots or max_entries
+    summary = None
+    for value in values:
+        dropped = count - max_entries
+        if dropped >= 0:
+            if summary is None:
+                summary = state.get(f"{field}#summary", "")
+            summary = (summary + " " + _first_sentence(state.get(_entry_key(field, dropped, slots)))).strip()
+            summary = summary[-summary_chars:]
+            if not slots:
+                state[_entry_key(field, dropped, slots)] = None
+        state[_entry_key(field, count, slots)] = value
+        count += 1
+    if summary is not None:
+        state[f"{field}#summary"] = summary
+        state[f"{field}#first"] = count - max_entries
+    state[field + COUNT_SUFFIX] = count
+    return count
+
+
+def entries(state, field: str) -> list[Any]:
+    """The current entries of a field, oldest first, led by the summary of dropped ones.
+
+    Plain list fields written before append_entries existed are returned as they are.
+    """
+    count = state.get(field + COUNT_SUFFIX)
+    if count is None:
+        value = state.get(field)
+        return value if isinstance(value, list) else ([] if value is None else [value])
+    first = state.get(f"{field}#first", 0)
+    slots = state.get(f"{field}#slots")
+    result = [state.get(_entry_key(field, index, slots)) for index in range(first, count)]
+    summary = state.get(f"{field}#summary")
+    if summary:
+        result.insert(0, f"(earlier, {first} entries) {summary}")
+    return result
+
+
+def latest(state, field: str) -> tuple[int, Optional[Any]]:
+    """Returns (number of appends, last entry) of a field without materialising it."""
+    count = state.get(field + COUNT_SUFFIX)
+    if count is None:
+        value = entries(state, field)
+        return len(value), value[-1] if value else None
+    slots = state.get(f"{field}#slots")
+    return count, state.get(_entry_key(field, count - 1, slots)) if count else None
+
+
+def is_append_field(state, field: str) -> bool:
+    """Whether `field` has been written with append_entries."""
+    return field + COUNT_SUFFIX in state
+
+
+def append_fields(state) -> list[str]:
+    """The append-only fields in state, found by their counter keys."""
+    keys = state.to_dict() if hasattr(state, "to_dict") else state
+    return [key[: -len(COUNT_SUFFIX)] for key in keys if key.endswith(COUNT_SUFFIX)]
+
+
+def _materialize(state, field: str) -> None:
+    count = state.get(field + COUNT_SUFFIX, 0)
+    if state.get(f"{field}#view") != count:
+        state[field] = entries(state, field)
+        state[f"{field}#view"] = count
+
+
+def materialize_append_fields(callback_context: CallbackContext) -> None:
+    """Rebuilds `state[field]` for every append-only field appended to since its last build.
+
+    Used as a before-agent callback; `materialize_after_tool` does the same
+    after a tool call, for an agent that reads a field it has just appended to.
+    """
+    state = callback_context.state
+    for field in append_fields(state):
+        _materialize(state, field)
+    return None
+
+
+def materialize_after_tool(
+    tool: BaseTool, args: dict[str, Any], tool_context: ToolContext, tool_response: Any
+) -> None:
+    """After-tool callback rebuilding the fields the tool appended to, for the next model turn.
+
+    Only the counter keys in the tool call's own state delta are looked at, so
+    fields the tool did not touch cost nothing.
+    """
+    for key in list(tool_context.actions.state_delta):
+        if key.endswith(COUNT_SUFFIX):
+            _materialize(tool_context.state, key[: -len(COUNT_SUFFIX)])
+    return None
+
+
+def materialize_before_agents(root: BaseAgent) -> None:
+    """Makes every agent of the tree see up-to-date append-only fields in its instruction.
+
+    Fields are rebuilt when an agent starts and, for agents with tools, after
+    every tool call, before the model turn that reads the tool's appends.
+    """
+    for agent in walk_agents(root):
+        add_callback(agent, "before_agent_callback", materialize_append_fields, first=True)
+        if hasattr(agent, "after_tool_callback"):
+            add_callback(agent, "after_tool_callback", materialize_after_tool)
@@ -0,0 +1,384 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Load test of a deployed Agent Engine resource, or of a local stand-in.
+
+Replays the conversations of an eval set with --users concurrent synthetic
+farmers, started over --ramp_up_s, each creating a session, replaying one
+conversation turn by turn and deleting the session, for --iterations
+conversations. Reports throughput, p50/p95/p99 latencies of turns and of
+session creation and deletion, and error rates.
+
+    python deployment/load_test.py --target=replay --users=50 --ramp_up_s=10
+    python deployment/load_test.py --target=local --users=5
+    python deployment/load_test.py --target=remote --resource_id=... --users=20
+"""
+
+import asyncio
+import json
+import os
+import pathlib
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import AsyncGenerator
+
+from absl import app, flags
+from dotenv import load_dotenv
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from pydantic import Field
+
+FLAGS = flags.FLAGS
+
+flags.DEFINE_enum(
+    "target",
+    "replay",
+    ["replay", "local", "remote"],
+    "replay: a stand-in agent answering with the eval set's recorded"
+    " responses, offline; local: the pratham_kishan agent in an"
+    " InMemoryRunner; remote: the deployed --resource_id.",
+)
+flags.DEFINE_string("resource_id", None, "ReasoningEngine resource ID.")
+flags.DEFINE_string(
+    "eval_data",
+    str(pathlib.Path(__file__).parent.parent / "eval" / "data"),
+    "Eval set file, or directory of *.test.json / *.evalset.json files.",
+)
+flags.DEFINE_integer("users", 10, "Concurrent synthetic users.")
+flags.DEFINE_float("ramp_up_s", 0.0, "Seconds over which users start.")
+flags.DEFINE_integer(
+    "ramp_steps", 0, "Start users in this many equal steps (0: one by one)."
+)
+flags.DEFINE_integer("iterations", 1, "Conversations replayed per user.")
+flags.DEFINE_float("think_time_s", 0.0, "Pause between a user's turns.")
+flags.DEFINE_float(
+    "replay_latency_s", 1.0, "Mean latency of a turn of the replay target."
+)
+flags.DEFINE_float(
+    "replay_error_rate", 0.0, "Fraction of replay turns that fail."
+)
+flags.DEFINE_integer("seed", 0, "Random seed of the replay target.")
+flags.DEFINE_string("output", None, "Also write the report as JSON here.")
+
+
+@dataclass
+class Conversation:
+    name: str
+    turns: list[str]
+    responses: list[str]
+
+
+def load_conversations(path: str) -> list[Conversation]:
+    """Reads the conversations of ADK eval sets, old (list) or new (eval_cases) format."""
+    path = pathlib.Path(path)
+    files = (
+        sorted([*path.glob("*.test.json"), *path.glob("*.evalset.json")])
+        if path.is_dir()
+        else [path]
+    )
+    conversations = []
+    for file in files:
+        data = json.loads(file.read_text())
+        if isinstance(data, list):
+            conversations.append(
+                Conversation(
+                    name=file.stem,
+                    turns=[turn["query"] for turn in data],
+                    responses=[turn.get("reference", "") for turn in data],
+                )
+            )
+            continue
+        for case in data["eval_cases"]:
+            invocations = case["conversation"]
+            conversations.append(
+                Conversation(
+                    name=case["eval_id"],
+                    turns=[_text(i["user_content"]) for i in invocations],
+                    responses=[
+                        _text(i.get("final_response")) for i in invocations
+                    ],
+                )
+            )
+    if not conversations:
+        raise ValueError(f"No eval conversations in {path}")
+    return conversations
+
+
+def _text(content) -> str:
+    if not content:
+        return ""
+    return "".join(part.get("text") or "" for part in content["parts"])
+
+
+class ReplayAgent(BaseAgent):
+    """Stand-in agent that answers with the recorded response to each turn.
+
+    Each turn takes an exponentially distributed time with mean `latency_s`
+    and fails with probability `error_rate`, so the load test runs offline.
+    """
+
+    responses: dict[str, str]
+    latency_s: float = 1.0
+    error_rate: float = 0.0
+    rng: random.Random = Field(default_factory=random.Random)
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        await asyncio.sleep(self.rng.expovariate(1 / self.latency_s))
+        if self.rng.random() < self.error_rate:
+            raise RuntimeError("429 RESOURCE_EXHAUSTED (simulated)")
+        text = ctx.user_content.parts[0].text if ctx.user_content else ""
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(
+                role="model",
+                parts=[types.Part(text=self.responses.get(text, "OK"))],
+            ),
+        )
+
+
+class LocalTarget:
+    """Runs the agent in this process with an InMemoryRunner."""
+
+    def __init__(self, agent: BaseAgent):
+        self.runner = InMemoryRunner(agent=agent)
+
+    async def create_session(self, user_id: str) -> str:
+        session = await self.runner.session_service.create_session(
+            app_name=self.runner.app_name, user_id=user_id
+        )
+        return session.id
+
+    async def query(self, user_id: str, session_id: str, message: str) -> str:
+        response = ""
+        async for event in self.runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=types.UserContent(parts=[types.Part(text=message)]),
+        ):
+            if event.error_code:
+                raise RuntimeError(f"{event.error_code}: {event.error_message}")
+            if event.content and event.content.parts:
+                response = event.content.parts[0].text or response
+        return response
+
+    async def delete_session(self, user_id: str, session_id: str) -> None:
+        await self.runner.session_service.delete_session(
+            app_name=self.runner.app_name, user_id=user_id, session_id=session_id
+        )
+
+
+class RemoteTarget:
+    """Calls a deployed Agent Engine resource; its client is blocking, so calls run in threads."""
+
+    def __init__(self, resource_id: str):
+        import vertexai
+        from vertexai import agent_engines
+
+        vertexai.init(
+            project=os.getenv("GOOGLE_CLOUD_PROJECT"),
+            location=os.getenv("GOOGLE_CLOUD_LOCATION"),
+        )
+        self.agent = agent_engines.get(resource_id)
+
+    async def create_session(self, user_id: str) -> str:
+        session = await asyncio.to_thread(
+            self.agent.create_session, user_id=user_id
+        )
+        return session["id"]
+
+    async def query(self, user_id: str, session_id: str, message: str) -> str:
+        def run() -> str:
+            response = ""
+            for event in self.agent.stream_query(
+                user_id=user_id, session_id=session_id, message=message
+            ):
+                for part in event.get("content", {}).get("parts", []):
+                    response = part.get("text") or response
+            return response
+
+        return await asyncio.to_thread(run)
+
+    async def delete_session(self, user_id: str, session_id: str) -> None:
+        await asyncio.to_thread(
+            self.agent.delete_session, user_id=user_id, session_id=session_id
+        )
+
+
+@dataclass
+class Results:
+    turn_s: list[float] = field(default_factory=list)
+    create_s: list[float] = field(default_factory=list)
+    delete_s: list[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    attempts: Counter = field(default_factory=Counter)
+
+    async def timed(self, kind: str, call):
+        """Awaits `call`, recording its duration under `kind`, or its error."""
+        self.attempts[kind] += 1
+        started = time.perf_counter()
+        try:
+            result = await call
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.errors[f"{kind}: {type(e).__name__}: {str(e)[:80]}"] += 1
+            return None
+        getattr(self, f"{kind}_s").append(time.perf_counter() - started)
+        return result
+
+
+def start_offsets(users: int, ramp_up_s: float, steps: int = 0) -> list[float]:
+    """Seconds after the start at which each user begins, linear or in `steps` steps."""
+    if users <= 1 or ramp_up_s <= 0:
+        return [0.0] * users
+    if steps <= 0:
+        return [ramp_up_s * i / users for i in range(users)]
+    return [ramp_up_s * (i * steps // users) / steps for i in range(users)]
+
+
+async def _user(
+    index: int,
+    offset_s: float,
+    target,
+    conversations: list[Conversation],
+    results: Results,
+) -> None:
+    await asyncio.sleep(offset_s)
+    user_id = f"load_user_{index}"
+    for iteration in range(FLAGS.iterations):
+        conversation = conversations[(index + iteration) % len(conversations)]
+        session_id = await results.timed(
+            "create", target.create_session(user_id)
+        )
+        if session_id is None:
+            continue
+        for turn in conversation.turns:
+            await results.timed("turn", target.query(user_id, session_id, turn))
+            if FLAGS.think_time_s:
+                await asyncio.sleep(FLAGS.think_time_s)
+        await results.timed("delete", target.delete_session(user_id, session_id))
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def report(results: Results, elapsed_s: float) -> dict:
+    summary = {
+        "users": FLAGS.users,
+        "ramp_up_s": FLAGS.ramp_up_s,
+        "elapsed_s": round(elapsed_s, 3),
+        "turns_per_s": round(len(results.turn_s) / elapsed_s, 3),
+        "errors": dict(results.errors),
+    }
+    for kind in ("turn", "create", "delete"):
+        values = getattr(results, f"{kind}_s")
+        failed = results.attempts[kind] - len(values)
+        summary[kind] = {
+            "count": results.attempts[kind],
+            "error_rate": round(failed / max(1, results.attempts[kind]), 4),
+            **{
+                f"p{q}_s": round(percentile(values, q), 3)
+                for q in (50, 95, 99)
+            },
+            "max_s": round(max(values, default=0.0), 3),
+        }
+    return summary
+
+
+def _target(conversations: list[Conversation]):
+    if FLAGS.target == "remote":
+        if not FLAGS.resource_id:
+            raise app.UsageError("--resource_id is required for --target=remote")
+        return RemoteTarget(FLAGS.resource_id)
+    if FLAGS.target == "local":
+        from pratham_kishan.agent import root_agent
+
+        return LocalTarget(root_agent)
+    responses = {
+        turn: response
+        for conversation in conversations
+        for turn, response in zip(conversation.turns, conversation.responses)
+    }
+    return LocalTarget(
+        ReplayAgent(
+            name="replay_agent",
+            responses=responses,
+            latency_s=FLAGS.replay_latency_s,
+            error_rate=FLAGS.replay_error_rate,
+            rng=random.Random(FLAGS.seed),
+        )
+    )
+
+
+async def run() -> dict:
+    conversations = load_conversations(FLAGS.eval_data)
+    target = _target(conversations)
+    results = Results()
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=max(1, FLAGS.users))
+    )
+    offsets = start_offsets(FLAGS.users, FLAGS.ramp_up_s, FLAGS.ramp_steps)
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _user(i, offset, target, conversations, results)
+            for i, offset in enumerate(offsets)
+        )
+    )
+    return report(results, time.perf_counter() - started)
+
+
+def main(argv: list[str]) -> None:  # pylint: disable=unused-argument
+
+    load_dotenv()
+
+    summary = asyncio.run(run())
+    print(
+        f"{summary['users']} users, ramp-up {summary['ramp_up_s']} s,"
+        f" {summary['elapsed_s']} s, {summary['turns_per_s']} turns/s"
+    )
+    print(
+        f"{'':<8}{'count':>7}{'errors':>8}{'p50 s':>8}{'p95 s':>8}"
+        f"{'p99 s':>8}{'max s':>8}"
+    )
+    for kind in ("turn", "create", "delete"):
+        row = summary[kind]
+        print(
+            f"{kind:<8}{row['count']:>7}{row['error_rate']:>8.2%}"
+            f"{row['p50_s']:>8.3f}{row['p95_s']:>8.3f}{row['p99_s']:>8.3f}"
+            f"{row['max_s']:>8.3f}"
+        )
+    for error, count in summary["errors"].items():
+        print(f"  {count} x {error}")
+    if FLAGS.output:
+        pathlib.Path(FLAGS.output).write_text(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    app.run(main)
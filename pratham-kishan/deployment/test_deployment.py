@@ -32,6 +32,9 @@ flags.DEFINE_string(
     "ReasoningEngine resource ID (returned after deploying the agent)",
 )
 flags.DEFINE_string("user_id", None, "User ID (can be any string).")
+flags.DEFINE_bool(
+    "stream", True, "Print responses as they are generated (SSE streaming)."
+)
 flags.mark_flag_as_required("resource_id")
 flags.mark_flag_as_required("user_id")
 
@@ -86,16 +89,31 @@ def main(argv: list[str]) -> None:  # pylint: disable=unused-argument
         if user_input == "quit":
             break
 
+        run_config = {"streaming_mode": "sse"} if FLAGS.stream else None
+        streamed = set()
         for event in agent.stream_query(
-            user_id=FLAGS.user_id, session_id=session["id"], message=user_input
+            user_id=FLAGS.user_id,
+            session_id=session["id"],
+            message=user_input,
+            run_config=run_config,
         ):
             if "content" in event:
                 if "parts" in event["content"]:
                     parts = event["content"]["parts"]
-                    for part in parts:
-                        if "text" in part:
-                            text_part = part["text"]
-                            print(f"Response: {text_part}")
+                    author = event.get("author")
+                    if event.get("partial"):
+                        streamed.add(author)
+                        for part in parts:
+                            print(part.get("text", ""), end="", flush=True)
+                    elif author in streamed:
+                        # Already printed chunk by chunk.
+                        streamed.discard(author)
+                        print()
+                    else:
+                        for part in parts:
+                            if "text" in part:
+                                text_part = part["text"]
+                                print(f"Response: {text_part}")
 
     agent.delete_session(user_id=FLAGS.user_id, session_id=session["id"])
     print(f"Deleted session for user ID: {FLAGS.user_id}")
@@ -0,0 +1,229 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parallel, resumable runner for the eval sets in eval/data.
+
+Every eval case is evaluated on its own, up to --concurrency cases at a
+time, with all of its --num-runs runs in one AgentEvaluator call: as with
+AgentEvaluator.evaluate, a case passes when its scores averaged over the
+runs meet the thresholds. A passing result is cached on disk under a hash
+of the agent package's sources (agents and prompts), the eval case, the
+eval config and the number of runs, so a rerun only evaluates what changed
+or failed.
+
+    python eval/eval_runner.py --concurrency 8 --num-runs 5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import importlib.util
+import json
+import os
+import pathlib
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from google.adk.evaluation.agent_evaluator import AgentEvaluator
+from google.adk.evaluation.eval_set import EvalSet
+
+DATA_DIR = pathlib.Path(__file__).parent / "data"
+EVAL_CACHE_DIR = os.getenv(
+    "EVAL_CACHE_DIR", str(pathlib.Path(__file__).parent / ".eval_cache")
+)
+EVAL_CONCURRENCY = int(os.getenv("EVAL_CONCURRENCY", "4"))
+
+
+@dataclass
+class CaseResult:
+    eval_set_id: str
+    eval_id: str
+    num_runs: int
+    status: str  # "passed", "failed", "error" or "cached"
+    duration_s: float
+    failures: Optional[str] = None
+
+
+def agent_hash(agent_module: str) -> str:
+    """Hash of the sources of the agent's package, prompts and sub-agents included."""
+    spec = importlib.util.find_spec(agent_module)
+    if spec is None:
+        raise ModuleNotFoundError(agent_module)
+    root = pathlib.Path(
+        spec.submodule_search_locations[0]
+        if spec.submodule_search_locations
+        else spec.origin
+    )
+    files = sorted(root.rglob("*.py")) if root.is_dir() else [root]
+    digest = hashlib.sha256()
+    for file in files:
+        digest.update(str(file.relative_to(root.parent)).encode())
+        digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def _case_key(agent_digest: str, eval_set: EvalSet, eval_config, num_runs: int) -> str:
+    digest = hashlib.sha256()
+    digest.update(agent_digest.encode())
+    digest.update(eval_set.model_dump_json(exclude={"creation_timestamp"}).encode())
+    digest.update(eval_config.model_dump_json().encode())
+    digest.update(str(num_runs).encode())
+    return digest.hexdigest()
+
+
+def _eval_files(path: pathlib.Path) -> list[pathlib.Path]:
+    if path.is_file():
+        return [path]
+    return sorted([*path.rglob("*.test.json"), *path.rglob("*.evalset.json")])
+
+
+def _single_case_sets(file: pathlib.Path):
+    """Yields the eval config of `file` and a one-case eval set per case in it."""
+    eval_config = AgentEvaluator.find_config_for_test_file(str(file))
+    eval_set = AgentEvaluator._load_eval_set_from_file(  # pylint: disable=protected-access
+        str(file), eval_config, {}
+    )
+    for case in eval_set.eval_cases:
+        case = case.model_copy(update={"creation_timestamp": 0.0})
+        yield eval_config, eval_set.model_copy(
+            update={"eval_cases": [case], "creation_timestamp": 0.0}
+        )
+
+
+async def _run_case(
+    agent_module: str,
+    eval_set: EvalSet,
+    eval_config,
+    num_runs: int,
+    cache_file: Optional[pathlib.Path],
+    semaphore: asyncio.Semaphore,
+) -> CaseResult:
+    eval_id = eval_set.eval_cases[0].eval_id
+    if cache_file and cache_file.exists():
+        cached = CaseResult(**json.loads(cache_file.read_text()))
+        cached.status = "cached"
+        return cached
+    async with semaphore:
+        started = time.perf_counter()
+        status, failures = "passed", None
+        try:
+            await AgentEvaluator.evaluate_eval_set(
+                agent_module=agent_module,
+                eval_set=eval_set,
+                eval_config=eval_config,
+                num_runs=num_runs,
+                print_detailed_results=False,
+            )
+        except AssertionError as e:
+            status, failures = "failed", str(e)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            status, failures = "error", f"{type(e).__name__}: {e}"
+        result = CaseResult(
+            eval_set_id=eval_set.eval_set_id,
+            eval_id=eval_id,
+            num_runs=num_runs,
+            status=status,
+            duration_s=time.perf_counter() - started,
+            failures=failures,
+        )
+    if cache_file and status == "passed":
+        cache_file.write_text(json.dumps(asdict(result)))
+    return result
+
+
+async def run_eval(
+    agent_module: str,
+    path: pathlib.Path = DATA_DIR,
+    num_runs: int = 1,
+    concurrency: int = EVAL_CONCURRENCY,
+    cache_dir: Optional[str] = EVAL_CACHE_DIR,
+) -> list[CaseResult]:
+    """Evaluates every case of the eval sets under `path` over `num_runs` runs.
+
+    Args:
+        agent_module: Module of the agent, as for AgentEvaluator.evaluate.
+        path: An eval set file, or a directory searched for them.
+        num_runs: Runs of each case; the case passes on its scores averaged over them.
+        concurrency: Evaluations running at the same time.
+        cache_dir: Directory of cached passing results; None disables the cache.
+
+    Returns:
+        One CaseResult per case, cached ones with status "cached".
+    """
+    digest = agent_hash(agent_module)
+    cache = pathlib.Path(cache_dir) if cache_dir else None
+    if cache:
+        cache.mkdir(parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = []
+    for file in _eval_files(pathlib.Path(path)):
+        for eval_config, eval_set in _single_case_sets(file):
+            key = _case_key(digest, eval_set, eval_config, num_runs)
+            cache_file = cache / f"{key}.json" if cache else None
+            tasks.append(
+                _run_case(
+                    agent_module, eval_set, eval_config, num_runs, cache_file, semaphore
+                )
+            )
+    return list(await asyncio.gather(*tasks))
+
+
+def print_report(results: list[CaseResult], elapsed_s: float) -> None:
+    """Prints each case's status and time, slowest first, and the totals."""
+    print(f"{'eval set':<24}{'case':<24}{'runs':>5} {'status':<8}{'s':>8}")
+    for r in sorted(results, key=lambda r: r.duration_s, reverse=True):
+        print(
+            f"{r.eval_set_id[:23]:<24}{r.eval_id[:23]:<24}{r.num_runs:>5} "
+            f"{r.status:<8}{r.duration_s:>8.2f}"
+        )
+    counts = {s: sum(r.status == s for r in results) for s in ("passed", "cached", "failed", "error")}
+    evaluated_s = sum(r.duration_s for r in results if r.status != "cached")
+    print(
+        f"{len(results)} cases: "
+        + ", ".join(f"{n} {s}" for s, n in counts.items())
+        + f"; {evaluated_s:.1f} s of evaluation in {elapsed_s:.1f} s"
+    )
+    for r in results:
+        if r.failures:
+            print(f"\n{r.eval_id} {r.status}:\n{r.failures}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agent-module", default="pratham_kishan")
+    parser.add_argument("--data", default=str(DATA_DIR))
+    parser.add_argument("--num-runs", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=EVAL_CONCURRENCY)
+    parser.add_argument("--cache-dir", default=EVAL_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = asyncio.run(
+        run_eval(
+            args.agent_module,
+            pathlib.Path(args.data),
+            num_runs=args.num_runs,
+            concurrency=args.concurrency,
+            cache_dir=None if args.no_cache else args.cache_dir,
+        )
+    )
+    print_report(results, time.perf_counter() - started)
+    if any(r.status in ("failed", "error") for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,13 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Basic evaluation for Financial Advisor"""
+"""Basic evaluation for the Pratham Kishan farmer advisor"""
 
-import pathlib
+import time
 
 import dotenv
 import pytest
-from google.adk.evaluation.agent_evaluator import AgentEvaluator
+from eval_runner import print_report, run_eval
 
 pytest_plugins = ("pytest_asyncio",)
 
@@ -32,8 +32,8 @@ def load_env():
 async def test_all():
     """Test the agent's basic ability on a few examples."""
     print("Running evaluate")
-    await AgentEvaluator.evaluate(
-        "financial_advisor",
-        str(pathlib.Path(__file__).parent / "data"),
-        num_runs=5,
-    )
+    started = time.perf_counter()
+    results = await run_eval("pratham_kishan", num_runs=5)
+    print_report(results, time.perf_counter() - started)
+    failed = [r for r in results if r.status in ("failed", "error")]
+    assert not failed, "\n".join(f"{r.eval_id}: {r.failures}" for r in failed)
@@ -14,21 +14,28 @@
 
 """Pratham Kishan: provide framer assistenace"""
 
-from google.adk.agents import LlmAgent
-from google.adk.tools.agent_tool import AgentTool
-
 from . import prompt
+from .bounded_agent_tool import BoundedAgentTool
+from .response_cache import ResponseCache
+from .section_streaming import StreamingSectionsAgent
 from .sub_agents.crop_management import crop_management_agent
 from .sub_agents.gov_scheme import gov_scheme_agent
 from .sub_agents.market_information import market_information_agent
 from .sub_agents.farming_tech import farming_tech_agent
 from .sub_agents.weather_information import weather_information_agent
+from .tracing import instrument_from_env
 
 
 MODEL = "gemini-2.0-flash-lite"
 
+response_cache = ResponseCache()
+response_cache.attach(crop_management_agent, ttl_s=7 * 24 * 3600)
+response_cache.attach(
+    farming_tech_agent, ttl_s=30 * 24 * 3600, fields=("crop", "stage")
+)
+
 
-farmer_advisor = LlmAgent(
+farmer_advisor = StreamingSectionsAgent(
     name="pratham_kishan_framer_advisor",  # Changed name
     model=MODEL,
     description=(
@@ -40,12 +47,14 @@ farmer_advisor = LlmAgent(
     instruction=prompt.PRATHAM_KISHAN_FRAMER_PROMPT,  # Assuming a new prompt for framer
     output_key="framer_advisor_output",
     tools=[
-        AgentTool(agent=crop_management_agent),
-        AgentTool(agent=gov_scheme_agent),
-        AgentTool(agent=market_information_agent),
-        AgentTool(agent=farming_tech_agent),
-        AgentTool(agent=weather_information_agent),
+        BoundedAgentTool(agent=crop_management_agent),
+        BoundedAgentTool(agent=gov_scheme_agent),
+        BoundedAgentTool(agent=market_information_agent),
+        BoundedAgentTool(agent=farming_tech_agent),
+        BoundedAgentTool(agent=weather_information_agent),
     ],
 )
 
-root_agent = farmer_advisor
\ No newline at end of file
+root_agent = farmer_advisor
+
+instrument_from_env(root_agent)
@@ -0,0 +1,60 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers to walk an agent tree and add callbacks to its agents."""
+
+from typing import Iterator
+
+from google.adk.agents import BaseAgent
+from google.adk.tools.agent_tool import AgentTool
+
+
+def walk_agents(root: BaseAgent) -> Iterator[BaseAgent]:
+    """Yields every agent reachable from root.
+
+    Follows sub_agents, AgentTools and the branches of a ConcurrentBranchesAgent.
+
+    Each agent is yielded once, parents before their children.
+    """
+    seen = set()
+    stack = [root]
+    while stack:
+        agent = stack.pop()
+        if id(agent) in seen:
+            continue
+        seen.add(id(agent))
+        yield agent
+        children = list(agent.sub_agents)
+        children += [
+            tool.agent
+            for tool in getattr(agent, "tools", None) or []
+            if isinstance(tool, AgentTool)
+        ]
+        children += list((getattr(agent, "branches", None) or {}).values())
+        stack.extend(reversed(children))
+
+
+def add_callback(agent: BaseAgent, attribute: str, callback, first: bool = False) -> None:
+    """Adds a callback next to whatever the agent already has configured.
+
+    With `first` it runs before the existing callbacks instead of after them.
+    """
+    existing = getattr(agent, attribute)
+    if existing is None:
+        callbacks = []
+    elif isinstance(existing, list):
+        callbacks = list(existing)
+    else:
+        callbacks = [existing]
+    setattr(agent, attribute, [callback] + callbacks if first else callbacks + [callback])
@@ -0,0 +1,45 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""SQLite databases of the on-disk caches."""
+
+import logging
+import os
+import sqlite3
+import tempfile
+
+# Writable directory of the on-disk caches; the package directory may be
+# read-only in a deployment image.
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(tempfile.gettempdir(), "pratham_kishan"))
+
+
+def open_cache_db(path: str, schema: str) -> sqlite3.Connection:
+    """Opens the SQLite cache at `path` and creates its table with `schema`.
+
+    When the file cannot be opened or written, e.g. on a read-only file
+    system, the cache is kept in memory instead and lives as long as the
+    process.
+    """
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute(schema)
+        db.commit()
+        return db
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"[cache_db] cannot use {path} ({e}), keeping the cache in memory")
+    db = sqlite3.connect(":memory:", check_same_thread=False)
+    db.execute(schema)
+    db.commit()
+    return db
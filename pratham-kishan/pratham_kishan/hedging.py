@@ -0,0 +1,76 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Hedged duplicate runs of slow calls."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from .search_cache import fresh_searches
+
+
+def hedge_after_s(durations, quantile: Optional[float], min_samples: int) -> Optional[float]:
+    """The `quantile` of the recent run times, or None while hedging is off or there are too few."""
+    if not quantile or not durations or len(durations) < min_samples:
+        return None
+    ordered = sorted(durations)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+async def _duplicate(start: Callable[[], Awaitable[Any]]) -> Any:
+    # Runs in its own task, so this only affects the duplicate run.
+    fresh_searches.set(True)
+    return await start()
+
+
+async def run_hedged(
+    start: Callable[[], Awaitable[Any]], after_s: Optional[float], label: str
+) -> tuple[Any, bool, bool]:
+    """Runs start(), and once more if the first run is still going after `after_s`.
+
+    Whichever run succeeds first is used and the other is cancelled; when
+    both fail, the error of the last one is raised. The duplicate's searches
+    do not wait for the first run's in-flight ones, which may be what is
+    stuck.
+
+    Args:
+        start: starts one run.
+        after_s: seconds after which to start the duplicate; None for no hedging.
+        label: names the call in the log, e.g. "[coordinator] mandi_agent".
+
+    Returns:
+        tuple: the result, whether a duplicate was started and whether its
+        result was the one used.
+    """
+    first = asyncio.ensure_future(start())
+    if after_s is None:
+        return await first, False, False
+    running = {first}
+    hedged = False
+    try:
+        done, _ = await asyncio.wait(running, timeout=after_s)
+        if not done:
+            hedged = True
+            logging.info(f"{label} still running after {after_s:.1f}s, hedging")
+            running.add(asyncio.ensure_future(_duplicate(start)))
+        while True:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                running.discard(task)
+                if task.exception() is None or not running:
+                    return task.result(), hedged, task is not first
+    finally:
+        for task in running:
+            task.cancel()
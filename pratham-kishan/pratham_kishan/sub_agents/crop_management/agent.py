@@ -15,8 +15,8 @@
 """crop_management_agent for finding information using google search"""
 
 from google.adk import Agent
-from google.adk.tools import google_search
 
+from ...search_cache import google_search
 from . import prompt
 
 MODEL = "gemini-2.0-flash-lite"
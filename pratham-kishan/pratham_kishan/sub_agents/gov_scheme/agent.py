@@ -15,8 +15,8 @@
 """Risk Analysis Agent for providing the final risk evaluation"""
 
 from google.adk import Agent
-from google.adk.tools import google_search
 
+from ...search_cache import google_search
 from . import prompt
 
 MODEL="gemini-2.0-flash-lite"
@@ -15,8 +15,8 @@
 """Execution_analyst_agent for finding the ideal execution strategy"""
 
 from google.adk import Agent
-from google.adk.tools import google_search
 
+from ...search_cache import google_search
 from . import prompt
 
 MODEL = "gemini-2.0-flash-lite"
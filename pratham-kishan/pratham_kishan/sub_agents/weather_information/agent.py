@@ -15,8 +15,9 @@
 """Risk Analysis Agent for providing the final risk evaluation"""
 
 from google.adk import Agent
-from google.adk.tools import google_search
 
+from ...search_cache import google_search
+from ...weather_store import lookup_weather_forecast
 from . import prompt
 
 MODEL="gemini-2.0-flash-lite"
@@ -26,6 +27,6 @@ weather_information_agent = Agent(
     name="weather_analyst_agent",
     instruction=prompt.WEATHER_INFORMATION_PROMPT,
     output_key="weather_analyst_output",
-    tools=[google_search],
+    tools=[lookup_weather_forecast, google_search],
 
 )
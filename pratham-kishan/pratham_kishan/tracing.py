@@ -0,0 +1,280 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-turn spans of every agent, model call and tool call in the tree."""
+
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from google.adk.agents import BaseAgent, LlmAgent, LoopAgent
+
+from .agent_tree import add_callback, walk_agents
+
+
+@dataclass
+class Span:
+    """One timed step of a conversation: an agent run, model call, tool call,
+    agent transfer or loop iteration."""
+
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    kind: str
+    name: str
+    agent: str
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: dict = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        span = asdict(self)
+        span["duration_ms"] = self.duration_ms
+        return span
+
+
+class JsonLinesExporter:
+    """Appends every finished span to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+
+class OpenTelemetryExporter:
+    """Mirrors spans into OpenTelemetry using the globally configured provider."""
+
+    def __init__(self, tracer_provider=None):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self._tracer = trace.get_tracer("pratham_kishan", tracer_provider=tracer_provider)
+        self._live = {}
+
+    def on_start(self, span: Span) -> None:
+        parent = self._live.get(span.parent_id)
+        self._live[span.span_id] = self._tracer.start_span(
+            f"{span.kind} {span.name}",
+            context=self._trace.set_span_in_context(parent) if parent else None,
+            start_time=span.start_ns,
+        )
+
+    def on_end(self, span: Span) -> None:
+        otel_span = self._live.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        otel_span.set_attribute("pratham.agent", span.agent)
+        for key, value in span.attributes.items():
+            if isinstance(value, (str, bool, int, float)):
+                otel_span.set_attribute(f"pratham.{key}", value)
+        otel_span.end(end_time=span.end_ns)
+
+
+class Tracer:
+    """Builds spans from ADK callbacks and hands them to the exporters.
+
+    Spans are keyed by invocation and agent name, which ADK keeps unique within
+    a tree. An agent run by an AgentTool gets a fresh invocation; it is linked
+    to the still open tool span of the same name.
+    """
+
+    def __init__(self, exporters: list):
+        self.exporters = exporters
+        self._lock = threading.Lock()
+        self._open: dict[tuple, Span] = {}
+        self._iterations: dict[tuple[str, str], int] = {}
+
+    def _start(self, key, kind, name, agent, parent: Optional[Span], **attributes) -> Span:
+        span = Span(
+            trace_id=parent.trace_id if parent else key[1],
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            kind=kind,
+            name=name,
+            agent=agent,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        with self._lock:
+            self._open[key] = span
+        for exporter in self.exporters:
+            exporter.on_start(span)
+        return span
+
+    def _end(self, key, **attributes) -> Optional[Span]:
+        with self._lock:
+            span = self._open.pop(key, None)
+        if span is None:
+            return None
+        span.end_ns = time.time_ns()
+        span.attributes.update(attributes)
+        for exporter in self.exporters:
+            exporter.on_end(span)
+        return span
+
+    def _agent_parent(self, invocation_id: str, agent: BaseAgent) -> Optional[Span]:
+        parent = agent.parent_agent
+        while parent is not None:
+            span = self._open.get(("iteration", invocation_id, parent.name)) or self._open.get(
+                ("agent", invocation_id, parent.name)
+            )
+            if span:
+                return span
+            parent = parent.parent_agent
+        tool_spans = [
+            span
+            for key, span in self._open.items()
+            if key[0] == "tool" and span.name == agent.name
+        ]
+        return max(tool_spans, key=lambda span: span.start_ns, default=None)
+
+    # Callbacks
+
+    def before_agent(self, agent: BaseAgent, callback_context) -> None:
+        invocation_id = callback_context.invocation_id
+        loop = agent.parent_agent
+        if isinstance(loop, LoopAgent) and loop.sub_agents[0] is agent:
+            key = ("iteration", invocation_id, loop.name)
+            self._end(key)
+            index = self._iterations.get(key[1:], 0) + 1
+            self._iterations[key[1:]] = index
+            self._start(
+                key,
+                "loop_iteration",
+                f"{loop.name}#{index}",
+                loop.name,
+                self._open.get(("agent", invocation_id, loop.name)),
+                iteration=index,
+            )
+        self._start(
+            ("agent", invocation_id, agent.name),
+            "agent",
+            agent.name,
+            agent.name,
+            self._agent_parent(invocation_id, agent),
+            agent_type=type(agent).__name__,
+        )
+
+    def after_agent(self, agent: BaseAgent, callback_context) -> None:
+        invocation_id = callback_context.invocation_id
+        # Close whatever a short-circuiting callback or an error left open.
+        dangling = [
+            key
+            for key, span in list(self._open.items())
+            if key[1] == invocation_id and key[0] in ("model", "tool") and span.agent == agent.name
+        ]
+        for key in dangling:
+            self._end(key, status="unfinished")
+        if isinstance(agent, LoopAgent):
+            self._end(("iteration", invocation_id, agent.name))
+            self._iterations.pop((invocation_id, agent.name), None)
+        self._end(("agent", invocation_id, agent.name))
+
+    def before_model(self, callback_context, llm_request) -> None:
+        invocation_id = callback_context.invocation_id
+        self._start(
+            ("model", invocation_id, callback_context.agent_name),
+            "model",
+            llm_request.model or "model",
+            callback_context.agent_name,
+            self._open.get(("agent", invocation_id, callback_context.agent_name)),
+        )
+
+    def after_model(self, callback_context, llm_response) -> None:
+        if llm_response.partial:
+            return
+        usage = llm_response.usage_metadata
+        self._end(
+            ("model", callback_context.invocation_id, callback_context.agent_name),
+            prompt_tokens=(usage.prompt_token_count or 0) if usage else 0,
+            response_tokens=(usage.candidates_token_count or 0) if usage else 0,
+        )
+
+    def before_tool(self, tool, args, tool_context) -> None:
+        invocation_id = tool_context.invocation_id
+        attributes = {}
+        kind = "tool"
+        if tool.name == "transfer_to_agent":
+            kind = "transfer"
+            attributes["target"] = args.get("agent_name", "")
+        self._start(
+            ("tool", invocation_id, tool_context.agent_name, tool_context.function_call_id or tool.name),
+            kind,
+            tool.name,
+            tool_context.agent_name,
+            self._open.get(("agent", invocation_id, tool_context.agent_name)),
+            **attributes,
+        )
+
+    def after_tool(self, tool, args, tool_context, tool_response) -> None:
+        self._end(
+            (
+                "tool",
+                tool_context.invocation_id,
+                tool_context.agent_name,
+                tool_context.function_call_id or tool.name,
+            )
+        )
+
+
+def instrument(root: BaseAgent, exporters: list) -> Tracer:
+    """Attaches tracing callbacks to every agent reachable from root.
+
+    Existing callbacks are kept and run first.
+    """
+    tracer = Tracer(exporters)
+    for agent in walk_agents(root):
+        add_callback(
+            agent,
+            "before_agent_callback",
+            lambda callback_context, agent=agent: tracer.before_agent(agent, callback_context),
+        )
+        add_callback(
+            agent,
+            "after_agent_callback",
+            lambda callback_context, agent=agent: tracer.after_agent(agent, callback_context),
+        )
+        if isinstance(agent, LlmAgent):
+            add_callback(agent, "before_model_callback", tracer.before_model)
+            add_callback(agent, "after_model_callback", tracer.after_model)
+            add_callback(agent, "before_tool_callback", tracer.before_tool)
+            add_callback(agent, "after_tool_callback", tracer.after_tool)
+    return tracer
+
+
+def instrument_from_env(root: BaseAgent) -> Optional[Tracer]:
+    """Instruments root when TRACE_FILE and/or TRACE_OTEL=1 are set."""
+    exporters = []
+    if os.getenv("TRACE_FILE"):
+        exporters.append(JsonLinesExporter(os.environ["TRACE_FILE"]))
+    if os.getenv("TRACE_OTEL", "").lower() in ("1", "true"):
+        exporters.append(OpenTelemetryExporter())
+    return instrument(root, exporters) if exporters else None
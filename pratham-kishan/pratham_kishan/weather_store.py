@@ -0,0 +1,445 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local gridded weather forecasts and agronomic indicators for districts."""
+
+import asyncio
+import csv
+import logging
+import os
+import re
+import threading
+import time
+import warnings
+from datetime import date
+from typing import Optional
+
+import numpy as np
+
+WEATHER_DATA_DIR = os.getenv(
+    "WEATHER_DATA_DIR", os.path.join(os.path.dirname(__file__), "data", "weather")
+)
+WEATHER_DISTRICTS_PATH = os.getenv(
+    "WEATHER_DISTRICTS_PATH", os.path.join(os.path.dirname(__file__), "data", "districts.csv")
+)
+WEATHER_REFRESH_S = float(os.getenv("WEATHER_REFRESH_S", "900"))
+WEATHER_FORECAST_DAYS = int(os.getenv("WEATHER_FORECAST_DAYS", "7"))
+# District forecasts average the grid cells within this many degrees of its centre.
+WEATHER_DISTRICT_RADIUS_DEG = float(os.getenv("WEATHER_DISTRICT_RADIUS_DEG", "0.25"))
+# IMD counts a day with at least 2.5 mm of rain as a rainy day.
+RAIN_DAY_MM = 2.5
+
+VARIABLES = ("tmax", "tmin", "rain")
+_ALIASES = {
+    "latitude": "lat", "y": "lat",
+    "longitude": "lon", "long": "lon", "x": "lon",
+    "time": "date", "valid_time": "date", "day": "date", "datetime": "date",
+    "tasmax": "tmax", "max_temp": "tmax", "temperature_2m_max": "tmax", "mx2t": "tmax",
+    "tasmin": "tmin", "min_temp": "tmin", "temperature_2m_min": "tmin", "mn2t": "tmin",
+    "temperature": "temp", "temperature_2m": "temp", "t2m": "temp", "tas": "temp",
+    "rf": "rain", "rainfall": "rain", "precipitation": "rain", "precipitation_sum": "rain",
+    "precip": "rain", "pr": "rain", "tp": "rain", "apcp": "rain",
+}
+
+# (GDD base temperature, daily maximum above which the crop is heat stressed), in C.
+# Approximate values from crop physiology references; adjust per variety.
+CROP_THRESHOLDS = {
+    "rice": (10.0, 35.0), "paddy": (10.0, 35.0), "wheat": (5.0, 32.0),
+    "maize": (10.0, 35.0), "corn": (10.0, 35.0), "cotton": (15.5, 36.0),
+    "tomato": (10.0, 32.0), "potato": (7.0, 30.0), "onion": (7.0, 35.0),
+    "groundnut": (10.0, 35.0), "soybean": (10.0, 35.0), "sugarcane": (12.0, 38.0),
+    "ragi": (10.0, 35.0), "jowar": (10.0, 38.0), "bajra": (12.0, 40.0),
+    "chilli": (10.0, 35.0), "banana": (14.0, 38.0), "mustard": (5.0, 30.0),
+}
+DEFAULT_THRESHOLDS = (10.0, 35.0)
+
+
+def _norm(name: str) -> str:
+    return " ".join(re.findall(r"\w+", name.lower()))
+
+
+def _column_name(header: str) -> str:
+    name = re.sub(r"[^a-z0-9]+", "_", header.lower()).strip("_")
+    # e.g. "rain (mm)", "tmax_c"
+    name = re.sub(r"_(mm|c|degc|k)$", "", name)
+    return _ALIASES.get(name, name)
+
+
+def _to_days(values) -> np.ndarray:
+    """Dates or timestamps as day numbers since 1970-01-01."""
+    return np.asarray(values, dtype="datetime64[m]").astype("datetime64[D]").astype(np.int64)
+
+
+def _read_csv(path: str) -> dict[str, np.ndarray]:
+    """Reads a point CSV: lat, lon, date and tmax/tmin/rain (or temp) columns."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        headers = [_column_name(header) for header in next(reader)]
+        rows = list(reader)
+    columns = {}
+    for i, name in enumerate(headers):
+        values = [row[i] if i < len(row) else "" for row in rows]
+        if name == "date":
+            columns[name] = _to_days(values)
+        elif name in ("lat", "lon", "temp") + VARIABLES:
+            columns[name] = np.array([float(v) if v.strip() else np.nan for v in values])
+    return columns
+
+
+def _read_netcdf(path: str) -> dict[str, np.ndarray]:
+    """Reads a gridded NetCDF file (time, lat, lon) into point columns."""
+    try:
+        import xarray as xr
+    except ImportError as e:
+        raise ImportError("Loading NetCDF weather files needs xarray installed") from e
+    with xr.open_dataset(path) as dataset:
+        dataset = dataset.rename(
+            {name: _column_name(name) for name in dataset.variables if _column_name(name) != name}
+        )
+        times = dataset["date"].values
+        lats = dataset["lat"].values.astype(np.float64)
+        lons = dataset["lon"].values.astype(np.float64)
+        shape = (len(times), len(lats), len(lons))
+        days, lat, lon = np.meshgrid(_to_days(times), lats, lons, indexing="ij")
+        columns = {"date": days.ravel(), "lat": lat.ravel(), "lon": lon.ravel()}
+        for name in ("temp",) + VARIABLES:
+            if name not in dataset:
+                continue
+            variable = dataset[name].transpose("date", "lat", "lon")
+            values = variable.values.astype(np.float64).reshape(shape)
+            units = str(variable.attrs.get("units", "")).lower()
+            if units in ("k", "kelvin"):
+                values = values - 273.15
+            elif name == "rain" and units == "m":
+                values = values * 1000.0
+            elif name == "rain" and units in ("kg m-2 s-1", "kg/m2/s"):
+                values = values * 86400.0
+            columns[name] = values.ravel()
+    return columns
+
+
+def _daily(columns: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Aggregates sub-daily rows to one row per grid cell and day.
+
+    Maximum and minimum temperature of the day (from tmax/tmin, or from an
+    instantaneous temp column) and the day's total rain.
+    """
+    missing = {"lat", "lon", "date"} - columns.keys()
+    if missing:
+        raise ValueError(f"Weather rows are missing columns: {sorted(missing)}")
+    if "temp" in columns:
+        columns.setdefault("tmax", columns["temp"])
+        columns.setdefault("tmin", columns["temp"])
+    count = len(columns["date"])
+    keys = np.stack([columns["lat"], columns["lon"], columns["date"].astype(np.float64)], axis=1)
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    daily = {
+        "lat": unique[:, 0],
+        "lon": unique[:, 1],
+        "date": unique[:, 2].astype(np.int64),
+    }
+    for name, reduce, start in (
+        ("tmax", np.fmax, -np.inf), ("tmin", np.fmin, np.inf), ("rain", None, 0.0)
+    ):
+        values = columns.get(name, np.full(count, np.nan))
+        valid = ~np.isnan(values)
+        if reduce is None:
+            out = np.bincount(inverse[valid], weights=values[valid], minlength=len(unique))
+        else:
+            out = np.full(len(unique), start)
+            reduce.at(out, inverse[valid], values[valid])
+        seen = np.bincount(inverse[valid], minlength=len(unique)) > 0
+        daily[name] = np.where(seen, out, np.nan)
+    return daily
+
+
+def indicators(
+    tmax: np.ndarray, tmin: np.ndarray, rain: np.ndarray, base_c: float, heat_c: float
+) -> dict[str, np.ndarray]:
+    """Agronomic indicators over the last axis (days) of daily series.
+
+    Any leading axes (districts, scenarios) are kept, so many locations are
+    computed in one call. Days without data count as neither rainy, dry nor
+    hot; an indicator whose inputs are missing on every day is NaN rather
+    than 0.
+
+    Returns:
+        rain_mm, rain_days (>= 2.5 mm), heat_stress_days (tmax >= heat_c),
+        gdd (growing degree days, mean temperature over base_c) and
+        longest_dry_spell (consecutive days under 2.5 mm).
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = (tmax + tmin) / 2
+        dry = rain < RAIN_DAY_MM
+        days = np.arange(rain.shape[-1])
+        # Length of the dry run ending on each day: days since the last non-dry day.
+        last_break = np.maximum.accumulate(np.where(dry, -1, days), axis=-1)
+        has_rain = np.any(~np.isnan(rain), axis=-1)
+        has_tmax = np.any(~np.isnan(tmax), axis=-1)
+        has_mean = np.any(~np.isnan(mean), axis=-1)
+        return {
+            "rain_mm": np.where(has_rain, np.nansum(rain, axis=-1), np.nan),
+            "rain_days": np.where(has_rain, np.sum(rain >= RAIN_DAY_MM, axis=-1), np.nan),
+            "heat_stress_days": np.where(has_tmax, np.sum(tmax >= heat_c, axis=-1), np.nan),
+            "gdd": np.where(has_mean, np.nansum(np.clip(mean - base_c, 0, None), axis=-1), np.nan),
+            "longest_dry_spell": np.where(
+                has_rain, np.max(days - last_break, axis=-1, initial=0), np.nan
+            ),
+        }
+
+
+def crop_thresholds(crop: str) -> tuple[float, float]:
+    """(GDD base, heat stress) temperatures of the first known crop name in `crop`."""
+    for word in _norm(crop).split():
+        if word in CROP_THRESHOLDS:
+            return CROP_THRESHOLDS[word]
+    return DEFAULT_THRESHOLDS
+
+
+class WeatherStore:
+    """Daily gridded forecasts held as NumPy cubes of (date, lat, lon).
+
+    Files are CSV points (lat, lon, date, tmax/tmin/rain or an hourly temp)
+    or NetCDF grids; sub-daily values are aggregated to days. The cubes span
+    the union of the grids and dates of every file loaded, and where two
+    files cover the same cell and day the one loaded last wins, so loading
+    today's forecast replaces the overlapping days of yesterday's.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._files: dict[str, dict[str, np.ndarray]] = {}
+        self._loaded_files: dict[str, float] = {}
+        self._last_refresh = 0.0
+        self.lats = np.empty(0)
+        self.lons = np.empty(0)
+        self.dates = np.empty(0, dtype="datetime64[D]")
+        self.cubes: dict[str, np.ndarray] = {}
+        self._districts: Optional[dict[str, tuple[str, str, float, float]]] = None
+
+    def __len__(self) -> int:
+        return sum(len(rows["date"]) for rows in self._files.values())
+
+    def add_rows(self, columns: dict[str, np.ndarray], source: str = "rows") -> int:
+        """Adds point rows given as {column name: values}; returns the days kept."""
+        with self._lock:
+            self._files.pop(source, None)
+            self._files[source] = _daily(columns)
+            self._build()
+        return len(self._files[source]["date"])
+
+    def _build(self) -> None:
+        chunks = list(self._files.values())
+        if not chunks:
+            return
+        rows = {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]}
+        lats, lat_index = np.unique(rows["lat"], return_inverse=True)
+        lons, lon_index = np.unique(rows["lon"], return_inverse=True)
+        days, day_index = np.unique(rows["date"], return_inverse=True)
+        flat = (day_index.ravel() * len(lats) + lat_index.ravel()) * len(lons) + lon_index.ravel()
+        # np.unique keeps the first occurrence; reversed, that is the last file's row.
+        _, last = np.unique(flat[::-1], return_index=True)
+        keep = len(flat) - 1 - last
+        shape = (len(days), len(lats), len(lons))
+        cubes = {}
+        for name in VARIABLES:
+            cube = np.full(shape, np.nan, dtype=np.float32)
+            cube.ravel()[flat[keep]] = rows[name][keep]
+            cubes[name] = cube
+        self.lats, self.lons, self.cubes = lats, lons, cubes
+        self.dates = days.astype("datetime64[D]")
+
+    def load_files(self, paths: list[str]) -> int:
+        """Loads CSV or NetCDF forecast files; returns the number of cell-days kept."""
+        added = 0
+        with self._lock:
+            for path in paths:
+                columns = _read_netcdf(path) if path.endswith((".nc", ".nc4")) else _read_csv(path)
+                self._files.pop(path, None)
+                self._files[path] = _daily(columns)
+                self._loaded_files[path] = os.path.getmtime(path)
+                days = len(self._files[path]["date"])
+                logging.info(f"[weather_store] loaded {days} cell-days from {path}")
+                added += days
+            self._build()
+        return added
+
+    def load_dir(self, directory: str = WEATHER_DATA_DIR) -> int:
+        """Loads the forecast files of a directory that are new or changed since last time."""
+        if not os.path.isdir(directory):
+            return 0
+        paths = [
+            os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.endswith((".csv", ".nc", ".nc4"))
+        ]
+        changed = [
+            path for path in paths
+            if self._loaded_files.get(path) != os.path.getmtime(path)
+        ]
+        return self.load_files(changed) if changed else 0
+
+    def _fresh(self) -> bool:
+        return bool(self._last_refresh) and (
+            time.monotonic() - self._last_refresh < WEATHER_REFRESH_S
+        )
+
+    def refresh(self, directory: str = WEATHER_DATA_DIR) -> None:
+        """Picks up new forecast files at most every WEATHER_REFRESH_S seconds.
+
+        Loading parses files, so call it off the event loop. Concurrent
+        callers wait for the load in progress instead of starting their own.
+        """
+        if self._fresh():
+            return
+        with self._refresh_lock:
+            if self._fresh():
+                return
+            self._load_districts()
+            self.load_dir(directory)
+            self._last_refresh = time.monotonic()
+
+    def _load_districts(self) -> None:
+        if self._districts is not None:
+            return
+        districts = {}
+        if os.path.exists(WEATHER_DISTRICTS_PATH):
+            with open(WEATHER_DISTRICTS_PATH, newline="", encoding="utf-8-sig") as f:
+                for row in csv.DictReader(f):
+                    entry = (row["district"], row["state"], float(row["lat"]), float(row["lon"]))
+                    districts[_norm(row["district"])] = entry
+                    districts[_norm(f"{row['district']} {row['state']}")] = entry
+        self._districts = districts
+
+    def district(self, district: str, state: str = "") -> Optional[tuple[str, str, float, float]]:
+        """(district, state, lat, lon) of a district in WEATHER_DISTRICTS_PATH, or None."""
+        self._load_districts()
+        if not state and "," in district:
+            district, state = district.split(",", 1)
+        return self._districts.get(_norm(f"{district} {state}")) or self._districts.get(
+            _norm(district)
+        )
+
+    def series(
+        self, lat: np.ndarray, lon: np.ndarray, start: date, days: int,
+        radius_deg: float = WEATHER_DISTRICT_RADIUS_DEG,
+    ) -> Optional[dict[str, np.ndarray]]:
+        """Daily series averaged over the cells near each point, shape (points, days).
+
+        A point with no cell within `radius_deg` uses the nearest cell if it is
+        within twice that; further away it gets NaN. Returns None when the
+        store has no day from `start` on.
+        """
+        if not self.cubes:
+            return None
+        first = np.searchsorted(self.dates, np.datetime64(start, "D"))
+        window = slice(first, first + days)
+        if first >= len(self.dates):
+            return None
+        lat, lon = np.atleast_1d(lat), np.atleast_1d(lon)
+        near_lat = np.abs(self.lats[None, :] - lat[:, None]) <= radius_deg
+        near_lon = np.abs(self.lons[None, :] - lon[:, None]) <= radius_deg
+        nearest_lat = np.abs(self.lats[None, :] - lat[:, None]).argmin(axis=1)
+        nearest_lon = np.abs(self.lons[None, :] - lon[:, None]).argmin(axis=1)
+        for i in range(len(lat)):
+            if not near_lat[i].any() or not near_lon[i].any():
+                if (abs(self.lats[nearest_lat[i]] - lat[i]) <= 2 * radius_deg
+                        and abs(self.lons[nearest_lon[i]] - lon[i]) <= 2 * radius_deg):
+                    near_lat[i, nearest_lat[i]] = near_lon[i, nearest_lon[i]] = True
+        # weights[p, i, j]: cell (i, j) belongs to point p.
+        weights = (near_lat[:, :, None] & near_lon[:, None, :]).astype(np.float32)
+        result = {"dates": self.dates[window]}
+        for name, cube in self.cubes.items():
+            values = cube[window]
+            valid = ~np.isnan(values)
+            totals = np.einsum("pij,dij->pd", weights, np.where(valid, values, 0))
+            counts = np.einsum("pij,dij->pd", weights, valid.astype(np.float32))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result[name] = np.where(counts > 0, totals / counts, np.nan)
+        return result
+
+
+weather_store = WeatherStore()
+
+
+def _value(value, digits: int = 1):
+    """A rounded float, or None for missing data (NaN is not valid JSON)."""
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+async def lookup_weather_forecast(district: str, state: str, crop: str) -> dict:
+    """Looks up the local gridded weather forecast for a district.
+
+    Args:
+        district (str): the district, e.g. "Kolar"
+        state (str): the state, e.g. "Karnataka", or "" if unknown
+        crop (str): the crop grown, used for heat stress and growing degree
+            days, or "" if unknown
+
+    Returns:
+        dict: daily maximum and minimum temperature (C) and rain (mm) for the
+        coming days, with rain days, heat stress days, growing degree days and
+        the longest dry spell over them, or status "not_found" when there is
+        no local forecast for the district. Values the forecast has no data
+        for are None, and such indicators are listed in missing_indicators.
+    """
+    await asyncio.to_thread(weather_store.refresh)
+    place = weather_store.district(district, state)
+    if place is None:
+        return {
+            "status": "not_found",
+            "message": f"Unknown district {district}; use the Google Search tool.",
+        }
+    name, state_name, lat, lon = place
+    series = weather_store.series(np.array([lat]), np.array([lon]), date.today(), WEATHER_FORECAST_DAYS)
+    if series is None or all(np.all(np.isnan(series[name][0])) for name in VARIABLES):
+        return {
+            "status": "not_found",
+            "message": f"No local forecast for {name}; use the Google Search tool.",
+        }
+    base_c, heat_c = crop_thresholds(crop)
+    found = indicators(series["tmax"], series["tmin"], series["rain"], base_c, heat_c)
+    values = {name: _value(found[name][0]) for name in found}
+    counts = {name: None if values[name] is None else int(values[name])
+              for name in ("rain_days", "heat_stress_days", "longest_dry_spell")}
+    return {
+        "status": "success",
+        "district": name,
+        "state": state_name,
+        "units": {"temperature": "C", "rain": "mm"},
+        "daily": [
+            {
+                "date": str(day),
+                "tmax": _value(series["tmax"][0, i]),
+                "tmin": _value(series["tmin"][0, i]),
+                "rain": _value(series["rain"][0, i]),
+            }
+            for i, day in enumerate(series["dates"])
+        ],
+        "indicators": {
+            "rain_mm": values["rain_mm"],
+            "rain_days": counts["rain_days"],
+            "heat_stress_days": counts["heat_stress_days"],
+            "heat_stress_above_c": heat_c,
+            "gdd": values["gdd"],
+            "gdd_base_c": base_c,
+            "longest_dry_spell_days": counts["longest_dry_spell"],
+        },
+        # Indicators without data in the forecast; they are None above.
+        "missing_indicators": [name for name, value in values.items() if value is None],
+    }
@@ -0,0 +1,226 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Record/replay of an agent tree's model and tool calls for tests."""
+
+import hashlib
+import json
+import os
+import pathlib
+from collections import defaultdict, deque
+from typing import Any, Optional, Union
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.tools import BaseTool, ToolContext
+from google.adk.tools.agent_tool import AgentTool
+
+# "record": call the model and tools, and overwrite the cassette.
+# "replay": answer recorded calls from the cassette, make and record the rest.
+# "strict": answer from the cassette only; an unrecorded call fails.
+# CI runs strict, so a missing recording fails instead of calling the model.
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "strict" if os.getenv("CI") else "replay")
+
+# Fields that differ between runs of the same conversation.
+_VOLATILE = {"id", "thought_signature"}
+
+_CALLBACKS = (
+    "before_model_callback",
+    "after_model_callback",
+    "before_tool_callback",
+    "after_tool_callback",
+)
+
+
+class UnmatchedRequestError(AssertionError):
+    """A strict cassette has no recording of a model or tool call."""
+
+
+def _strip(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip(v) for k, v in value.items() if k not in _VOLATILE}
+    if isinstance(value, list):
+        return [_strip(v) for v in value]
+    return value
+
+
+def _digest(*parts: Any) -> str:
+    text = json.dumps(_strip(parts), sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()[:24]
+
+
+def _model_key(agent_name: str, llm_request: LlmRequest) -> str:
+    config = llm_request.config
+    return _digest(
+        "model",
+        agent_name,
+        llm_request.model,
+        config.system_instruction if config else None,
+        [c.model_dump(mode="json", exclude_none=True) for c in llm_request.contents],
+    )
+
+
+def _tool_key(agent_name: str, tool: BaseTool, args: dict[str, Any]) -> str:
+    return _digest("tool", agent_name, tool.name, args)
+
+
+def _walk(agent: BaseAgent, seen: Optional[set] = None):
+    seen = set() if seen is None else seen
+    if id(agent) in seen:
+        return
+    seen.add(id(agent))
+    yield agent
+    for sub_agent in agent.sub_agents:
+        yield from _walk(sub_agent, seen)
+    for tool in getattr(agent, "tools", []):
+        if isinstance(tool, AgentTool):
+            yield from _walk(tool.agent, seen)
+
+
+class Cassette:
+    """Records the model and tool calls of an agent tree to a JSON file, and replays them.
+
+    Used as a context manager around a test, it adds callbacks to every
+    LlmAgent under `root_agent` (sub-agents and AgentTool agents included)
+    and removes them on exit, saving what was recorded. A call matches a
+    recording when its agent, model, system instruction and contents (for
+    tools: agent, tool and arguments) are the same, call ids aside; repeated
+    identical calls replay their recordings in order. A replayed AgentTool
+    call skips its sub-agent entirely.
+
+    Args:
+        path: Cassette file, created on the first recording.
+        root_agent: Agent whose tree is recorded or replayed.
+        mode: "record", "replay" or "strict", see CASSETTE_MODE.
+    """
+
+    def __init__(self, path: Union[str, pathlib.Path], root_agent: BaseAgent, mode: str = CASSETTE_MODE):
+        if mode not in ("record", "replay", "strict"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = pathlib.Path(path)
+        self.root_agent = root_agent
+        self.mode = mode
+        self.recorded: dict[str, deque] = defaultdict(deque)
+        self.new: list[dict[str, Any]] = []
+        self.replayed = 0
+        self._pending: dict[tuple[str, str], deque] = defaultdict(deque)
+        self._replayed_calls: set[Optional[str]] = set()
+        self._saved: list[tuple[LlmAgent, dict[str, Any]]] = []
+        if mode != "record" and self.path.exists():
+            for entry in json.loads(self.path.read_text())["interactions"]:
+                self.recorded[entry["key"]].append(entry)
+
+    def _replay(self, key: str, what: str) -> Optional[dict[str, Any]]:
+        if self.recorded[key]:
+            self.replayed += 1
+            return self.recorded[key].popleft()["response"]
+        if self.mode == "strict":
+            raise UnmatchedRequestError(f"No recording in {self.path} for {what}")
+        return None
+
+    def _record(self, key: str, kind: str, agent: str, response: dict[str, Any]) -> None:
+        self.new.append({"key": key, "kind": kind, "agent": agent, "response": response})
+
+    def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        agent = callback_context.agent_name
+        key = _model_key(agent, llm_request)
+        if self.mode != "record":
+            response = self._replay(key, f"a model call of {agent}")
+            if response is not None:
+                return LlmResponse.model_validate(response)
+        self._pending[(callback_context.invocation_id, agent)].append(key)
+        return None
+
+    def after_model(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        if llm_response.partial:
+            return None
+        pending = self._pending[(callback_context.invocation_id, callback_context.agent_name)]
+        if pending:
+            self._record(
+                pending.popleft(),
+                "model",
+                callback_context.agent_name,
+                llm_response.model_dump(mode="json", exclude_none=True),
+            )
+        return None
+
+    def before_tool(
+        self, tool: BaseTool, args: dict[str, Any], tool_context: ToolContext
+    ) -> Optional[dict]:
+        if self.mode == "record":
+            return None
+        key = _tool_key(tool_context.agent_name, tool, args)
+        response = self._replay(key, f"{tool.name}({args}) of {tool_context.agent_name}")
+        if response is None:
+            return None
+        # After-tool callbacks still run for a replayed call; don't record it again.
+        self._replayed_calls.add(tool_context.function_call_id)
+        return response["result"]
+
+    def after_tool(
+        self, tool: BaseTool, args: dict[str, Any], tool_context: ToolContext, tool_response: Any
+    ) -> Optional[dict]:
+        if tool_context.function_call_id in self._replayed_calls:
+            self._replayed_calls.discard(tool_context.function_call_id)
+            return None
+        key = _tool_key(tool_context.agent_name, tool, args)
+        self._record(key, "tool", tool_context.agent_name, {"result": tool_response})
+        return None
+
+    def __enter__(self) -> "Cassette":
+        ours = {
+            "before_model_callback": self.before_model,
+            "after_model_callback": self.after_model,
+            "before_tool_callback": self.before_tool,
+            "after_tool_callback": self.after_tool,
+        }
+        for agent in _walk(self.root_agent):
+            if not isinstance(agent, LlmAgent):
+                continue
+            saved = {attr: getattr(agent, attr) for attr in _CALLBACKS}
+            self._saved.append((agent, saved))
+            for attr, callback in ours.items():
+                existing = saved[attr] or []
+                if not isinstance(existing, list):
+                    existing = [existing]
+                # Ours go first so a replayed call skips the rest.
+                setattr(agent, attr, [callback, *existing])
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for agent, saved in self._saved:
+            for attr, value in saved.items():
+                setattr(agent, attr, value)
+        self._saved.clear()
+        if self.new:
+            self.save()
+
+    def save(self) -> None:
+        """Writes the recordings, kept ones first, then the ones made in this run."""
+        kept = [] if self.mode == "record" else self._loaded()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        interactions = kept + self.new
+        self.path.write_text(
+            json.dumps({"interactions": interactions}, indent=1, ensure_ascii=False) + "\n"
+        )
+
+    def _loaded(self) -> list[dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        return json.loads(self.path.read_text())["interactions"]
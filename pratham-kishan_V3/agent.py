@@ -2,6 +2,7 @@ import os
 import sys
 sys.path.append("..")
 from callback_logging import log_query_to_model, log_model_response
+from state_fields import append_entries, materialize_append_fields, materialize_after_tool
 from dotenv import load_dotenv
 from google.adk import Agent
 
@@ -26,13 +27,10 @@ def save_attractions_to_state(
     Returns:
         None
     """
-    # Load existing attractions from state. If none exist, start an empty list
-    existing_attractions = tool_context.state.get("attractions", [])
-
-    # Update the 'attractions' key with a combo of old and new lists.
-    # When the tool is run, ADK will create an event and make
-    # corresponding updates in the session's state.
-    tool_context.state["attractions"] = existing_attractions + attractions
+    # Append to the append-only "attractions" field. Only the new entries go
+    # into the event ADK creates for this tool call; state["attractions"] is
+    # rebuilt right after the call, before the planner's next model turn.
+    append_entries(tool_context.state, "attractions", attractions)
 
     # A best practice for tools is to return a status message in a return dict
     return {"status": "success"}
@@ -50,6 +48,8 @@ attractions_planner = Agent(
                 - If they ask to view the list, provide a bulleted list of
                 {{ attractions? }} and then suggest some more.
         """,
+    before_agent_callback=materialize_append_fields,
+    after_tool_callback=materialize_after_tool,
     before_model_callback=log_query_to_model,
     after_model_callback=log_model_response,
     # When instructed to do so, paste the tools parameter below this line